@@ -31,6 +31,11 @@ class AuthManager:
         self.tokens[token] = now + TOKEN_TTL_SECONDS
         return True
 
+    def verify_metrics(self, token: str) -> bool:
+        """Read-only scrape token from ``auth.json`` (``metrics_token``); unset disables it."""
+        stored = config_store.get_metrics_token()
+        return bool(stored) and secrets.compare_digest(stored, token)
+
     def logout(self, token: str) -> None:
         self.tokens.pop(token, None)
 
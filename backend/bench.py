@@ -0,0 +1,245 @@
+"""Headless effect benchmark: ``python -m backend.bench``.
+
+Renders every registered effect against a ``DummyStrip`` with a fixed timestep and
+synthetic audio, then prints a table (and optionally JSON) with render times,
+allocations per frame and the fps each effect can sustain. ``--compare old.json``
+flags effects that got slower than a previous run.
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .effects import EFFECTS, EffectContext, kernels, seed_rngs
+from .led_engine import DummyStrip, StripOutput
+from .render_plan import LIVE_DEFAULTS
+
+DEFAULT_LEDS = (60, 300, 1000, 5000)
+
+
+def synthetic_audio(frame: int, fps: float) -> Dict:
+    """A deterministic audio snapshot: 120 bpm beats and slowly moving bands."""
+    t = frame / fps
+    beat_every = max(1, int(round(fps / 2)))
+    beat = frame % beat_every == 0
+    decay = math.exp(-(frame % beat_every) / max(1.0, fps / 8))
+    bands = [0.5 + 0.5 * math.sin(t * (1.3 + i * 0.7) + i) * (0.6 + 0.4 * decay) for i in range(8)]
+    vol = sum(bands) / len(bands)
+    return {
+        "bands": bands,
+        "vol": vol,
+        "beat": beat,
+        "bpm": 120.0,
+        "enabled": True,
+        "flux": decay,
+        "rms": vol,
+        "bass": bands[0],
+        "agc_gain": 1.0,
+    }
+
+
+def _context(effect_cls, leds: int) -> EffectContext:
+    params = dict(effect_cls.default_params)
+    segment = {"name": "Bench", "start": 0, "end": leds - 1, "effect": effect_cls.name, "params": params}
+    return EffectContext(
+        time=0.0,
+        dt=0.0,
+        length=leds,
+        params=params,
+        audio={},
+        global_state={"effect": effect_cls.name, "effect_params": params},
+        segment=segment,
+        live=dict(LIVE_DEFAULTS),
+    )
+
+
+def _percentile(samples: Sequence[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def bench_effect(name: str, leds: int, frames: int, warmup: int, fps: float) -> Dict:
+    effect_cls = EFFECTS[name]
+    seed_rngs(0)
+    effect = effect_cls()
+    ctx = _context(effect_cls, leds)
+    output = StripOutput(DummyStrip(leds), 0)
+    dt = 1.0 / fps
+    work = np.zeros((leds, 3), dtype=np.float32)
+    frame_u8 = np.zeros((leds, 3), dtype=np.uint8)
+
+    def step(i: int) -> None:
+        ctx.time = ctx.timeline = i * dt
+        ctx.dt = dt
+        ctx.audio = synthetic_audio(i, fps)
+        effect.render_into(ctx, work)
+        np.clip(work, 0.0, 255.0, out=frame_u8, casting="unsafe")
+
+    for i in range(warmup):
+        step(i)
+
+    render: List[float] = []
+    show: List[float] = []
+    for i in range(warmup, warmup + frames):
+        t0 = time.perf_counter()
+        step(i)
+        t1 = time.perf_counter()
+        output.push(frame_u8)
+        output.strip.show()
+        show.append(time.perf_counter() - t1)
+        render.append(t1 - t0)
+
+    # Separate pass so tracemalloc's overhead does not leak into the timings.
+    alloc_frames = max(1, min(frames, 50))
+    tracemalloc.start()
+    try:
+        peak = 0
+        blocks = 0
+        for i in range(warmup + frames, warmup + frames + alloc_frames):
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            step(i)
+            peak += tracemalloc.get_traced_memory()[1] - base
+            after = tracemalloc.take_snapshot()
+            blocks += sum(max(0, stat.count_diff) for stat in after.compare_to(before, "lineno"))
+    finally:
+        tracemalloc.stop()
+
+    total = [r + s for r, s in zip(render, show)]
+    p99_total = _percentile(total, 0.99)
+    return {
+        "effect": name,
+        "leds": leds,
+        "frames": frames,
+        "mean_ms": round(sum(render) / len(render) * 1000, 4),
+        "p50_ms": round(_percentile(render, 0.5) * 1000, 4),
+        "p99_ms": round(_percentile(render, 0.99) * 1000, 4),
+        "show_ms": round(sum(show) / len(show) * 1000, 4),
+        "alloc_kb": round(peak / alloc_frames / 1024, 2),
+        "alloc_blocks": round(blocks / alloc_frames, 1),
+        "max_fps": round(1.0 / p99_total, 1) if p99_total > 0 else 0.0,
+    }
+
+
+def run(effects: Sequence[str], leds: Sequence[int], frames: int, warmup: int, fps: float, progress=None) -> Dict:
+    results = []
+    for name in effects:
+        for count in leds:
+            try:
+                result = bench_effect(name, count, frames, warmup, fps)
+            except Exception as exc:
+                result = {"effect": name, "leds": count, "error": f"{type(exc).__name__}: {exc}"}
+            results.append(result)
+            if progress:
+                progress(result)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "frames": frames,
+            "warmup": warmup,
+            "fps": fps,
+            "kernels": kernels.active_backend(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """Per effect/LED count p50 ratio against ``baseline``; ``regressed`` is set above ``threshold``."""
+    old = {(r["effect"], r["leds"]): r for r in baseline.get("results", []) if "error" not in r}
+    rows = []
+    for result in current.get("results", []):
+        prev = old.get((result["effect"], result["leds"]))
+        if prev is None or "error" in result:
+            continue
+        ratio = result["p50_ms"] / prev["p50_ms"] if prev["p50_ms"] else 1.0
+        rows.append(
+            {
+                "effect": result["effect"],
+                "leds": result["leds"],
+                "before_ms": prev["p50_ms"],
+                "after_ms": result["p50_ms"],
+                "ratio": round(ratio, 3),
+                "regressed": ratio > threshold,
+            }
+        )
+    return rows
+
+
+def _row(result: Dict) -> str:
+    if "error" in result:
+        return f"{result['effect']:<18} {result['leds']:>6}  ERROR {result['error']}"
+    return (
+        f"{result['effect']:<18} {result['leds']:>6} {result['mean_ms']:>9.3f} {result['p50_ms']:>9.3f} "
+        f"{result['p99_ms']:>9.3f} {result['show_ms']:>8.3f} {result['alloc_kb']:>9.1f} "
+        f"{result['alloc_blocks']:>7.0f} {result['max_fps']:>9.0f}"
+    )
+
+
+HEADER = (
+    f"{'effect':<18} {'leds':>6} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'show ms':>8} "
+    f"{'alloc KiB':>9} {'blocks':>7} {'max fps':>9}"
+)
+
+
+def _int_list(text: str) -> List[int]:
+    return [int(part) for part in text.split(",") if part.strip()]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.bench", description="Benchmark all registered effects.")
+    parser.add_argument("--leds", type=_int_list, default=list(DEFAULT_LEDS), help="comma separated LED counts")
+    parser.add_argument("--effects", default="", help="comma separated effect names (default: all)")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--fps", type=float, default=60.0, help="fixed timestep as frames per second")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    parser.add_argument("--compare", help="previous --json output to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="p50 ratio that counts as a regression")
+    parser.add_argument("--kernels", choices=kernels.MODES, default="auto", help="effect kernel backend")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.effects.split(",") if n.strip()] or sorted(EFFECTS)
+    unknown = [n for n in names if n not in EFFECTS]
+    if unknown:
+        parser.error(f"unknown effects: {', '.join(unknown)}")
+    # Warm up before timing anything so compilation never lands in the measurements.
+    kernels.configure(args.kernels, background=False)
+
+    print(HEADER)
+    report = run(names, args.leds, max(1, args.frames), max(0, args.warmup), args.fps, progress=lambda r: print(_row(r), flush=True))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"[ledweb] bench results written to {args.json_path}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        rows = compare(report, baseline, args.threshold)
+        print()
+        print(f"{'effect':<18} {'leds':>6} {'before ms':>10} {'after ms':>10} {'ratio':>7}")
+        for row in rows:
+            flag = "  REGRESSION" if row["regressed"] else ""
+            print(
+                f"{row['effect']:<18} {row['leds']:>6} {row['before_ms']:>10.3f} {row['after_ms']:>10.3f} {row['ratio']:>7.2f}{flag}"
+            )
+        if any(row["regressed"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
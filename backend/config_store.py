@@ -16,6 +16,7 @@ DEFAULT_FILES = {
         "brightness": 200,
         "channel": 0,
         "strip_type": "ws281x",
+        "pipelined": False,
     },
     "ui": {
         "name": "Pi LED Controller",
@@ -42,6 +43,7 @@ DEFAULT_FILES = {
         {"name": "Volledige strip", "start": 0, "end": 299, "effect": "rainbow_cycle", "params": {}}
     ],
     "alarms": {"alarms": [], "timers": []},
+    "palettes": {},
 }
 
 
@@ -86,8 +88,12 @@ class ConfigStore:
     def get_auth_password(self) -> str:
         return str(self.get_auth().get("password", ""))
 
+    def get_metrics_token(self) -> str:
+        return str(self.get_auth().get("metrics_token", ""))
+
     def save_auth_password(self, password: str) -> Dict[str, Any]:
-        cfg = {"password": str(password)}
+        cfg = dict(self.get_auth() or {})
+        cfg["password"] = str(password)
         self.save("auth", cfg)
         return cfg
 
@@ -119,5 +125,12 @@ class ConfigStore:
         self.save("alarms", data)
         return data
 
+    def get_palettes(self) -> Dict[str, Any]:
+        return self.load("palettes")
+
+    def save_palettes(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        self.save("palettes", data)
+        return data
+
 
 config_store = ConfigStore()
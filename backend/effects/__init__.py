@@ -1,8 +1,18 @@
 import math
-import random
 import time
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import kernels
+from .noise import fbm, fractal_noise, smooth_noise, value_noise  # noqa: F401 - smooth_noise re-exported
+from .palettes import Palette, compile_palette, get_palette
+from .params import Param, param_schema, parse_params  # noqa: F401 - param_schema re-exported
+from .particles import DecayField, Particles, decay_kernel, draw_tails, linear_kernel
+from .rng import make_rng, seed_rngs  # noqa: F401 - seed_rngs re-exported
+from .spatial import SpatialIndex, fallback_index, noise_field, plane_field, radial_field, spread
 
 RGB = Tuple[int, int, int]
 
@@ -59,44 +69,111 @@ def palette_color(palette: List[RGB], pos: float) -> RGB:
 
 
 def make_palette(name: str) -> List[RGB]:
-    palettes = {
-        "sunset": [(255, 94, 19), (255, 149, 5), (252, 201, 64), (255, 235, 191)],
-        "ocean": [(0, 78, 146), (0, 155, 199), (0, 216, 199), (160, 255, 255)],
-        "fire": [(30, 6, 0), (180, 40, 0), (255, 120, 10), (255, 220, 70)],
-        "pastel": [(255, 183, 213), (202, 236, 255), (178, 255, 227), (255, 245, 196)],
-        "neon": [(41, 255, 229), (117, 101, 255), (255, 94, 247), (255, 255, 255)],
-    }
-    return palettes.get(name, palettes["neon"])
-
-
-_noise_cache: Dict[int, float] = {}
-
-
-def value_noise(x: float, seed: int = 0) -> float:
-    xi = int(math.floor(x))
-    xf = x - xi
-    random.seed(xi + seed * 1013)
-    v1 = random.random()
-    random.seed(xi + 1 + seed * 1013)
-    v2 = random.random()
-    return lerp(v1, v2, xf)
-
-
-def smooth_noise(x: float, seed: int = 0) -> float:
-    return (value_noise(x - 1, seed) + value_noise(x, seed) + value_noise(x + 1, seed)) / 3.0
-
-
-def fractal_noise(x: float, octaves: int = 4, seed: int = 0) -> float:
-    total = 0.0
-    freq = 1.0
-    amp = 1.0
-    max_amp = 0.0
-    for _ in range(octaves):
-        total += smooth_noise(x * freq, seed) * amp
-        max_amp += amp
-        amp *= 0.5
-        freq *= 2.0
-    return total / max_amp if max_amp else 0.0
+    """Colour stops of a registered palette (see ``palettes``); falls back to neon."""
+    return get_palette(name).colors
+
+
+def as_color_array(colors, length: int) -> np.ndarray:
+    """Convert an effect's output to a float32 (length, 3) array, tiling or truncating to fit."""
+    arr = np.asarray(colors, dtype=np.float32)
+    if arr.ndim != 2 or arr.shape[0] == 0:
+        return np.zeros((length, 3), dtype=np.float32)
+    arr = arr[:, :3]
+    if arr.shape[0] != length:
+        # Same semantics as the old list repeat: short outputs are tiled, long ones cut off.
+        arr = np.resize(arr, (length, 3))
+    return arr
+
+
+@lru_cache(maxsize=64)
+def pixel_index(length: int) -> np.ndarray:
+    """Read-only float32 ``arange(length)``, shared by every effect rendering that length."""
+    idx = np.arange(length, dtype=np.float32)
+    idx.flags.writeable = False
+    return idx
+
+
+@lru_cache(maxsize=16)
+def matrix_coords(width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Read-only float32 (height, width) x and y grids for 2D effects."""
+    xs, ys = np.meshgrid(np.arange(width, dtype=np.float32), np.arange(height, dtype=np.float32))
+    xs.flags.writeable = False
+    ys.flags.writeable = False
+    return xs, ys
+
+
+# Per-channel hue offsets (in sixths of the wheel) for the closed-form HSV conversion.
+_HSV_OFFSETS = np.array([5.0, 3.0, 1.0], dtype=np.float32)
+
+
+def hsv_to_rgb_array(h, s=1.0, v=1.0, out: np.ndarray = None) -> np.ndarray:
+    """Vectorized ``hsv_to_rgb``: hue array in, float32 (n, 3) RGB in 0..255 out.
+
+    ``s`` and ``v`` may be scalars or arrays matching ``h``.
+    """
+    h = np.asarray(h, dtype=np.float32)
+    k = np.mod(h, 1.0)[:, None] * 6.0 + _HSV_OFFSETS
+    np.mod(k, 6.0, out=k)
+    np.minimum(k, 4.0 - k, out=k)
+    np.clip(k, 0.0, 1.0, out=k)
+    s = np.asarray(s, dtype=np.float32)
+    v = np.asarray(v, dtype=np.float32) * 255.0
+    if s.ndim:
+        s = s[:, None]
+    if v.ndim:
+        v = v[:, None]
+    if out is None:
+        out = np.empty((h.shape[0], 3), dtype=np.float32)
+    np.multiply(k, -s, out=k)
+    k += 1.0
+    np.multiply(k, v, out=out)
+    return out
+
+
+# Six 8-bit ramps around the wheel: every step the scalar hsv_to_rgb can produce.
+HUE_WHEEL_SIZE = 1536
+
+
+@lru_cache(maxsize=1)
+def _hue_wheel_lut() -> np.ndarray:
+    lut = hsv_to_rgb_array(np.arange(HUE_WHEEL_SIZE, dtype=np.float32) / HUE_WHEEL_SIZE)
+    lut.flags.writeable = False
+    return lut
+
+
+def hue_wheel(hues, out: np.ndarray = None) -> np.ndarray:
+    """Fully saturated, full-value colours for ``hues`` (wrapping at 1.0) via a cached LUT gather."""
+    jit = kernels.hue_sample
+    if jit is not None and kernels.plain(hues) and (out is None or kernels.plain(out, 2)):
+        if out is None:
+            out = np.empty((hues.shape[0], 3), dtype=np.float32)
+        if out.dtype == np.float32:
+            jit(_hue_wheel_lut(), hues, out)
+            return out
+    idx = np.multiply(hues, HUE_WHEEL_SIZE, dtype=np.float32)
+    idx += 0.5
+    return np.take(_hue_wheel_lut(), idx.astype(np.intp), axis=0, out=out, mode="wrap")
+
+
+def palette_colors(palette, positions, out: np.ndarray = None) -> np.ndarray:
+    """Vectorized ``palette_color``: a ``Palette`` or a list of colour stops, sampled via its LUT."""
+    if not isinstance(palette, Palette):
+        palette = compile_palette(tuple(tuple(c) for c in palette))
+    return palette.sample(positions, out)
+
+
+def _noise_coords(length: int, scale: float, offset: float) -> np.ndarray:
+    """Noise sample positions ``i * scale + offset`` in float64, so long uptimes keep their precision."""
+    coords = np.multiply(pixel_index(length), scale, dtype=np.float64)
+    coords += offset
+    return coords
+
+
+def _band_levels(bands: Sequence[float], pos: np.ndarray) -> np.ndarray:
+    """Linearly interpolate audio band levels at positions 0..1 along the strip."""
+    if not bands:
+        return np.zeros_like(pos)
+    return np.interp(pos * max(1, len(bands) - 1), np.arange(len(bands)), bands).astype(np.float32)
 
 
 @dataclass
@@ -111,6 +188,13 @@ class EffectContext:
     timeline: float = 0.0
     master_speed: float = 1.0
     live: Dict = None
+    # Logical canvas size when the segment is a 2D matrix layout (0 for a plain strip).
+    width: int = 0
+    height: int = 0
+    # Normalized (length, 3) float32 LED positions and their index, when the installation
+    # has a coordinate file covering this segment; None for plain strips.
+    coords: Optional[np.ndarray] = None
+    spatial: Optional[SpatialIndex] = None
 
 
 class Effect:
@@ -119,9 +203,66 @@ class Effect:
     category: str = "misc"
     description: str = ""
     default_params: Dict = {}
+    # Refinements of the kinds inferred from default_params: integers, bounds, choices.
+    param_specs: Dict[str, Param] = {}
+    # Output depends only on params (not time, audio or randomness); lets the engine idle.
+    time_invariant: bool = False
+    # Output depends only on the context (no internal state or randomness), so segments
+    # with the same effect, params and size can share one render.
+    stateless: bool = False
+
+    _raw_params: Optional[Dict] = None
+    _parsed_params = None
+
+    def params(self, ctx: EffectContext):
+        """Typed view of ``ctx.params``; only re-parsed when a new params dict arrives.
+
+        The engine builds a fresh params dict whenever the state changes, so identity is
+        enough to detect a change; dicts are not mutated after they reach an effect.
+        """
+        raw = ctx.params
+        if raw is not self._raw_params or self._parsed_params is None:
+            self._parsed_params = parse_params(type(self), raw)
+            self._raw_params = raw
+        return self._parsed_params
+
+    def render(self, ctx: EffectContext) -> List[RGB]:
+        """Legacy contract: return one RGB tuple per pixel (an (N, 3) array works too)."""
+        if type(self).render_into is Effect.render_into:  # pragma: no cover - override
+            raise NotImplementedError
+        out = np.zeros((ctx.length, 3), dtype=np.float32)
+        self.render_into(ctx, out)
+        return out  # type: ignore[return-value]
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        """Vectorized contract: write the frame into ``out``, a float32 (length, 3) view.
 
-    def render(self, ctx: EffectContext) -> List[RGB]:  # pragma: no cover - override
-        raise NotImplementedError
+        ``out`` still holds whatever was there before, so every pixel must be written.
+        Values are 0..255; the engine applies intensity and clips afterwards. The default
+        adapts effects that only implement ``render``.
+        """
+        out[:] = as_color_array(self.render(ctx), ctx.length)
+
+    def render_matrix(self, ctx: EffectContext, out: np.ndarray) -> None:
+        """2D contract for matrix layouts: ``out`` is a float32 (height, width, 3) canvas.
+
+        The default renders the 1D effect along the canvas rows (row-major, no zigzag),
+        so every effect works on a matrix; effects with a real 2D look override this.
+        """
+        self.render_into(ctx, out.reshape(-1, 3))
+
+    def period(self, ctx: EffectContext) -> Optional[float]:
+        """Seconds after which the frames repeat exactly for the current params, or None.
+
+        Only for pure functions of ``ctx.time`` (no audio, randomness or internal state);
+        the engine then serves the effect from a phase-quantized frame cache.
+        """
+        return None
+
+
+def _scroll_period(speed: float) -> Optional[float]:
+    """Period of a pattern that scrolls ``speed`` times its length per second."""
+    return 1.0 / abs(speed) if speed else None
 
 
 EFFECTS: Dict[str, type] = {}
@@ -139,10 +280,12 @@ class SolidColor(Effect):
     category = "basic"
     description = "Volledig effen kleur (constant licht)"
     default_params = {"color": [255, 255, 255]}
+    time_invariant = True
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        color = tuple(ctx.params.get("color", [255, 255, 255]))  # type: ignore
-        return [color] * ctx.length
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        out[:] = p.color
 
 
 class ColorWipe(Effect):
@@ -151,22 +294,22 @@ class ColorWipe(Effect):
     category = "basic"
     description = "Kleur veegt in gekozen richting over de strip"
     default_params = {"color": [255, 50, 120], "direction": "forward", "speed": 2.2}
-
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        color = tuple(ctx.params.get("color", [255, 50, 120]))  # type: ignore
-        speed = ctx.params.get("speed", 1.0)
-        direction = ctx.params.get("direction", "forward")
+    param_specs = {"direction": Param("choice", options=("forward", "reverse", "center"))}
+    stateless = True
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        color = p.color
+        speed = p.speed
+        direction = p.direction
         phase = (ctx.time * speed) % ctx.length
-        res = []
-        for i in range(ctx.length):
-            idx = i
-            if direction == "reverse":
-                idx = ctx.length - 1 - i
-            elif direction == "center":
-                idx = abs((ctx.length // 2) - i)
-            lit = 1.0 if idx <= phase else 0.0
-            res.append(tuple(int(c * lit) for c in color))  # type: ignore
-        return res
+        idx = pixel_index(ctx.length)
+        if direction == "reverse":
+            idx = (ctx.length - 1) - idx
+        elif direction == "center":
+            idx = np.abs((ctx.length // 2) - idx)
+        out.fill(0.0)
+        out[idx <= phase] = color
 
 
 class TheaterChase(Effect):
@@ -175,16 +318,22 @@ class TheaterChase(Effect):
     category = "basic"
     description = "Marquee-stijl pulses om en om"
     default_params = {"color": [255, 255, 255], "gap": 3, "speed": 1.0}
-
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        color = tuple(ctx.params.get("color", [255, 255, 255]))  # type: ignore
-        gap = max(1, int(ctx.params.get("gap", 3)))
-        speed = ctx.params.get("speed", 1.0)
+    param_specs = {"gap": Param("int", min=1)}
+    stateless = True
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        color = p.color
+        gap = p.gap
+        speed = p.speed
         offset = int((ctx.time * 20 * speed)) % gap
-        res = []
-        for i in range(ctx.length):
-            res.append(color if (i + offset) % gap == 0 else (0, 0, 0))
-        return res
+        out.fill(0.0)
+        # Lit pixels satisfy (i + offset) % gap == 0, i.e. every gap-th pixel from here.
+        out[(-offset) % gap :: gap] = color
+
+    def period(self, ctx: EffectContext) -> Optional[float]:
+        p = self.params(ctx)
+        return p.gap / (20 * abs(p.speed)) if p.speed else None
 
 
 class Strobe(Effect):
@@ -193,14 +342,14 @@ class Strobe(Effect):
     category = "basic"
     description = "Snelle flitsen met instelbare duty/freq"
     default_params = {"color": [255, 255, 255], "frequency": 8.0, "duty_cycle": 0.2}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        freq = ctx.params.get("frequency", 8.0)
-        duty = ctx.params.get("duty_cycle", 0.2)
-        color = tuple(ctx.params.get("color", [255, 255, 255]))  # type: ignore
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        freq = p.frequency
+        duty = p.duty_cycle
         phase = (ctx.time * freq) % 1.0
-        on = phase < duty
-        return [color if on else (0, 0, 0)] * ctx.length
+        out[:] = p.color if phase < duty else 0.0
 
 
 class BlinkPattern(Effect):
@@ -209,14 +358,15 @@ class BlinkPattern(Effect):
     category = "basic"
     description = "Herhalend knipperpatroon met pauze"
     default_params = {"color": [255, 120, 0], "interval": 0.7, "pause": 0.4}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        interval = ctx.params.get("interval", 0.7)
-        pause = ctx.params.get("pause", 0.4)
-        color = tuple(ctx.params.get("color", [255, 120, 0]))  # type: ignore
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        interval = p.interval
+        pause = p.pause
         cycle = interval + pause
         on = (ctx.time % cycle) < interval
-        return [color if on else (0, 0, 0)] * ctx.length
+        out[:] = p.color if on else 0.0
 
 
 class GradientScroll(Effect):
@@ -225,16 +375,16 @@ class GradientScroll(Effect):
     category = "basic"
     description = "Lopend kleurverloop over de strip"
     default_params = {"colors": [[255, 0, 120], [0, 180, 255]], "speed": 0.2}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        colors = ctx.params.get("colors", [[255, 0, 120], [0, 180, 255]])
-        palette = [tuple(c) for c in colors]  # type: ignore
-        speed = ctx.params.get("speed", 0.2)
-        offset = ctx.time * speed
-        res = []
-        for i in range(ctx.length):
-            res.append(palette_color(palette, (i / ctx.length) + offset))
-        return res
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        palette = p.colors
+        offset = (ctx.time * p.speed) % 1.0
+        palette_colors(palette, pixel_index(ctx.length) / ctx.length + offset, out)
+
+    def period(self, ctx: EffectContext) -> Optional[float]:
+        return _scroll_period(self.params(ctx).speed)
 
 
 # --- Rainbow & Palettes ---
@@ -245,11 +395,15 @@ class Rainbow(Effect):
     category = "rainbow"
     description = "Zachte regenboog die langzaam schuift"
     default_params = {"speed": 0.3}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        speed = ctx.params.get("speed", 0.3)
-        base = ctx.time * speed
-        return [hsv_to_rgb((base + i / ctx.length) % 1.0, 1.0, 1.0) for i in range(ctx.length)]
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        base = (ctx.time * p.speed) % 1.0
+        hue_wheel(pixel_index(ctx.length) / ctx.length + base, out)
+
+    def period(self, ctx: EffectContext) -> Optional[float]:
+        return _scroll_period(self.params(ctx).speed)
 
 
 class RainbowCycle(Effect):
@@ -258,10 +412,22 @@ class RainbowCycle(Effect):
     category = "rainbow"
     description = "Volledige regenboog die rondloopt"
     default_params = {"speed": 0.5}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        speed = ctx.params.get("speed", 0.5)
-        return [hsv_to_rgb((i / ctx.length) + ctx.time * speed, 1.0, 1.0) for i in range(ctx.length)]
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        base = (ctx.time * p.speed) % 1.0
+        hue_wheel(pixel_index(ctx.length) / ctx.length + base, out)
+
+    def render_matrix(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        xs, ys = matrix_coords(ctx.width, ctx.height)
+        # Diagonal bands: the hue runs from the top-left to the bottom-right corner.
+        hues = (xs + ys) / (ctx.width + ctx.height) + (ctx.time * p.speed) % 1.0
+        hue_wheel(hues.ravel(), out.reshape(-1, 3))
+
+    def period(self, ctx: EffectContext) -> Optional[float]:
+        return _scroll_period(self.params(ctx).speed)
 
 
 class RainbowWhite(Effect):
@@ -270,17 +436,16 @@ class RainbowWhite(Effect):
     category = "rainbow"
     description = "Regenboog met witte accenten en pulses"
     default_params = {"speed": 0.4, "pulse": 0.4}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        speed = ctx.params.get("speed", 0.4)
-        pulse = ctx.params.get("pulse", 0.4)
-        base = ctx.time * speed
-        res = []
-        for i in range(ctx.length):
-            color = hsv_to_rgb((base + i / ctx.length) % 1.0, 1.0, 1.0)
-            accent = (math.sin((ctx.time + i * 0.05) * 10) * 0.5 + 0.5) * pulse
-            res.append(tuple(int(c + 255 * accent) if j < 3 else 0 for j, c in enumerate(color)))
-        return res
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        speed = p.speed
+        pulse = p.pulse
+        idx = pixel_index(ctx.length)
+        hue_wheel(idx / ctx.length + (ctx.time * speed) % 1.0, out)
+        accent = np.sin(idx * 0.5 + (ctx.time * 10) % math.tau) * 0.5 + 0.5
+        out += (accent * (255 * pulse))[:, None]
 
 
 class PaletteEffect(Effect):
@@ -289,12 +454,16 @@ class PaletteEffect(Effect):
     category = "rainbow"
     description = "Scrollt een gekozen kleurenpalet gelijkmatig"
     default_params = {"palette": "sunset", "speed": 0.2}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        palette = make_palette(ctx.params.get("palette", "sunset"))
-        speed = ctx.params.get("speed", 0.2)
-        offset = ctx.time * speed
-        return [palette_color(palette, offset + (i / ctx.length)) for i in range(ctx.length)]
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        palette = get_palette(p.palette)
+        offset = (ctx.time * p.speed) % 1.0
+        palette_colors(palette, pixel_index(ctx.length) / ctx.length + offset, out)
+
+    def period(self, ctx: EffectContext) -> Optional[float]:
+        return _scroll_period(self.params(ctx).speed)
 
 
 # --- Ambient / Smooth ---
@@ -305,13 +474,16 @@ class Breathing(Effect):
     category = "ambient"
     description = "Zachte in- en uitfade zoals ademhaling"
     default_params = {"color": [80, 180, 255], "speed": 0.5, "intensity": 0.7}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        color = tuple(ctx.params.get("color", [80, 180, 255]))  # type: ignore
-        speed = ctx.params.get("speed", 0.5)
-        intensity = ctx.params.get("intensity", 0.7)
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        color = p.color
+        speed = p.speed
+        intensity = p.intensity
         t = (math.sin(ctx.time * speed * math.pi * 2) * 0.5 + 0.5) * intensity
-        return [tuple(int(c * t) for c in color)] * ctx.length
+        out[:] = color
+        out *= t
 
 
 class SoftWave(Effect):
@@ -320,16 +492,15 @@ class SoftWave(Effect):
     category = "ambient"
     description = "Langzame golfbeweging met één kleur"
     default_params = {"color": [0, 200, 255], "speed": 0.4, "wavelength": 24}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        color = tuple(ctx.params.get("color", [0, 200, 255]))  # type: ignore
-        speed = ctx.params.get("speed", 0.4)
-        wavelength = ctx.params.get("wavelength", 24)
-        res = []
-        for i in range(ctx.length):
-            t = (math.sin((i / wavelength) + ctx.time * speed) * 0.5 + 0.5)
-            res.append(tuple(int(c * t) for c in color))
-        return res
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        color = p.color
+        speed = p.speed
+        wavelength = p.wavelength
+        t = np.sin(pixel_index(ctx.length) / wavelength + (ctx.time * speed) % math.tau) * 0.5 + 0.5
+        np.multiply(t[:, None], color, out=out)
 
 
 class DualWave(Effect):
@@ -338,26 +509,25 @@ class DualWave(Effect):
     category = "ambient"
     description = "Twee zachte golven vanuit beide kanten met palet"
     default_params = {"palette": "ocean", "speed": 0.6, "wavelength": 26, "mix": 0.5, "symmetry": 0.8}
-
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        palette = make_palette(ctx.params.get("palette", "ocean"))
-        speed = ctx.params.get("speed", 0.6)
-        wavelength = max(4, ctx.params.get("wavelength", 26))
-        mix = clamp(ctx.params.get("mix", 0.5), 0.0, 1.0)
-        symmetry = clamp(ctx.params.get("symmetry", 0.8), 0.0, 1.0)
-        res: List[RGB] = []
-        for i in range(ctx.length):
-            pos = i / max(1, ctx.length - 1)
-            wave_a = math.sin((pos * ctx.length / wavelength + ctx.time * speed) * math.pi * 2) * 0.5 + 0.5
-            wave_b = math.sin(((1 - pos) * ctx.length / wavelength + ctx.time * speed * 1.15 + 0.33) * math.pi * 2) * 0.5 + 0.5
-            blend = clamp(wave_a * mix + wave_b * (1 - mix))
-            mirrored = abs(pos - 0.5) * 2
-            balance = clamp(1 - mirrored * symmetry)
-            hue_pos = (ctx.time * 0.05 + pos) % 1.0
-            col = palette_color(palette, hue_pos)
-            factor = clamp(blend * 0.7 + balance * 0.3)
-            res.append(tuple(int(c * factor) for c in col))  # type: ignore
-        return res
+    param_specs = {"mix": Param(min=0.0, max=1.0), "symmetry": Param(min=0.0, max=1.0), "wavelength": Param(min=4)}
+    stateless = True
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        palette = get_palette(p.palette)
+        speed = p.speed
+        wavelength = p.wavelength
+        mix = p.mix
+        symmetry = p.symmetry
+        pos = pixel_index(ctx.length) / max(1, ctx.length - 1)
+        span = ctx.length / wavelength * math.tau
+        wave_a = np.sin(pos * span + (ctx.time * speed * math.tau) % math.tau) * 0.5 + 0.5
+        wave_b = np.sin((1 - pos) * span + ((ctx.time * speed * 1.15 + 0.33) * math.tau) % math.tau) * 0.5 + 0.5
+        blend = np.clip(wave_a * mix + wave_b * (1 - mix), 0.0, 1.0)
+        balance = np.clip(1 - np.abs(pos - 0.5) * 2 * symmetry, 0.0, 1.0)
+        factor = np.clip(blend * 0.7 + balance * 0.3, 0.0, 1.0)
+        palette_colors(palette, pos + (ctx.time * 0.05) % 1.0, out)
+        out *= factor[:, None]
 
 
 class ColorFade(Effect):
@@ -366,17 +536,18 @@ class ColorFade(Effect):
     category = "ambient"
     description = "Cyclust traag tussen meerdere kleuren"
     default_params = {"colors": [[255, 64, 100], [64, 180, 255], [255, 200, 40]], "speed": 0.05}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        colors = [tuple(c) for c in ctx.params.get("colors", [[255, 64, 100], [64, 180, 255], [255, 200, 40]])]  # type: ignore
-        speed = ctx.params.get("speed", 0.05)
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        colors = p.colors
+        speed = p.speed
         phase = (ctx.time * speed) % len(colors)
         idx = int(phase)
         t = phase - idx
         c1 = colors[idx % len(colors)]
         c2 = colors[(idx + 1) % len(colors)]
-        mix = lerp_color(c1, c2, t)
-        return [mix] * ctx.length
+        out[:] = lerp_color(c1, c2, t)
 
 
 class LavaFlow(Effect):
@@ -385,16 +556,21 @@ class LavaFlow(Effect):
     category = "ambient"
     description = "Warme vloeibare gloed met vuurpalet"
     default_params = {"speed": 0.3, "scale": 0.15}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        speed = ctx.params.get("speed", 0.3)
-        scale = ctx.params.get("scale", 0.15)
-        res = []
-        for i in range(ctx.length):
-            n = fractal_noise(i * scale + ctx.time * speed, 4, seed=7)
-            col = palette_color(make_palette("fire"), n)
-            res.append(col)
-        return res
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        speed = p.speed
+        scale = p.scale
+        n = fractal_noise(_noise_coords(ctx.length, scale, ctx.time * speed), 4, seed=7)
+        palette_colors(get_palette("fire"), n, out)
+
+    def render_matrix(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        xs, ys = matrix_coords(ctx.width, ctx.height)
+        # Time is the third noise axis, so blobs morph in place instead of scrolling.
+        n = fbm(value_noise, xs * p.scale, ys * p.scale, ctx.time * p.speed, octaves=4, seed=7)
+        palette_colors(get_palette("fire"), n.ravel(), out.reshape(-1, 3))
 
 
 # --- Ultra smooth ---
@@ -405,19 +581,21 @@ class SuperSmooth(Effect):
     category = "ambient"
     description = "Super vloeiend pastelverloop"
     default_params = {"palette": "pastel", "speed": 0.22, "scale": 0.1, "blur": 0.6}
-
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        palette = make_palette(ctx.params.get("palette", "pastel"))
-        speed = ctx.params.get("speed", 0.22)
-        scale = ctx.params.get("scale", 0.1)
-        blur = clamp(ctx.params.get("blur", 0.6), 0.0, 1.0)
-        res: List[RGB] = []
-        for i in range(ctx.length):
-            pos = ctx.time * speed + i * scale
-            base = palette_color(palette, pos)
-            neighbor = palette_color(palette, pos + scale)
-            res.append(lerp_color(base, neighbor, blur))
-        return res
+    param_specs = {"blur": Param(min=0.0, max=1.0)}
+    stateless = True
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        palette = get_palette(p.palette)
+        speed = p.speed
+        scale = p.scale
+        blur = p.blur
+        pos = pixel_index(ctx.length) * scale + (ctx.time * speed) % 1.0
+        palette_colors(palette, pos, out)
+        neighbor = palette_colors(palette, pos + scale)
+        neighbor -= out
+        neighbor *= blur
+        out += neighbor
 
 
 # --- Noise-based ---
@@ -429,17 +607,19 @@ class FireNoise(Effect):
     description = "Vuurgloed met kleine vonkjes"
     default_params = {"speed": 0.6, "sparks": 0.2}
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        speed = ctx.params.get("speed", 0.6)
-        sparks = ctx.params.get("sparks", 0.2)
-        res = []
-        for i in range(ctx.length):
-            n = fractal_noise(i * 0.12 + ctx.time * speed, 3, seed=11)
-            spark = random.random() < sparks * ctx.dt
-            heat = clamp(n + (0.5 if spark else 0))
-            col = palette_color(make_palette("fire"), heat)
-            res.append(col)
-        return res
+    def __init__(self) -> None:
+        self.rng = make_rng()
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        speed = p.speed
+        sparks = p.sparks
+        heat = fractal_noise(_noise_coords(ctx.length, 0.12, ctx.time * speed), 3, seed=11)
+        chance = sparks * ctx.dt
+        if chance > 0:
+            heat[self.rng.random(ctx.length) < chance] += 0.5
+        np.clip(heat, 0.0, 1.0, out=heat)
+        palette_colors(get_palette("fire"), heat, out)
 
 
 class Plasma(Effect):
@@ -448,15 +628,29 @@ class Plasma(Effect):
     category = "noise"
     description = "Organisch plasma met neonkleuren"
     default_params = {"speed": 0.25, "scale": 0.12}
-
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        speed = ctx.params.get("speed", 0.25)
-        scale = ctx.params.get("scale", 0.12)
-        res = []
-        for i in range(ctx.length):
-            v = (math.sin(i * scale + ctx.time * speed) + math.sin((i * 0.3) + ctx.time * speed * 1.3)) * 0.25 + 0.5
-            res.append(palette_color(make_palette("neon"), v))
-        return res
+    stateless = True
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        speed = p.speed
+        scale = p.scale
+        idx = pixel_index(ctx.length)
+        v = np.sin(idx * scale + (ctx.time * speed) % math.tau)
+        v += np.sin(idx * 0.3 + (ctx.time * speed * 1.3) % math.tau)
+        v *= 0.25
+        v += 0.5
+        palette_colors(get_palette("neon"), v, out)
+
+    def render_matrix(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        xs, ys = matrix_coords(ctx.width, ctx.height)
+        t = ctx.time * p.speed
+        v = np.sin(xs * p.scale + t % math.tau)
+        v += np.sin(ys * 0.3 + (t * 1.3) % math.tau)
+        v += np.sin((xs + ys) * p.scale * 0.7 + (t * 0.7) % math.tau)
+        v *= 1.0 / 6.0
+        v += 0.5
+        palette_colors(get_palette("neon"), v.ravel(), out.reshape(-1, 3))
 
 
 class Aurora(Effect):
@@ -465,16 +659,14 @@ class Aurora(Effect):
     category = "noise"
     description = "Noorderlicht-achtige stroken in beweging"
     default_params = {"speed": 0.15, "scale": 0.08}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        speed = ctx.params.get("speed", 0.15)
-        scale = ctx.params.get("scale", 0.08)
-        res = []
-        for i in range(ctx.length):
-            n = fractal_noise(i * scale + ctx.time * speed, 5, seed=20)
-            col = palette_color(make_palette("ocean"), n)
-            res.append(col)
-        return res
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        speed = p.speed
+        scale = p.scale
+        n = fractal_noise(_noise_coords(ctx.length, scale, ctx.time * speed), 5, seed=20)
+        palette_colors(get_palette("ocean"), n, out)
 
 
 class PrismaticNoise(Effect):
@@ -483,19 +675,18 @@ class PrismaticNoise(Effect):
     category = "noise"
     description = "Gelaagde noise met gecontroleerde contrast en palet"
     default_params = {"palette": "pastel", "speed": 0.35, "scale": 0.18, "depth": 4, "contrast": 0.82}
+    param_specs = {"depth": Param("int", min=1), "contrast": Param(min=0.2, max=1.5)}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        palette = make_palette(ctx.params.get("palette", "pastel"))
-        speed = ctx.params.get("speed", 0.35)
-        scale = ctx.params.get("scale", 0.18)
-        depth = max(1, int(ctx.params.get("depth", 4)))
-        contrast = clamp(ctx.params.get("contrast", 0.82), 0.2, 1.5)
-        res: List[RGB] = []
-        for i in range(ctx.length):
-            val = fractal_noise(i * scale + ctx.time * speed, depth, seed=33)
-            shaped = pow(val, contrast)
-            res.append(palette_color(palette, shaped))
-        return res
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        palette = get_palette(p.palette)
+        speed = p.speed
+        scale = p.scale
+        depth = p.depth
+        contrast = p.contrast
+        val = fractal_noise(_noise_coords(ctx.length, scale, ctx.time * speed), depth, seed=33)
+        palette_colors(palette, np.power(val, contrast, out=val), out)
 
 
 # --- Party & Dynamisch ---
@@ -506,19 +697,18 @@ class Comet(Effect):
     category = "party"
     description = "Enkele komeet met heldere staart"
     default_params = {"color": [255, 120, 60], "speed": 2.4, "tail": 10, "fade": 0.88}
+    param_specs = {"tail": Param("int", min=1)}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        color = tuple(ctx.params.get("color", [255, 120, 60]))  # type: ignore
-        speed = ctx.params.get("speed", 1.2)
-        tail = max(1, int(ctx.params.get("tail", 12)))
-        fade = ctx.params.get("fade", 0.8)
-        pos = (ctx.time * speed) % ctx.length
-        res = [(0, 0, 0)] * ctx.length
-        for i in range(tail):
-            idx = int((pos - i) % ctx.length)
-            factor = pow(fade, i)
-            res[idx] = tuple(int(c * factor) for c in color)
-        return res
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        color = p.color
+        speed = p.speed
+        tail = p.tail
+        fade = p.fade
+        head = np.array([int((ctx.time * speed) % ctx.length)])
+        out.fill(0.0)
+        draw_tails(out, head, decay_kernel(tail, fade), colors=color[None, :], wrap=True)
 
 
 class KnightRider(Effect):
@@ -527,18 +717,17 @@ class KnightRider(Effect):
     category = "party"
     description = "Scanner voor/achter (KITT-stijl)"
     default_params = {"color": [255, 0, 40], "speed": 0.8, "tail": 8}
-
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        color = tuple(ctx.params.get("color", [255, 0, 40]))  # type: ignore
-        speed = ctx.params.get("speed", 0.8)
-        tail = max(1, int(ctx.params.get("tail", 8)))
-        res = [(0, 0, 0)] * ctx.length
+    param_specs = {"tail": Param("int", min=1)}
+    stateless = True
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        color = p.color
+        speed = p.speed
+        tail = p.tail
         pos = (math.sin(ctx.time * speed * math.pi * 2) * 0.5 + 0.5) * (ctx.length - 1)
-        for i in range(tail):
-            idx = int(pos - i)
-            if 0 <= idx < ctx.length:
-                res[idx] = tuple(int(c * (1 - i / tail)) for c in color)
-        return res
+        out.fill(0.0)
+        draw_tails(out, np.array([int(pos)]), linear_kernel(tail), colors=color[None, :])
 
 
 class GapChase(Effect):
@@ -547,18 +736,20 @@ class GapChase(Effect):
     category = "party"
     description = "Snelle chase met gaten, bounce en lange staart"
     default_params = {"color": [255, 120, 40], "gap": 3, "width": 2, "trail": 0.86, "speed": 1.4, "bounce": True}
+    param_specs = {"gap": Param("int", min=1), "width": Param("int", min=1), "trail": Param(min=0.1, max=0.99), "speed": Param(min=0.05)}
 
     def __init__(self) -> None:
         self.phase = 0.0
         self.direction = 1.0
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        color = tuple(ctx.params.get("color", [255, 120, 40]))  # type: ignore
-        gap = max(1, int(ctx.params.get("gap", 3)))
-        width = max(1, int(ctx.params.get("width", 2)))
-        trail = clamp(ctx.params.get("trail", 0.86), 0.1, 0.99)
-        speed = max(0.05, ctx.params.get("speed", 1.4))
-        bounce = bool(ctx.params.get("bounce", True))
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        color = p.color
+        gap = p.gap
+        width = p.width
+        trail = p.trail
+        speed = p.speed
+        bounce = p.bounce
 
         step = width + gap
         travel = speed * ctx.dt * step * ctx.length * 0.15
@@ -574,15 +765,13 @@ class GapChase(Effect):
         else:
             self.phase = (self.phase + travel) % ctx.length
 
-        res = [(0, 0, 0)] * ctx.length
-        tail = max(2, int(width * 2))
-        for n in range(0, ctx.length + step, step):
-            base = (self.phase + n * self.direction) % ctx.length
-            for k in range(width + tail):
-                idx = int((base + self.direction * k) % ctx.length)
-                strength = pow(trail, k)
-                res[idx] = lerp_color((0, 0, 0), color, strength)
-        return res
+        # One head every `step` pixels; the tail trails ahead of it in the travel direction.
+        offsets = np.arange(0, ctx.length + step, step) * self.direction
+        heads = np.floor(np.mod(self.phase + offsets, ctx.length))
+        directions = np.full(heads.shape[0], -self.direction)
+        kernel = decay_kernel(width + max(2, int(width * 2)), trail)
+        out.fill(0.0)
+        draw_tails(out, heads, kernel, directions=directions, colors=color[None, :], wrap=True)
 
 
 class MultiComet(Effect):
@@ -591,32 +780,34 @@ class MultiComet(Effect):
     category = "party"
     description = "Meerdere kometen tegelijk"
     default_params = {"count": 3, "speed": 1.6, "tail": 12, "fade": 0.82, "palette": "neon", "jitter": 0.25}
+    param_specs = {"count": Param("int", min=1), "tail": Param("int", min=2), "fade": Param(min=0.1, max=0.98), "jitter": Param(min=0.0, max=1.0), "speed": Param(min=0.1)}
 
     def __init__(self) -> None:
-        self.positions: List[float] = []
-
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        count = max(1, int(ctx.params.get("count", 3)))
-        speed = max(0.1, ctx.params.get("speed", 1.0))
-        tail = max(2, int(ctx.params.get("tail", 12)))
-        fade = clamp(ctx.params.get("fade", 0.82), 0.1, 0.98)
-        palette = make_palette(ctx.params.get("palette", "neon"))
-        jitter = clamp(ctx.params.get("jitter", 0.25), 0.0, 1.0)
-
+        self.comets = Particles(4)
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        count = p.count
+        speed = p.speed
+        tail = p.tail
+        fade = p.fade
+        palette = get_palette(p.palette)
+        jitter = p.jitter
+
+        comets = self.comets
         # Maintain comet positions so they don't jump when parameters change mid-flight
-        if len(self.positions) != count:
-            self.positions = [(ctx.length / max(1, count)) * i for i in range(count)]
+        if comets.count != count:
+            comets.reserve(count)
+            comets.clear()
+            comets.spawn(count, pos=np.arange(count) * (ctx.length / count), tone=np.arange(count) / max(1, count - 1))
+        n = comets.count
+        comets.vel[:n] = speed * ctx.length * (1 + jitter * comets.rng.random(n, dtype=np.float32))
+        comets.step(ctx.dt)
+        np.mod(comets.pos[:n], ctx.length, out=comets.pos[:n])
 
-        res = [(0, 0, 0)] * ctx.length
-        for idx in range(count):
-            self.positions[idx] = (self.positions[idx] + speed * ctx.dt * ctx.length * (1 + jitter * random.random())) % ctx.length
-            head = self.positions[idx]
-            head_color = palette_color(palette, idx / max(1, count - 1))
-            for k in range(tail):
-                pos = int((head - k) % ctx.length)
-                strength = pow(fade, k)
-                res[pos] = lerp_color((0, 0, 0), head_color, strength)
-        return res
+        out.fill(0.0)
+        colors = palette.sample(comets.tone[:n])
+        draw_tails(out, np.floor(comets.pos[:n]), decay_kernel(tail, fade), colors=colors, wrap=True)
 
 
 class Twinkle(Effect):
@@ -625,28 +816,23 @@ class Twinkle(Effect):
     category = "party"
     description = "Twinkelende sterren over de strip"
     default_params = {"density": 0.12, "fade": 0.88, "color": [255, 255, 255], "background": [0, 0, 0]}
+    param_specs = {"fade": Param(min=0.0, max=0.999), "density": Param(min=0.0)}
 
     def __init__(self) -> None:
-        self.levels: List[float] = []
-
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        if len(self.levels) != ctx.length:
-            self.levels = [0.0] * ctx.length
-        density = max(0.0, ctx.params.get("density", 0.12))
-        fade = clamp(ctx.params.get("fade", 0.88), 0.0, 0.999)
-        color = tuple(ctx.params.get("color", [255, 255, 255]))  # type: ignore
-        background = tuple(ctx.params.get("background", [0, 0, 0]))  # type: ignore
+        self.field = DecayField()
 
-        decay = pow(fade, ctx.dt * 60)
-        self.levels = [level * decay for level in self.levels]
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        self.field.resize(ctx.length)
+        density = p.density
+        fade = p.fade
+        color = p.color
+        background = p.background
 
-        # Spawn a handful of new sparkles proportional to length and density
-        spawn = max(0, int(ctx.length * density * ctx.dt * 8))
-        for _ in range(spawn):
-            idx = random.randint(0, ctx.length - 1)
-            self.levels[idx] = 1.0
-
-        return [lerp_color(background, color, clamp(level)) for level in self.levels]
+        self.field.decay(pow(fade, ctx.dt * 60))
+        # Spawn new sparkles proportional to length and density
+        self.field.spawn(ctx.length * density * ctx.dt * 8)
+        self.field.blend(out, background, color)
 
 
 class Confetti(Effect):
@@ -655,31 +841,24 @@ class Confetti(Effect):
     category = "party"
     description = "Kleurige confetti-flitsen"
     default_params = {"chance": 0.22, "fade": 0.9, "palette": "neon"}
+    param_specs = {"fade": Param(min=0.0, max=0.999), "chance": Param(min=0.0)}
 
     def __init__(self) -> None:
-        self.levels: List[float] = []
-        self.colors: List[RGB] = []
-
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        if len(self.levels) != ctx.length:
-            self.levels = [0.0] * ctx.length
-            self.colors = [(255, 255, 255)] * ctx.length
-
-        chance = max(0.0, ctx.params.get("chance", 0.22))
-        fade = clamp(ctx.params.get("fade", 0.9), 0.0, 0.999)
-        palette = make_palette(ctx.params.get("palette", "neon"))
+        self.field = DecayField()
 
-        decay = pow(fade, ctx.dt * 60)
-        self.levels = [level * decay for level in self.levels]
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        field = self.field
+        field.resize(ctx.length, colors=True)
+        chance = p.chance
+        fade = p.fade
+        palette = get_palette(p.palette)
 
-        spawns = max(0, int(ctx.length * chance * ctx.dt * 6))
-        for _ in range(spawns):
-            idx = random.randint(0, ctx.length - 1)
-            self.levels[idx] = 1.0
-            hue_pos = random.random()
-            self.colors[idx] = palette_color(palette, hue_pos)
-
-        return [tuple(int(ch * clamp(level)) for ch in self.colors[i]) for i, level in enumerate(self.levels)]
+        field.decay(pow(fade, ctx.dt * 60))
+        idx = field.spawn(ctx.length * chance * ctx.dt * 6)
+        if idx.shape[0]:
+            field.colors[idx] = palette.sample(field.rng.random(idx.shape[0]))
+        field.blend(out, 0.0, field.colors)
 
 
 class GlitterOverlay(Effect):
@@ -688,27 +867,22 @@ class GlitterOverlay(Effect):
     category = "party"
     description = "Glitterlaag over je huidige effect"
     default_params = {"amount": 0.35, "base": [12, 12, 12], "sparkle": [255, 255, 255], "decay": 0.9}
+    param_specs = {"amount": Param(min=0.0, max=2.0), "decay": Param(min=0.1, max=0.99)}
 
     def __init__(self) -> None:
-        self.levels: List[float] = []
-
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        if len(self.levels) != ctx.length:
-            self.levels = [0.0] * ctx.length
-        amount = clamp(ctx.params.get("amount", 0.35), 0.0, 2.0)
-        decay = clamp(ctx.params.get("decay", 0.9), 0.1, 0.99)
-        base_color = tuple(ctx.params.get("base", [12, 12, 12]))  # type: ignore
-        sparkle_color = tuple(ctx.params.get("sparkle", [255, 255, 255]))  # type: ignore
+        self.field = DecayField()
 
-        decay_factor = pow(decay, ctx.dt * 60)
-        self.levels = [lvl * decay_factor for lvl in self.levels]
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        self.field.resize(ctx.length)
+        amount = p.amount
+        decay = p.decay
+        base_color = p.base
+        sparkle_color = p.sparkle
 
-        spawn = max(1, int(ctx.length * amount * ctx.dt * 4))
-        for _ in range(spawn):
-            idx = random.randint(0, ctx.length - 1)
-            self.levels[idx] = 1.0
-
-        return [lerp_color(base_color, sparkle_color, clamp(level)) for level in self.levels]
+        self.field.decay(pow(decay, ctx.dt * 60))
+        self.field.spawn(ctx.length * amount * ctx.dt * 4, minimum=1)
+        self.field.blend(out, base_color, sparkle_color)
 
 
 # --- Audio-reactive ---
@@ -719,43 +893,41 @@ class AudioBars(Effect):
     category = "music"
     description = "Spectrum-balken reageren op audio (mirror optioneel)"
     default_params = {"mirror": True, "palette": "neon", "span": 0}  # span=0 => automatisch volle lengte
+    param_specs = {"span": Param("int", min=0)}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
         bands = ctx.audio.get("bands", [0.0] * 8)
-        palette = make_palette(ctx.params.get("palette", "neon"))
-        mirror = ctx.params.get("mirror", True)
-        raw_span = ctx.params.get("span", 0)
-        span = int(raw_span) if raw_span else ctx.length
+        palette = get_palette(p.palette)
+        mirror = p.mirror
+        span = p.span or ctx.length
         span = max(1, min(span, ctx.length))
         segments = len(bands)
+        out.fill(0.0)
+        if not segments:
+            return
+        colors = palette_colors(palette, np.arange(segments) / max(1, segments - 1))
         boosted = [min(1.0, pow(level, 0.85) * 1.6) for level in bands]
 
         if mirror:
             target_len = max(1, span // 2)
-            seg_len = max(1, target_len // segments) if segments else target_len
-            half = [(0, 0, 0)] * target_len
+            seg_len = max(1, target_len // segments)
+            # Right half grows outward from the centre; the left half is its mirror image.
+            if ctx.length >= 2 * target_len:
+                half = out[target_len : 2 * target_len]
+            else:
+                half = np.zeros((target_len, 3), dtype=np.float32)
             for i, level in enumerate(boosted):
-                height = max(1, int(level * seg_len))
-                for k in range(height):
-                    idx = i * seg_len + k
-                    if idx < target_len:
-                        half[idx] = palette_color(palette, i / max(1, segments - 1))
-            res = list(reversed(half)) + half
-            if len(res) < span:
-                res += [(0, 0, 0)] * (span - len(res))
-            if len(res) < ctx.length:
-                res += [(0, 0, 0)] * (ctx.length - len(res))
-            return res[: ctx.length]
-
-        res = [(0, 0, 0)] * ctx.length
-        seg_len = max(1, span // segments) if segments else span
+                start = i * seg_len
+                half[start : min(target_len, start + max(1, int(level * seg_len)))] = colors[i]
+            out[: half.shape[0]] = half[::-1]
+            return
+
+        seg_len = max(1, span // segments)
         for i, level in enumerate(boosted):
-            height = max(1, int(level * seg_len))
-            for k in range(height):
-                idx = i * seg_len + k
-                if idx < span and idx < ctx.length:
-                    res[idx] = palette_color(palette, i / max(1, segments - 1))
-        return res[: ctx.length]
+            start = i * seg_len
+            out[start : min(span, start + max(1, int(level * seg_len)))] = colors[i]
 
 
 class EnergyWave(Effect):
@@ -764,16 +936,15 @@ class EnergyWave(Effect):
     category = "music"
     description = "Audio-golf die meedeint op volume"
     default_params = {"color": [0, 255, 200]}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
         level = ctx.audio.get("vol", 0.0)
-        color = tuple(ctx.params.get("color", [0, 255, 200]))  # type: ignore
-        res = []
-        for i in range(ctx.length):
-            t = math.sin((i / ctx.length * math.pi * 2) + ctx.time * 4) * 0.5 + 0.5
-            intensity = clamp(t * level * 2)
-            res.append(tuple(int(c * intensity) for c in color))
-        return res
+        color = p.color
+        t = np.sin(pixel_index(ctx.length) * (math.tau / ctx.length) + (ctx.time * 4) % math.tau) * 0.5 + 0.5
+        intensity = np.clip(t * (level * 2), 0.0, 1.0)
+        np.multiply(intensity[:, None], color, out=out)
 
 
 class BassPulse(Effect):
@@ -782,12 +953,13 @@ class BassPulse(Effect):
     category = "music"
     description = "Pulse op lage tonen, kleur instelbaar"
     default_params = {"color": [255, 90, 0]}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
         bass = ctx.audio.get("bands", [0.0])[0] if ctx.audio.get("bands") else 0.0
-        color = tuple(ctx.params.get("color", [255, 90, 0]))  # type: ignore
-        intensity = clamp(bass * 2)
-        return [tuple(int(c * intensity) for c in color)] * ctx.length
+        out[:] = p.color
+        out *= clamp(bass * 2)
 
 
 class FireAudio(Effect):
@@ -796,16 +968,16 @@ class FireAudio(Effect):
     category = "music"
     description = "Vuurgloed met audio-gestuurde beweging"
     default_params = {"speed": 0.4}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
         level = ctx.audio.get("vol", 0.0)
-        speed = ctx.params.get("speed", 0.4) + level * 0.6
-        res = []
-        for i in range(ctx.length):
-            n = fractal_noise(i * 0.1 + ctx.time * speed, 4, seed=42)
-            heat = clamp(n + level)
-            res.append(palette_color(make_palette("fire"), heat))
-        return res
+        speed = p.speed + level * 0.6
+        heat = fractal_noise(_noise_coords(ctx.length, 0.1, ctx.time * speed), 4, seed=42)
+        heat += level
+        np.clip(heat, 0.0, 1.0, out=heat)
+        palette_colors(get_palette("fire"), heat, out)
 
 
 class SpectrumGravity(Effect):
@@ -818,26 +990,24 @@ class SpectrumGravity(Effect):
     def __init__(self) -> None:
         self.peaks: List[float] = []
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
         bands = ctx.audio.get("bands", [0.0] * 8)
-        palette = make_palette(ctx.params.get("palette", "ocean"))
-        decay = ctx.params.get("decay", 0.95)
+        palette = get_palette(p.palette)
+        decay = p.decay
         if len(self.peaks) != len(bands):
             self.peaks = [0.0] * len(bands)
-        res = [(0, 0, 0)] * ctx.length
-        seg_len = ctx.length // len(bands) if bands else ctx.length
+        out.fill(0.0)
+        if not bands:
+            return
+        colors = palette_colors(palette, np.arange(len(bands)) / max(1, len(bands) - 1))
+        seg_len = ctx.length // len(bands)
         for i, level in enumerate(bands):
             self.peaks[i] = max(level, self.peaks[i] * decay)
             height = max(1, int(pow(self.peaks[i], 0.82) * seg_len * 1.6))
-            for k in range(height):
-                idx = i * seg_len + k
-                if idx < ctx.length:
-                    res[idx] = palette_color(palette, i / max(1, len(bands) - 1))
-            # extra glow at de basis voor meer spektakel
             base_idx = i * seg_len
-            if base_idx < ctx.length:
-                res[base_idx] = palette_color(palette, i / max(1, len(bands) - 1))
-        return res
+            # Bars may overshoot into the next band; later bands paint over them as before.
+            out[base_idx : base_idx + height] = colors[i]
 
 
 class PixelRipple(Effect):
@@ -850,24 +1020,22 @@ class PixelRipple(Effect):
     def __init__(self) -> None:
         self.origin = 0
         self.radius = 0
+        self.rng = make_rng()
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
         if ctx.audio.get("beat"):
-            self.origin = random.randint(0, max(0, ctx.length - 1))
+            self.origin = int(self.rng.integers(0, max(1, ctx.length)))
             self.radius = 1
         else:
             self.radius += ctx.dt * 60
-        fade = ctx.params.get("fade", 0.9)
-        color = tuple(ctx.params.get("color", [0, 200, 255]))  # type: ignore
-        res = []
-        for i in range(ctx.length):
-            dist = abs(i - self.origin)
-            if dist <= self.radius:
-                factor = max(0.0, 1 - (dist / max(1, self.radius)))
-                res.append(tuple(int(c * pow(fade, dist) * factor) for c in color))
-            else:
-                res.append((0, 0, 0))
-        return res
+        fade = p.fade
+        color = p.color
+        dist = np.abs(pixel_index(ctx.length) - self.origin)
+        factor = np.maximum(0.0, 1 - dist / max(1, self.radius))
+        factor *= np.power(fade, dist)
+        factor[dist > self.radius] = 0.0
+        np.multiply(factor[:, None], color, out=out)
 
 
 class StrobeOnBeat(Effect):
@@ -880,13 +1048,13 @@ class StrobeOnBeat(Effect):
     def __init__(self) -> None:
         self.last_flash = 0.0
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        color = tuple(ctx.params.get("color", [255, 255, 255]))  # type: ignore
-        duration = ctx.params.get("flash_ms", 80) / 1000.0
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        duration = p.flash_ms / 1000.0
         if ctx.audio.get("beat"):
             self.last_flash = ctx.time
         on = (ctx.time - self.last_flash) < duration
-        return [color if on else (0, 0, 0)] * ctx.length
+        out[:] = p.color if on else 0.0
 
 
 class SpectrumStream(Effect):
@@ -895,21 +1063,22 @@ class SpectrumStream(Effect):
     category = "music"
     description = "VU-meter vanuit het midden, per audioband"
     default_params = {"palette": "neon"}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
         bands = ctx.audio.get("bands", [0.0] * 8)
-        palette = make_palette(ctx.params.get("palette", "neon"))
-        res = [(0, 0, 0)] * ctx.length
+        palette = get_palette(p.palette)
+        out.fill(0.0)
+        if not bands:
+            return
+        colors = palette_colors(palette, np.arange(len(bands)) / max(1, len(bands) - 1))
         half = ctx.length // 2
         for i, level in enumerate(bands):
             length = int(level * half)
-            col = palette_color(palette, i / max(1, len(bands) - 1))
-            for k in range(length):
-                if half + k < ctx.length:
-                    res[half + k] = col
-                if half - k - 1 >= 0:
-                    res[half - k - 1] = col
-        return res
+            if length > 0:
+                out[half : half + length] = colors[i]
+                out[max(0, half - length) : half] = colors[i]
 
 
 class BeatWave(Effect):
@@ -922,25 +1091,22 @@ class BeatWave(Effect):
     def __init__(self) -> None:
         self.last_beat = 0.0
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        color = tuple(ctx.params.get("color", [180, 120, 255]))  # type: ignore
-        speed = ctx.params.get("speed", 1.8)
-        decay = ctx.params.get("decay", 0.92)
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        color = p.color
+        speed = p.speed
+        decay = p.decay
         if ctx.audio.get("beat"):
             self.last_beat = ctx.time
         age = max(0.0, ctx.time - self.last_beat)
         radius = age * speed * (ctx.length / 2)
-        res: List[RGB] = []
-        mid = ctx.length // 2
-        for i in range(ctx.length):
-            dist = abs(i - mid)
-            if dist <= radius:
-                fade = pow(max(0.0, 1 - dist / max(1, radius)), 2)
-                res.append(tuple(int(c * fade) for c in color))  # type: ignore
-            else:
-                res.append((0, 0, 0))
+        dist = np.abs(pixel_index(ctx.length) - ctx.length // 2)
+        fade = np.maximum(0.0, 1 - dist / max(1, radius))
+        fade *= fade
+        fade[dist > radius] = 0.0
         # zachte decay
-        return [tuple(int(ch * pow(decay, age * 10)) for ch in px) for px in res]
+        fade *= pow(decay, age * 10)
+        np.multiply(fade[:, None], color, out=out)
 
 
 class HazePulse(Effect):
@@ -949,21 +1115,21 @@ class HazePulse(Effect):
     category = "music"
     description = "Zachte paarse haze met audio-pulsen"
     default_params = {"palette": "neon", "speed": 0.6, "depth": 0.35}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        palette = make_palette(ctx.params.get("palette", "neon"))
-        speed = ctx.params.get("speed", 0.6)
-        depth = ctx.params.get("depth", 0.35)
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        palette = get_palette(p.palette)
+        speed = p.speed
+        depth = p.depth
         vol = ctx.audio.get("vol", 0.0)
-        res: List[RGB] = []
-        for i in range(ctx.length):
-            pos = (i / max(1, ctx.length - 1)) + ctx.time * speed
-            base = palette_color(palette, pos)
-            haze = 0.25 + depth * (math.sin(pos * 4 + ctx.time * 2) * 0.5 + 0.5)
-            boost = 0.5 + vol * 1.2
-            mix = tuple(int(min(255, c * (haze + boost * 0.5))) for c in base)  # type: ignore
-            res.append(mix)
-        return res
+        pos = pixel_index(ctx.length) / max(1, ctx.length - 1)
+        palette_colors(palette, pos + (ctx.time * speed) % 1.0, out)
+        haze = np.sin(pos * 4 + (ctx.time * speed * 4 + ctx.time * 2) % math.tau) * 0.5 + 0.5
+        haze *= depth
+        haze += 0.25 + (0.5 + vol * 1.2) * 0.5
+        out *= haze[:, None]
+        np.minimum(out, 255.0, out=out)
 
 
 class PrismBass(Effect):
@@ -972,30 +1138,26 @@ class PrismBass(Effect):
     category = "music"
     description = "Gespiegelde prisma-balken op bass"
     default_params = {"palette": "neon", "mirror": True}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
         bands = ctx.audio.get("bands", [0.0] * 8)
-        palette = make_palette(ctx.params.get("palette", "neon"))
-        mirror = ctx.params.get("mirror", True)
+        palette = get_palette(p.palette)
+        mirror = p.mirror
         segments = len(bands)
+        out.fill(0.0)
         if segments == 0:
-            return [(0, 0, 0)] * ctx.length
+            return
+        colors = palette_colors(palette, np.arange(segments) / max(1, segments - 1))
         half_len = ctx.length // (2 if mirror else 1)
         seg_len = max(1, half_len // segments)
-        half = [(0, 0, 0)] * half_len
+        half = out[half_len : 2 * half_len] if mirror else out[:half_len]
         for i, level in enumerate(bands):
-            height = max(1, int(pow(level, 0.8) * seg_len * 1.7))
-            col = palette_color(palette, i / max(1, segments - 1))
-            for k in range(height):
-                idx = i * seg_len + k
-                if idx < half_len:
-                    half[idx] = col
+            start = i * seg_len
+            half[start : min(half_len, start + max(1, int(pow(level, 0.8) * seg_len * 1.7)))] = colors[i]
         if mirror:
-            res = list(reversed(half)) + half
-            if len(res) < ctx.length:
-                res += [(0, 0, 0)] * (ctx.length - len(res))
-            return res[: ctx.length]
-        return half[: ctx.length]
+            out[:half_len] = half[::-1]
 
 
 class SpectrumFlow(Effect):
@@ -1006,34 +1168,26 @@ class SpectrumFlow(Effect):
     default_params = {"palette": "neon", "speed": 0.85, "trail": 0.84}
 
     def __init__(self) -> None:
-        self.energy: List[float] = []
+        self.energy = np.zeros(0, dtype=np.float32)
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
         bands = ctx.audio.get("bands", [0.0] * 8)
-        palette = make_palette(ctx.params.get("palette", "neon"))
-        speed = ctx.params.get("speed", 0.85)
-        trail = ctx.params.get("trail", 0.84)
-        if len(self.energy) != ctx.length:
-            self.energy = [0.0] * ctx.length
-
-        for i in range(ctx.length):
-            pos = i / max(1, ctx.length - 1)
-            band_pos = pos * max(1, len(bands) - 1)
-            idx = int(band_pos)
-            frac = band_pos - idx
-            b1 = bands[idx] if idx < len(bands) else 0.0
-            b2 = bands[idx + 1] if idx + 1 < len(bands) else b1
-            level = clamp((1 - frac) * b1 + frac * b2)
-            sweep = math.sin((pos + ctx.time * speed) * math.pi * 2) * 0.5 + 0.5
-            target = clamp(level * 1.4 * (0.4 + sweep * 0.6))
-            self.energy[i] = max(target, self.energy[i] * trail)
-
-        res: List[RGB] = []
-        for i, val in enumerate(self.energy):
-            hue_pos = (ctx.time * speed * 0.2 + i / max(1, ctx.length - 1)) % 1.0
-            col = palette_color(palette, hue_pos)
-            res.append(tuple(int(c * val) for c in col))  # type: ignore
-        return res
+        palette = get_palette(p.palette)
+        speed = p.speed
+        trail = p.trail
+        if self.energy.shape[0] != ctx.length:
+            self.energy = np.zeros(ctx.length, dtype=np.float32)
+
+        pos = pixel_index(ctx.length) / max(1, ctx.length - 1)
+        level = _band_levels(bands, pos)
+        sweep = np.sin(pos * math.tau + (ctx.time * speed * math.tau) % math.tau) * 0.5 + 0.5
+        target = np.clip(level * 1.4 * (0.4 + sweep * 0.6), 0.0, 1.0)
+        self.energy *= trail
+        np.maximum(target, self.energy, out=self.energy)
+
+        palette_colors(palette, pos + (ctx.time * speed * 0.2) % 1.0, out)
+        out *= self.energy[:, None]
 
 
 class AudioShimmer(Effect):
@@ -1042,34 +1196,34 @@ class AudioShimmer(Effect):
     category = "music"
     description = "Glitterende stroken op audiobanden met decay"
     default_params = {"palette": "pastel", "trail": 0.9, "sensitivity": 1.3, "sparkle": 0.2}
+    param_specs = {"trail": Param(min=0.5, max=0.99), "sensitivity": Param(min=0.2, max=3.0), "sparkle": Param(min=0.0, max=1.0)}
 
     def __init__(self) -> None:
-        self.energy: List[float] = []
+        self.energy = np.zeros(0, dtype=np.float32)
+        self.rng = make_rng()
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
         bands = ctx.audio.get("bands", [0.0] * 8)
-        palette = make_palette(ctx.params.get("palette", "pastel"))
-        trail = clamp(ctx.params.get("trail", 0.9), 0.5, 0.99)
-        sensitivity = clamp(ctx.params.get("sensitivity", 1.3), 0.2, 3.0)
-        sparkle = clamp(ctx.params.get("sparkle", 0.2), 0.0, 1.0)
-        if len(self.energy) != ctx.length:
-            self.energy = [0.0] * ctx.length
-
-        res: List[RGB] = []
-        for i in range(ctx.length):
-            pos = i / max(1, ctx.length - 1)
-            band_pos = pos * max(1, len(bands) - 1)
-            idx = int(band_pos)
-            frac = band_pos - idx
-            b1 = bands[idx] if idx < len(bands) else 0.0
-            b2 = bands[idx + 1] if idx + 1 < len(bands) else b1
-            level = clamp((1 - frac) * b1 + frac * b2) * sensitivity
-            self.energy[i] = max(level, self.energy[i] * trail)
-            hue = (ctx.time * 0.12 + pos) % 1.0
-            base = palette_color(palette, hue)
-            energy = clamp(self.energy[i] + (random.random() * sparkle if level > 0.4 else 0))
-            res.append(tuple(int(c * energy) for c in base))  # type: ignore
-        return res
+        palette = get_palette(p.palette)
+        trail = p.trail
+        sensitivity = p.sensitivity
+        sparkle = p.sparkle
+        if self.energy.shape[0] != ctx.length:
+            self.energy = np.zeros(ctx.length, dtype=np.float32)
+
+        pos = pixel_index(ctx.length) / max(1, ctx.length - 1)
+        level = np.clip(_band_levels(bands, pos), 0.0, 1.0) * sensitivity
+        self.energy *= trail
+        np.maximum(level, self.energy, out=self.energy)
+        energy = self.energy.copy()
+        if sparkle > 0:
+            loud = level > 0.4
+            energy[loud] += self.rng.random(int(loud.sum()), dtype=np.float32) * sparkle
+        np.clip(energy, 0.0, 1.0, out=energy)
+
+        palette_colors(palette, pos + (ctx.time * 0.12) % 1.0, out)
+        out *= energy[:, None]
 
 
 class BeatStreaks(Effect):
@@ -1080,53 +1234,47 @@ class BeatStreaks(Effect):
     default_params = {"palette": "sunset", "trail": 0.82, "speed": 1.6}
 
     def __init__(self) -> None:
-        self.streaks: List[Dict] = []
-        self.decay: List[float] = []
-
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        palette = make_palette(ctx.params.get("palette", "sunset"))
-        trail = ctx.params.get("trail", 0.82)
-        speed = ctx.params.get("speed", 1.6)
+        self.streaks = Particles(24)
+        self.decay = np.zeros(0, dtype=np.float32)
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        palette = get_palette(p.palette)
+        trail = p.trail
+        speed = p.speed
         vol = ctx.audio.get("vol", 0.0)
         flux = ctx.audio.get("flux", 0.0)
         beat = ctx.audio.get("beat", False)
-        if len(self.decay) != ctx.length:
-            self.decay = [0.0] * ctx.length
+        if self.decay.shape[0] != ctx.length:
+            self.decay = np.zeros(ctx.length, dtype=np.float32)
 
+        streaks = self.streaks
+        rng = streaks.rng
         spawn_prob = 0.15 + vol * 0.6 + flux * 0.5
-        spawn_chance = spawn_prob * ctx.dt
-        if beat or random.random() < spawn_chance:
-            origin = random.randint(0, max(0, ctx.length - 1))
-            direction = random.choice([-1, 1])
-            self.streaks.append({"pos": origin, "dir": direction, "life": 1.0})
-            if len(self.streaks) > 24:
-                self.streaks = self.streaks[-24:]
-
-        res_vals = [0.0] * ctx.length
-        next_streaks = []
-        for s in self.streaks:
-            s["pos"] += s["dir"] * speed * ctx.dt * ctx.length * (1.0 + vol)
-            s["life"] *= 0.985
-            if s["life"] < 0.08:
-                continue
-            if -ctx.length <= s["pos"] <= ctx.length * 2:
-                next_streaks.append(s)
-            center = int(s["pos"])
-            for k in range(-8, 9):
-                idx = center + k
-                if 0 <= idx < ctx.length:
-                    falloff = max(0.0, 1 - abs(k) / 8)
-                    res_vals[idx] = max(res_vals[idx], falloff * s["life"])
-        self.streaks = next_streaks
-
-        res: List[RGB] = []
-        base_haze = 0.08 + vol * 0.35
-        for i in range(ctx.length):
-            self.decay[i] = max(res_vals[i], self.decay[i] * trail)
-            brightness = clamp(base_haze + self.decay[i])
-            col = palette_color(palette, (ctx.time * 0.25 + i / max(1, ctx.length - 1)) % 1.0)
-            res.append(tuple(int(c * brightness) for c in col))
-        return res
+        if beat or rng.random() < spawn_prob * ctx.dt:
+            streaks.spawn(1, pos=rng.integers(0, max(1, ctx.length)), direction=rng.choice((-1.0, 1.0)))
+
+        n = streaks.count
+        streaks.vel[:n] = streaks.dir[:n] * (speed * ctx.length * (1.0 + vol))
+        streaks.step(ctx.dt, 0.985)
+        streaks.keep(streaks.life[:n] >= 0.08)
+        n = streaks.count
+        pos = streaks.pos[:n]
+        heads = pos.astype(np.intp)
+        life = streaks.life[:n].copy()
+        # Streaks that left the strip are drawn one last time, then dropped.
+        streaks.keep((pos >= -ctx.length) & (pos <= ctx.length * 2))
+
+        levels = np.zeros(ctx.length, dtype=np.float32)
+        kernel = linear_kernel(8)
+        draw_tails(levels, heads, kernel, strengths=life)
+        draw_tails(levels, heads, kernel, strengths=life, directions=np.full(n, -1))
+        self.decay *= trail
+        np.maximum(levels, self.decay, out=self.decay)
+
+        brightness = np.clip(self.decay + (0.08 + vol * 0.35), 0.0, 1.0)
+        palette.sample(pixel_index(ctx.length) / max(1, ctx.length - 1) + (ctx.time * 0.25) % 1.0, out)
+        out *= brightness[:, None]
 
 
 class FluxTunnel(Effect):
@@ -1139,24 +1287,25 @@ class FluxTunnel(Effect):
     def __init__(self) -> None:
         self.phase = 0.0
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        palette = make_palette(ctx.params.get("palette", "ocean"))
-        speed = ctx.params.get("speed", 1.2)
-        depth = ctx.params.get("depth", 2.3)
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        palette = get_palette(p.palette)
+        speed = p.speed
+        depth = p.depth
         vol = ctx.audio.get("vol", 0.0)
         flux = ctx.audio.get("flux", 0.0)
         bass = ctx.audio.get("bass", 0.0)
         self.phase = (self.phase + ctx.dt * (speed + flux * 2.0)) % 1.0
         center = (ctx.length - 1) / 2
-        res: List[RGB] = []
-        for i in range(ctx.length):
-            dist = abs(i - center) / max(1.0, center)
-            tunnel = max(0.0, 1 - dist)
-            swirl = math.sin(dist * depth * math.pi + self.phase * 2 * math.pi) * 0.5 + 0.5
-            energy = clamp(tunnel * (0.45 + vol * 1.2) + swirl * 0.55 + flux * 0.9 + bass * 0.7)
-            col = palette_color(palette, (self.phase + i / max(1, ctx.length - 1)) % 1.0)
-            res.append(tuple(int(c * energy) for c in col))
-        return res
+        idx = pixel_index(ctx.length)
+        dist = np.abs(idx - center) / max(1.0, center)
+        tunnel = np.maximum(0.0, 1 - dist)
+        swirl = np.sin(dist * (depth * math.pi) + self.phase * math.tau) * 0.5 + 0.5
+        energy = tunnel * (0.45 + vol * 1.2)
+        energy += swirl * 0.55 + (flux * 0.9 + bass * 0.7)
+        np.clip(energy, 0.0, 1.0, out=energy)
+        palette_colors(palette, idx / max(1, ctx.length - 1) + self.phase, out)
+        out *= energy[:, None]
 
 
 class PulseWhite(Effect):
@@ -1165,14 +1314,15 @@ class PulseWhite(Effect):
     category = "ambient"
     description = "Zachte wit/koele pulse"
     default_params = {"color": [255, 255, 255], "speed": 0.6, "intensity": 0.8}
+    stateless = True
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        speed = ctx.params.get("speed", 0.6)
-        inten = ctx.params.get("intensity", 0.8)
-        base = tuple(ctx.params.get("color", [255, 255, 255]))  # type: ignore
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        speed = p.speed
+        inten = p.intensity
         phase = (math.sin(ctx.time * speed * 2 * math.pi) + 1) / 2
-        val = inten * phase
-        return [tuple(int(c * val) for c in base)] * ctx.length  # type: ignore
+        out[:] = p.color
+        out *= inten * phase
 
 
 class Sunrise(Effect):
@@ -1182,14 +1332,13 @@ class Sunrise(Effect):
     description = "Langzame sunrise van onder naar boven"
     default_params = {"speed": 0.08}
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        speed = ctx.params.get("speed", 0.08)
-        palette = [(20, 10, 0), (120, 30, 0), (220, 120, 30), (255, 200, 120), (255, 235, 200)]
-        res: List[RGB] = []
-        for i in range(ctx.length):
-            pos = (i / max(1, ctx.length - 1)) + ctx.time * speed
-            res.append(palette_color(palette, pos))
-        return res
+    palette = compile_palette(((20, 10, 0), (120, 30, 0), (220, 120, 30), (255, 200, 120), (255, 235, 200)))
+    stateless = True
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        offset = (ctx.time * p.speed) % 1.0
+        palette_colors(self.palette, pixel_index(ctx.length) / max(1, ctx.length - 1) + offset, out)
 
 
 class MatrixRain(Effect):
@@ -1198,38 +1347,42 @@ class MatrixRain(Effect):
     category = "party"
     description = "Groene digital rain"
     default_params = {"density": 0.12, "speed": 1.1, "fade": 0.72, "tail": 10}
+    param_specs = {"tail": Param("int", min=2), "density": Param(min=0.01, max=1.0), "fade": Param(min=0.1, max=0.98), "speed": Param(min=0.1)}
 
     def __init__(self) -> None:
-        self.drops: List[Dict[str, float]] = []
+        self.drops = Particles(64)
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        density = clamp(ctx.params.get("density", 0.12), 0.01, 1.0)
-        speed = max(0.1, ctx.params.get("speed", 1.1))
-        fade = clamp(ctx.params.get("fade", 0.72), 0.1, 0.98)
-        tail = max(2, int(ctx.params.get("tail", 10)))
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        density = p.density
+        speed = p.speed
+        fade = p.fade
+        tail = p.tail
 
+        drops = self.drops
         target = max(1, int(ctx.length * density))
-        while len(self.drops) < target:
-            self.drops.append({"pos": random.uniform(-tail, ctx.length), "vel": speed * (0.7 + random.random() * 0.6)})
-
-        res: List[RGB] = [(0, 0, 0)] * ctx.length
-        next_drops: List[Dict[str, float]] = []
-        for drop in self.drops:
-            drop["pos"] += drop["vel"] * ctx.dt * ctx.length * 0.45
-            if drop["pos"] < ctx.length + tail:
-                next_drops.append(drop)
-            head = int(drop["pos"])
-            for k in range(tail):
-                idx = head - k
-                if 0 <= idx < ctx.length:
-                    strength = pow(fade, k) * 1.1
-                    res[idx] = (0, int(255 * clamp(strength)), 0)
-        self.drops = next_drops
+        if drops.count < target:
+            missing = target - drops.count
+            drops.reserve(target)
+            rng = drops.rng
+            drops.spawn(
+                missing,
+                pos=rng.uniform(-tail, ctx.length, missing),
+                vel=speed * (0.7 + rng.random(missing) * 0.6),
+            )
+
+        n = drops.count
+        drops.pos[:n] += drops.vel[:n] * (ctx.dt * ctx.length * 0.45)
+        heads = drops.pos[:n].astype(np.intp)
+        drops.keep(drops.pos[:n] < ctx.length + tail)
+
+        levels = np.zeros(ctx.length, dtype=np.float32)
+        draw_tails(levels, heads, decay_kernel(tail, fade, 1.1))
+        green = np.floor(levels * 255)
         # Gentle green haze background
-        for i in range(ctx.length):
-            if res[i] == (0, 0, 0):
-                res[i] = (0, int(45 * fade), 0)
-        return res
+        green[green == 0] = int(45 * fade)
+        out.fill(0.0)
+        out[:, 1] = green
 
 
 class WarpSpeed(Effect):
@@ -1238,51 +1391,42 @@ class WarpSpeed(Effect):
     category = "party"
     description = "Witte streaks vanuit het midden (hyperspace)"
     default_params = {"speed": 1.8, "trail": 0.7, "count": 8, "glow": 0.28}
+    param_specs = {"count": Param("int", min=2), "trail": Param(min=0.05, max=1.0), "glow": Param(min=0.0, max=1.0), "speed": Param(min=0.1)}
 
     def __init__(self) -> None:
-        self.streaks: List[Dict[str, float]] = []
-
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        speed = max(0.1, ctx.params.get("speed", 1.8))
-        trail = clamp(ctx.params.get("trail", 0.7), 0.05, 1.0)
-        count = max(2, int(ctx.params.get("count", 8)))
-        glow = clamp(ctx.params.get("glow", 0.28), 0.0, 1.0)
+        self.streaks = Particles(16)
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        speed = p.speed
+        trail = p.trail
+        count = p.count
+        glow = p.glow
         center = (ctx.length - 1) / 2.0
 
-        while len(self.streaks) < count:
-            dir = random.choice([-1.0, 1.0])
-            self.streaks.append({"pos": 0.0, "dir": dir, "phase": random.random(), "life": 1.0})
+        streaks = self.streaks
+        if streaks.count < count:
+            missing = count - streaks.count
+            streaks.reserve(count)
+            rng = streaks.rng
+            streaks.spawn(missing, direction=rng.choice((-1.0, 1.0), missing), tone=rng.random(missing))
 
-        res: List[RGB] = [(0, 0, 0)] * ctx.length
-        next_streaks: List[Dict[str, float]] = []
         tail_len = max(1, int(center * trail))
-
-        for streak in self.streaks:
-            velocity = speed * (1.1 + streak["phase"] * 0.6)
-            streak["pos"] += streak["dir"] * velocity * ctx.dt * ctx.length * 0.5
-            streak["life"] *= 0.993
-            head = center + streak["pos"]
-
-            if streak["life"] < 0.08 or head < -tail_len or head > ctx.length + tail_len:
-                continue
-            next_streaks.append(streak)
-
-            for k in range(tail_len):
-                idx = int(head - streak["dir"] * k)
-                if 0 <= idx < ctx.length:
-                    val = max(0.0, 1 - k / max(1, tail_len))
-                    brightness = clamp(val * streak["life"])
-                    col = int(255 * clamp(brightness))
-                    base = res[idx]
-                    res[idx] = (max(base[0], col), max(base[1], col), max(base[2], col))
-
-        self.streaks = next_streaks
-
+        n = streaks.count
+        # Velocity follows the live speed; tone holds each streak's fixed speed variation.
+        streaks.vel[:n] = streaks.dir[:n] * speed * (1.1 + streaks.tone[:n] * 0.6) * (ctx.length * 0.5)
+        streaks.step(ctx.dt, 0.993)
+        head = center + streaks.pos[:n]
+        streaks.keep((streaks.life[:n] >= 0.08) & (head >= -tail_len) & (head <= ctx.length + tail_len))
+        n = streaks.count
+
+        levels = np.zeros(ctx.length, dtype=np.float32)
+        heads = np.floor(center + streaks.pos[:n])
+        draw_tails(levels, heads, linear_kernel(tail_len), strengths=np.minimum(streaks.life[:n], 1.0), directions=streaks.dir[:n])
+        white = np.floor(levels * 255)
         if glow > 0:
-            haze = int(255 * glow * 0.5)
-            res = [(max(r, haze), max(g, haze), max(b, haze)) for (r, g, b) in res]
-
-        return res
+            np.maximum(white, int(255 * glow * 0.5), out=white)
+        out[:] = white[:, None]
 
 
 class SparkleWave(Effect):
@@ -1292,21 +1436,131 @@ class SparkleWave(Effect):
     description = "Glitter over een zachte golf"
     default_params = {"color": [80, 160, 255], "speed": 0.7, "sparkles": 0.08}
 
-    def render(self, ctx: EffectContext) -> List[RGB]:
-        speed = ctx.params.get("speed", 0.7)
-        sparkles = ctx.params.get("sparkles", 0.08)
-        base = tuple(ctx.params.get("color", [80, 160, 255]))  # type: ignore
-        res: List[RGB] = []
-        for i in range(ctx.length):
-            phase = (math.sin((i / max(1, ctx.length - 1)) * math.pi * 2 + ctx.time * speed) + 1) / 2
-            val = 0.4 + 0.6 * phase
-            col = tuple(int(c * val) for c in base)  # type: ignore
-            res.append(col)
+    def __init__(self) -> None:
+        self.rng = make_rng()
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        speed = p.speed
+        sparkles = p.sparkles
+        base = p.color
+        phase = np.sin(pixel_index(ctx.length) * (math.tau / max(1, ctx.length - 1)) + (ctx.time * speed) % math.tau)
+        val = 0.7 + 0.3 * phase
+        np.multiply(val[:, None], base, out=out)
         count = max(1, int(ctx.length * sparkles))
-        for _ in range(count):
-            idx = random.randint(0, ctx.length - 1)
-            res[idx] = (255, 255, 255)
-        return res
+        out[self.rng.integers(0, ctx.length, count)] = 255.0
+
+
+# --- Spatial (3D coordinates) ---
+
+
+def _spatial(ctx: EffectContext) -> SpatialIndex:
+    """The segment's LED positions; plain strips and matrices fall back to a line or grid."""
+    if ctx.spatial is not None and len(ctx.spatial) == ctx.length:
+        return ctx.spatial
+    return fallback_index(ctx.length, ctx.width, ctx.height)
+
+
+class PlaneSweep(Effect):
+    name = "plane_sweep"
+    label = "Plane Sweep"
+    category = "spatial"
+    description = "Kleurvlakken die in een richting door de ruimte schuiven"
+    default_params = {"palette": "neon", "speed": 0.3, "angle": 90.0, "tilt": 0.0, "bands": 1.5}
+    param_specs = {"angle": Param(min=0.0, max=360.0), "tilt": Param(min=-90.0, max=90.0), "bands": Param(min=0.1)}
+    stateless = True
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        angle, tilt = math.radians(p.angle), math.radians(p.tilt)
+        direction = (math.cos(angle) * math.cos(tilt), math.sin(angle) * math.cos(tilt), math.sin(tilt))
+        pos = plane_field(_spatial(ctx).points, direction)
+        pos *= p.bands * 0.5
+        pos -= (ctx.time * p.speed) % 1.0
+        palette_colors(get_palette(p.palette), pos, out)
+
+
+class RadialWave(Effect):
+    name = "radial_wave"
+    label = "Radial Wave"
+    category = "spatial"
+    description = "Bolvormige golven vanuit een middelpunt in de ruimte"
+    default_params = {"color": [255, 120, 40], "speed": 0.6, "wavelength": 0.5, "sharpness": 2.0, "center_x": 0.0, "center_y": 0.0, "center_z": 0.0}
+    param_specs = {
+        "wavelength": Param(min=0.05),
+        "sharpness": Param(min=0.5, max=8.0),
+        "center_x": Param(min=-1.0, max=1.0),
+        "center_y": Param(min=-1.0, max=1.0),
+        "center_z": Param(min=-1.0, max=1.0),
+    }
+    stateless = True
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        dist = radial_field(_spatial(ctx).points, (p.center_x, p.center_y, p.center_z))
+        phase = dist / p.wavelength - (ctx.time * p.speed) % 1.0
+        wave = np.cos(phase * math.tau)
+        wave *= 0.5
+        wave += 0.5
+        np.power(wave, p.sharpness, out=wave)
+        np.multiply(wave[:, None], p.color, out=out)
+
+
+class SpatialNoise(Effect):
+    name = "spatial_noise"
+    label = "Spatial Noise"
+    category = "spatial"
+    description = "3D-noiseveld dat door de opstelling drijft"
+    default_params = {"palette": "ocean", "speed": 0.2, "scale": 1.5, "depth": 3}
+    param_specs = {"depth": Param("int", min=1, max=6), "scale": Param(min=0.1)}
+    stateless = True
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        val = noise_field(_spatial(ctx).points, p.scale, ctx.time * p.speed, octaves=p.depth, seed=41)
+        palette_colors(get_palette(p.palette), val, out)
+
+
+class SpatialRipple(Effect):
+    name = "spatial_ripple"
+    label = "Spatial Ripple"
+    category = "spatial"
+    description = "Ringen die bij een beat van LED naar LED door de opstelling lopen"
+    default_params = {"color": [0, 200, 255], "reach": 0.08, "speed": 1.0, "fade": 0.85}
+    param_specs = {"reach": Param(min=0.01, max=0.5), "speed": Param(min=0.1, max=4.0), "fade": Param(min=0.0, max=0.99)}
+
+    def __init__(self) -> None:
+        self.front = np.zeros(0, dtype=np.float32)
+        self.seen = np.zeros(0, dtype=bool)
+        self.glow = np.zeros(0, dtype=np.float32)
+        self.steps = 0.0
+        self.rng = make_rng()
+
+    def render_into(self, ctx: EffectContext, out: np.ndarray) -> None:
+        p = self.params(ctx)
+        n = ctx.length
+        if self.glow.shape[0] != n:
+            self.front = np.zeros(n, dtype=np.float32)
+            self.seen = np.zeros(n, dtype=bool)
+            self.glow = np.zeros(n, dtype=np.float32)
+        if ctx.audio.get("beat"):
+            origin = int(self.rng.integers(0, max(1, n)))
+            self.front[origin] = self.glow[origin] = 1.0
+            self.seen[:] = False
+            self.seen[origin] = True
+        offsets, indices = _spatial(ctx).neighbors(p.reach)
+        # The front hops one neighbourhood per step and never revisits LEDs, so it stays a ring.
+        self.steps += p.speed * ctx.dt * 60.0
+        self.glow *= p.fade ** (ctx.dt * 60.0)
+        while self.steps >= 1.0:
+            self.steps -= 1.0
+            front = spread(self.front, offsets, indices)
+            front *= 0.97
+            front[self.seen] = 0.0
+            self.seen |= front > 0.02
+            self.front = front
+            np.maximum(self.glow, front, out=self.glow)
+        np.multiply(self.glow[:, None], p.color, out=out)
 
 
 # Register all effects
@@ -1358,5 +1612,9 @@ for cls in [
     WarpSpeed,
     SparkleWave,
     DualWave,
+    PlaneSweep,
+    RadialWave,
+    SpatialNoise,
+    SpatialRipple,
 ]:
     register(cls)
@@ -0,0 +1,232 @@
+"""Optional JIT-compiled kernels for the hottest effect primitives.
+
+The NumPy implementations in ``noise``, ``palettes``, ``particles`` and the hue wheel are
+always available and are what runs by default. ``configure("auto")`` compiles fused
+numba versions in a background thread (``cache=True``, so later boots only load them from
+the on-disk cache) and switches them in once they are warm; callers check the module-level
+kernel slots, which stay ``None`` while NumPy is in charge. numba is never imported on the
+boot path, so startup time does not depend on it.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+MODES = ("auto", "numpy", "numba")
+
+# Kernel slots; None means "use the NumPy path".
+palette_sample = None
+hue_sample = None
+fractal_noise = None
+tails_levels = None
+tails_colors = None
+
+_lock = threading.Lock()
+_info: Dict = {"requested": "numpy", "active": "numpy", "version": None, "warmup_ms": None, "error": None}
+_thread: Optional[threading.Thread] = None
+
+
+def backend_info() -> Dict:
+    """Requested and active kernel backend, numba version and warmup time (for /api/status)."""
+    with _lock:
+        return dict(_info)
+
+
+def active_backend() -> str:
+    return _info["active"]
+
+
+def plain(array, ndim: int = 1) -> bool:
+    """True when ``array`` matches a warmed-up signature: float, C-contiguous and writable.
+
+    Anything else would make numba compile a new specialization mid-frame, so callers
+    keep such inputs on the NumPy path.
+    """
+    return (
+        isinstance(array, np.ndarray)
+        and array.ndim == ndim
+        and array.dtype in _FLOATS
+        and array.flags.c_contiguous
+        and array.flags.writeable
+    )
+
+
+_FLOATS = (np.dtype(np.float32), np.dtype(np.float64))
+
+
+def configure(mode: str = "auto", background: bool = True) -> None:
+    """Select the kernel backend; ``auto``/``numba`` compile and warm up the numba kernels.
+
+    With ``background`` the warmup runs on a daemon thread and the NumPy path keeps
+    rendering until it finishes; otherwise this blocks until the kernels are ready.
+    """
+    global _thread
+    mode = mode if mode in MODES else "auto"
+    with _lock:
+        _info["requested"] = mode
+    if mode == "numpy":
+        _deactivate()
+        return
+    if _info["active"] == "numba" or (_thread is not None and _thread.is_alive()):
+        return
+    if background:
+        _thread = threading.Thread(target=_warmup, args=(mode,), name="ledweb-kernels", daemon=True)
+        _thread.start()
+    else:
+        _warmup(mode)
+
+
+def _deactivate() -> None:
+    global palette_sample, hue_sample, fractal_noise, tails_levels, tails_colors
+    palette_sample = hue_sample = fractal_noise = tails_levels = tails_colors = None
+    with _lock:
+        _info["active"] = "numpy"
+
+
+def _warmup(mode: str) -> None:
+    global palette_sample, hue_sample, fractal_noise, tails_levels, tails_colors
+    started = time.perf_counter()
+    try:
+        import numba
+    except Exception as exc:
+        if mode == "numba":
+            print(f"[ledweb] numba kernels requested but numba is unavailable ({exc}); using NumPy.")
+        with _lock:
+            _info["error"] = f"numba unavailable: {exc}"
+        return
+    try:
+        kernels = _build(numba)
+        _exercise(kernels)
+    except Exception as exc:  # pragma: no cover - depends on the numba/llvm install
+        print(f"[ledweb] numba kernels failed to compile ({exc}); using NumPy.")
+        with _lock:
+            _info["error"] = f"{type(exc).__name__}: {exc}"
+        return
+    if _info["requested"] == "numpy":
+        return
+    palette_sample, hue_sample, fractal_noise, tails_levels, tails_colors = kernels
+    elapsed = (time.perf_counter() - started) * 1000
+    with _lock:
+        _info.update(active="numba", version=numba.__version__, warmup_ms=round(elapsed, 1), error=None)
+    print(f"[ledweb] Effect kernels: numba {numba.__version__} (ready in {elapsed:.0f} ms)")
+
+
+def _exercise(kernels) -> None:
+    # Compile (or load from the cache) every signature the effects use, on tiny inputs.
+    pal, hue, noise, levels, colors = kernels
+    # LUTs and tail kernels are shared read-only arrays, which numba types separately.
+    lut = np.zeros((16, 3), dtype=np.float32)
+    lut.flags.writeable = False
+    out = np.zeros((4, 3), dtype=np.float32)
+    for dtype in (np.float32, np.float64):
+        positions = np.linspace(-1.0, 2.0, 4).astype(dtype)
+        pal(lut, positions, out)
+        hue(lut, positions, out)
+    noise(np.linspace(0.0, 3.0, 4), 2, 1, np.zeros(4, dtype=np.float32))
+    heads = np.arange(2, dtype=np.intp)
+    ones = np.ones(2, dtype=np.float32)
+    dirs = np.ones(2, dtype=np.intp)
+    kernel = np.ones(3, dtype=np.float32)
+    kernel.flags.writeable = False
+    for wrap in (False, True):
+        levels(np.zeros(4, dtype=np.float32), heads, kernel, ones, dirs, wrap)
+        colors(out, heads, kernel, ones, dirs, np.ones((2, 3), dtype=np.float32), wrap)
+
+
+def _build(numba):
+    """Define the jitted kernels; mirrors the NumPy code paths they replace."""
+    from .noise import _AXIS_PRIMES, _TO_UNIT
+
+    njit = numba.njit(cache=True, nogil=True)
+    mask = np.uint64(0xFFFFFFFF)
+    prime = np.uint64(_AXIS_PRIMES[0])
+    to_unit = np.float32(_TO_UNIT)
+
+    @njit
+    def _palette_sample(lut, positions, out):
+        top = lut.shape[0] - 1
+        for i in range(positions.shape[0]):
+            idx = int((positions[i] % 1.0) * top + 0.5)
+            idx = min(max(idx, 0), top)
+            for ch in range(3):
+                out[i, ch] = lut[idx, ch]
+
+    @njit
+    def _hue_sample(lut, hues, out):
+        size = lut.shape[0]
+        for i in range(hues.shape[0]):
+            idx = int(np.float32(hues[i]) * np.float32(size) + np.float32(0.5)) % size
+            for ch in range(3):
+                out[i, ch] = lut[idx, ch]
+
+    @njit
+    def _hash(cell, seed_base):
+        h = (seed_base ^ ((np.uint64(cell) & mask) * prime)) & mask
+        h ^= h >> np.uint64(16)
+        h = (h * np.uint64(0x7FEB352D)) & mask
+        h ^= h >> np.uint64(15)
+        h = (h * np.uint64(0x846CA68B)) & mask
+        h ^= h >> np.uint64(16)
+        return np.float32(h >> np.uint64(8)) * to_unit
+
+    @njit
+    def _fractal_noise(x, octaves, seed, out):
+        seed_base = np.uint64((seed * 0x9E3779B9 + 0x632BE5AB) & 0xFFFFFFFF)
+        max_amp = 0.0
+        amp = 1.0
+        for _ in range(octaves):
+            max_amp += amp
+            amp *= 0.5
+        for i in range(x.shape[0]):
+            total = np.float32(0.0)
+            freq = 1.0
+            amp = 1.0
+            for _ in range(octaves):
+                c = x[i] * freq
+                floor = np.floor(c)
+                cell = np.int64(floor)
+                frac = np.float32(c - floor)
+                v0 = _hash(cell - 1, seed_base)
+                v1 = _hash(cell, seed_base)
+                v2 = _hash(cell + 1, seed_base)
+                v3 = _hash(cell + 2, seed_base)
+                w = frac * frac * (np.float32(3.0) - np.float32(2.0) * frac)
+                value = ((v0 + v1 + v2) * (np.float32(1.0) - w) + (v1 + v2 + v3) * w) / np.float32(3.0)
+                total += value * np.float32(amp)
+                amp *= 0.5
+                freq *= 2.0
+            out[i] = total / np.float32(max_amp)
+
+    @njit
+    def _tails_levels(out, heads, kernel, strengths, directions, wrap):
+        length = out.shape[0]
+        for p in range(heads.shape[0]):
+            for k in range(kernel.shape[0]):
+                idx = heads[p] - directions[p] * k
+                if wrap:
+                    idx %= length
+                elif idx < 0 or idx >= length:
+                    continue
+                value = kernel[k] * strengths[p]
+                if value > out[idx]:
+                    out[idx] = value
+
+    @njit
+    def _tails_colors(out, heads, kernel, strengths, directions, colors, wrap):
+        length = out.shape[0]
+        for p in range(heads.shape[0]):
+            for k in range(kernel.shape[0]):
+                idx = heads[p] - directions[p] * k
+                if wrap:
+                    idx %= length
+                elif idx < 0 or idx >= length:
+                    continue
+                weight = kernel[k] * strengths[p]
+                for ch in range(3):
+                    value = weight * colors[p, ch]
+                    if value > out[idx, ch]:
+                        out[idx, ch] = value
+
+    return _palette_sample, _hue_sample, _fractal_noise, _tails_levels, _tails_colors
@@ -0,0 +1,149 @@
+"""Stateless, vectorized value and gradient noise.
+
+Lattice values come from an integer hash of the cell coordinates and the seed, so
+sampling never touches the global ``random`` state and a seed always yields the same
+field. Coordinates may be scalars or arrays (broadcast together) and are evaluated in
+float64, so large time offsets keep their precision; results are float32.
+"""
+
+from itertools import product
+from typing import Callable
+
+import numpy as np
+
+from . import kernels
+
+# Per-axis multipliers for the lattice hash (large odd constants, pairwise unrelated).
+_AXIS_PRIMES = (0x8DA6B343, 0xD8163841, 0xCB1AB31F)
+_TO_UNIT = np.float32(1.0 / (1 << 24))
+
+_GRAD2 = np.array(
+    [(1, 0), (-1, 0), (0, 1), (0, -1), (0.7071, 0.7071), (-0.7071, 0.7071), (0.7071, -0.7071), (-0.7071, -0.7071)],
+    dtype=np.float32,
+)
+# Perlin's 12 cube-edge directions, padded to 16 so a 4-bit mask picks one.
+_GRAD3 = np.array(
+    [
+        (1, 1, 0), (-1, 1, 0), (1, -1, 0), (-1, -1, 0),
+        (1, 0, 1), (-1, 0, 1), (1, 0, -1), (-1, 0, -1),
+        (0, 1, 1), (0, -1, 1), (0, 1, -1), (0, -1, -1),
+        (1, 1, 0), (-1, 1, 0), (0, -1, 1), (0, -1, -1),
+    ],
+    dtype=np.float32,
+)
+
+
+def _hash(cells, seed: int) -> np.ndarray:
+    """Avalanche-hash integer lattice coordinates (int64 arrays) with ``seed``."""
+    shape = np.broadcast(*cells).shape
+    h = np.full(shape, (int(seed) * 0x9E3779B9 + 0x632BE5AB) & 0xFFFFFFFF, dtype=np.uint32)
+    # Wrap-around is the point here; only 0-d (scalar) inputs would warn about it.
+    with np.errstate(over="ignore"):
+        for cell, prime in zip(cells, _AXIS_PRIMES):
+            h ^= cell.astype(np.uint32) * np.uint32(prime)
+        h ^= h >> np.uint32(16)
+        h *= np.uint32(0x7FEB352D)
+        h ^= h >> np.uint32(15)
+        h *= np.uint32(0x846CA68B)
+        h ^= h >> np.uint32(16)
+    return h
+
+
+def _unit(h: np.ndarray) -> np.ndarray:
+    return (h >> np.uint32(8)).astype(np.float32) * _TO_UNIT
+
+
+def _lattice(coords):
+    cells, fracs = [], []
+    for c in coords:
+        c = np.asarray(c, dtype=np.float64)
+        floor = np.floor(c)
+        cells.append(floor.astype(np.int64))
+        fracs.append((c - floor).astype(np.float32))
+    return cells, fracs
+
+
+def _smoothstep(t: np.ndarray) -> np.ndarray:
+    return t * t * (3.0 - 2.0 * t)
+
+
+def _quintic(t: np.ndarray) -> np.ndarray:
+    return t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+
+
+def value_noise(*coords, seed: int = 0) -> np.ndarray:
+    """1D/2D/3D value noise in 0..1 with smoothstep interpolation between lattice values."""
+    cells, fracs = _lattice(coords)
+    weights = [_smoothstep(f) for f in fracs]
+    total = None
+    for corner in product((0, 1), repeat=len(cells)):
+        value = _unit(_hash([c + o for c, o in zip(cells, corner)], seed))
+        for w, o in zip(weights, corner):
+            value = value * (w if o else 1.0 - w)
+        total = value if total is None else total + value
+    return total
+
+
+def gradient_noise(*coords, seed: int = 0) -> np.ndarray:
+    """1D/2D/3D gradient (Perlin) noise, roughly in -1..1 and 0 at every lattice point."""
+    dims = len(coords)
+    cells, fracs = _lattice(coords)
+    fades = [_quintic(f) for f in fracs]
+    total = None
+    for corner in product((0, 1), repeat=dims):
+        h = _hash([c + o for c, o in zip(cells, corner)], seed)
+        offsets = [f - o for f, o in zip(fracs, corner)]
+        if dims == 1:
+            value = (_unit(h) * 2.0 - 1.0) * offsets[0] * 2.0
+        else:
+            table = _GRAD2 if dims == 2 else _GRAD3
+            grads = table[h & np.uint32(len(table) - 1)]
+            value = sum(grads[..., k] * offsets[k] for k in range(dims))
+        for w, o in zip(fades, corner):
+            value = value * (w if o else 1.0 - w)
+        total = value if total is None else total + value
+    return total
+
+
+def smooth_noise(x, seed: int = 0) -> np.ndarray:
+    """1D value noise averaged over x-1, x and x+1, which keeps the soft, mid-heavy look.
+
+    The three taps share lattice cells, so this costs four hashes rather than six.
+    """
+    (cell,), (frac,) = _lattice((x,))
+    v = [_unit(_hash([cell + k], seed)) for k in (-1, 0, 1, 2)]
+    w = _smoothstep(frac)
+    return ((v[0] + v[1] + v[2]) * (1.0 - w) + (v[1] + v[2] + v[3]) * w) / 3.0
+
+
+def fbm(
+    noise: Callable[..., np.ndarray],
+    *coords,
+    octaves: int = 4,
+    seed: int = 0,
+    lacunarity: float = 2.0,
+    gain: float = 0.5,
+) -> np.ndarray:
+    """Fractal Brownian motion: normalized sum of ``octaves`` layers of ``noise``."""
+    coords = [np.asarray(c, dtype=np.float64) for c in coords]
+    total = None
+    freq = 1.0
+    amp = 1.0
+    max_amp = 0.0
+    for _ in range(max(1, int(octaves))):
+        layer = noise(*(c * freq for c in coords), seed=seed) * np.float32(amp)
+        total = layer if total is None else total + layer
+        max_amp += amp
+        amp *= gain
+        freq *= lacunarity
+    return total / np.float32(max_amp)
+
+
+def fractal_noise(x, octaves: int = 4, seed: int = 0) -> np.ndarray:
+    """1D fBm over ``smooth_noise``; the noise the built-in effects use, in 0..1."""
+    jit = kernels.fractal_noise
+    if jit is not None and kernels.plain(x) and x.dtype == np.float64:
+        out = np.empty(x.shape[0], dtype=np.float32)
+        jit(x, max(1, int(octaves)), int(seed), out)
+        return out
+    return fbm(smooth_noise, x, octaves=octaves, seed=seed)
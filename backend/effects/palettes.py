@@ -0,0 +1,136 @@
+"""Named colour palettes compiled into gradient lookup tables.
+
+Each palette is compiled once into a ``LUT_SIZE``-entry float32 table, so sampling a
+whole strip is one index gather instead of a Python lerp per pixel. Built-in palettes
+are always present; custom ones come from ``config/palettes.json`` and may shadow a
+built-in of the same name.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import kernels
+
+RGB = Tuple[int, int, int]
+
+LUT_SIZE = 1024
+
+BUILTIN_PALETTES: Dict[str, List[RGB]] = {
+    "sunset": [(255, 94, 19), (255, 149, 5), (252, 201, 64), (255, 235, 191)],
+    "ocean": [(0, 78, 146), (0, 155, 199), (0, 216, 199), (160, 255, 255)],
+    "fire": [(30, 6, 0), (180, 40, 0), (255, 120, 10), (255, 220, 70)],
+    "pastel": [(255, 183, 213), (202, 236, 255), (178, 255, 227), (255, 245, 196)],
+    "neon": [(41, 255, 229), (117, 101, 255), (255, 94, 247), (255, 255, 255)],
+}
+DEFAULT_PALETTE = "neon"
+
+
+class Palette:
+    """A colour gradient plus its precompiled lookup table (read-only)."""
+
+    __slots__ = ("name", "colors", "lut")
+
+    def __init__(self, name: str, colors: Sequence[RGB]) -> None:
+        self.name = name
+        self.colors: List[RGB] = [tuple(int(ch) for ch in c[:3]) for c in colors]  # type: ignore[misc]
+        self.lut = _compile(self.colors)
+
+    def sample(self, positions, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Colours at ``positions`` (wrapping at 1.0) as float32 (n, 3); one gather into ``out``."""
+        jit = kernels.palette_sample
+        if jit is not None and kernels.plain(positions) and (out is None or kernels.plain(out, 2)):
+            if out is None:
+                out = np.empty((positions.shape[0], 3), dtype=np.float32)
+            if out.dtype == np.float32:
+                jit(self.lut, positions, out)
+                return out
+        scaled = np.mod(positions, 1.0)
+        scaled *= LUT_SIZE - 1
+        scaled += 0.5
+        return np.take(self.lut, scaled.astype(np.intp), axis=0, out=out, mode="clip")
+
+
+def _compile(colors: Sequence[RGB]) -> np.ndarray:
+    # Same piecewise-linear gradient as palette_color, evaluated at LUT_SIZE evenly spaced points.
+    if not colors:
+        lut = np.zeros((LUT_SIZE, 3), dtype=np.float32)
+    else:
+        stops = np.asarray(colors, dtype=np.float32)
+        x = np.linspace(0.0, 1.0, LUT_SIZE) * (len(stops) - 1)
+        xp = np.arange(len(stops))
+        lut = np.stack([np.interp(x, xp, stops[:, ch]) for ch in range(3)], axis=1).astype(np.float32)
+    lut.flags.writeable = False
+    return lut
+
+
+@lru_cache(maxsize=32)
+def compile_palette(colors: Tuple[RGB, ...]) -> Palette:
+    """Compile an ad-hoc colour list (e.g. a ``colors`` effect param); cached per colour tuple."""
+    return Palette("custom", colors)
+
+
+def _parse_color(value) -> RGB:
+    if isinstance(value, str):
+        text = value.strip().lstrip("#")
+        if len(text) != 6:
+            raise ValueError(f"invalid hex colour {value!r}")
+        return int(text[0:2], 16), int(text[2:4], 16), int(text[4:6], 16)
+    r, g, b = (max(0, min(255, int(float(ch)))) for ch in list(value)[:3])
+    return r, g, b
+
+
+_BUILTIN = {name: Palette(name, colors) for name, colors in BUILTIN_PALETTES.items()}
+_custom: Dict[str, List[RGB]] = {}
+# Swapped wholesale on reload so the render thread never sees a half-built registry.
+_registry: Dict[str, Palette] = dict(_BUILTIN)
+# Bumped on every reload; caches of rendered frames use it to notice redefined palettes.
+_generation = 0
+
+
+def get_palette(name: Optional[str], default: str = DEFAULT_PALETTE) -> Palette:
+    palette = _registry.get(name) if name else None
+    return palette or _registry.get(default) or _BUILTIN[DEFAULT_PALETTE]
+
+
+def palette_names() -> List[str]:
+    return sorted(_registry)
+
+
+def palette_table() -> Dict[str, List[RGB]]:
+    return {name: list(p.colors) for name, p in sorted(_registry.items())}
+
+
+def palette_generation() -> int:
+    return _generation
+
+
+def custom_palettes() -> Dict[str, List[RGB]]:
+    return dict(_custom)
+
+
+def load_palettes(defs: Optional[Mapping[str, Iterable]]) -> Dict[str, List[RGB]]:
+    """Replace the custom palettes with ``defs`` ({name: [colour, ...]}) and compile them.
+
+    Colours may be ``[r, g, b]`` lists or ``"#rrggbb"`` strings. Invalid palettes are
+    skipped with a log line; returns the custom palettes that were accepted.
+    """
+    global _registry, _custom, _generation
+    accepted: Dict[str, List[RGB]] = {}
+    for name, colors in (defs or {}).items():
+        try:
+            parsed = [_parse_color(c) for c in colors]
+        except (TypeError, ValueError) as exc:
+            print(f"[ledweb] Skipping palette {name!r}: {exc}")
+            continue
+        if not parsed:
+            print(f"[ledweb] Skipping palette {name!r}: no colours")
+            continue
+        accepted[str(name)] = parsed
+    registry = dict(_BUILTIN)
+    registry.update({name: Palette(name, colors) for name, colors in accepted.items()})
+    _custom = accepted
+    _registry = registry
+    _generation += 1
+    return dict(accepted)
@@ -0,0 +1,173 @@
+"""Typed effect parameters, parsed once per parameter change instead of every frame.
+
+An effect's ``default_params`` defines its parameters; the kind of each one is inferred
+from the default value and can be refined with ``param_specs`` (integers, bounds,
+choices). ``parse_params`` validates and coerces a raw params dict into a compact
+``__slots__`` object, and ``param_schema`` describes the same definitions for the UI.
+"""
+
+import math
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .palettes import palette_names
+
+KINDS = ("number", "int", "boolean", "string", "choice", "palette", "color", "colors", "list")
+_FALSE_STRINGS = {"", "0", "false", "no", "off"}
+
+
+class Param:
+    """Definition of one parameter; unset fields are filled in from the default value."""
+
+    __slots__ = ("name", "kind", "default", "min", "max", "options")
+
+    def __init__(
+        self,
+        kind: Optional[str] = None,
+        min: Optional[float] = None,
+        max: Optional[float] = None,
+        options: Optional[Sequence[str]] = None,
+        default: Any = None,
+    ) -> None:
+        if kind is not None and kind not in KINDS:
+            raise ValueError(f"unknown param kind {kind!r}")
+        self.name = ""
+        self.kind = kind
+        self.default = default
+        self.min = min
+        self.max = max
+        self.options = tuple(options) if options else None
+
+    def coerce(self, value: Any) -> Any:
+        """Convert a raw (JSON) value to this parameter's type; invalid values fall back to the default."""
+        try:
+            return self._coerce(value)
+        except (TypeError, ValueError, OverflowError):
+            return self._coerce(self.default)
+
+    def _coerce(self, value: Any) -> Any:
+        kind = self.kind
+        if kind == "number" or kind == "int":
+            number = float(value)
+            if not math.isfinite(number):
+                raise ValueError(value)
+            if self.min is not None and number < self.min:
+                number = self.min
+            if self.max is not None and number > self.max:
+                number = self.max
+            return int(number) if kind == "int" else number
+        if kind == "boolean":
+            if isinstance(value, str):
+                return value.strip().lower() not in _FALSE_STRINGS
+            return bool(value)
+        if kind == "color":
+            return _color_array(value)
+        if kind == "colors":
+            colors = tuple(tuple(int(ch) for ch in _color_array(c)) for c in value)
+            if not colors:
+                raise ValueError("no colours")
+            return colors
+        if kind == "list":
+            return tuple(value)
+        text = str(value)
+        if kind == "choice" and text not in self.options:
+            raise ValueError(text)
+        return text
+
+    def schema(self) -> Dict:
+        entry: Dict[str, Any] = {"name": self.name, "type": _SCHEMA_TYPES[self.kind], "default": self.default}
+        if self.kind == "int":
+            entry["step"] = 1
+        if self.min is not None:
+            entry["min"] = self.min
+        if self.max is not None:
+            entry["max"] = self.max
+        if self.kind == "choice":
+            entry["options"] = list(self.options)
+        elif self.kind == "palette":
+            entry["options"] = palette_names()
+        return entry
+
+
+# "int" stays a number for the UI; "colors" is the old generic list type.
+_SCHEMA_TYPES = {
+    "number": "number",
+    "int": "number",
+    "boolean": "boolean",
+    "string": "string",
+    "choice": "string",
+    "palette": "palette",
+    "color": "color",
+    "colors": "list",
+    "list": "list",
+}
+
+
+def _color_array(value: Any) -> np.ndarray:
+    channels = [float(ch) for ch in list(value)[:3]]
+    if len(channels) != 3 or not all(math.isfinite(ch) for ch in channels):
+        raise ValueError(f"invalid colour {value!r}")
+    color = np.clip(np.asarray(channels, dtype=np.float32), 0.0, 255.0)
+    color.flags.writeable = False
+    return color
+
+
+def _infer_kind(name: str, default: Any) -> str:
+    if isinstance(default, bool):
+        return "boolean"
+    if isinstance(default, (int, float)):
+        return "number"
+    if isinstance(default, str):
+        return "palette" if name == "palette" else "string"
+    if isinstance(default, (list, tuple)):
+        if len(default) == 3 and all(isinstance(c, (int, float)) for c in default):
+            return "color"
+        if default and all(isinstance(c, (list, tuple)) and len(c) == 3 for c in default):
+            return "colors"
+        return "list"
+    return "string"
+
+
+@lru_cache(maxsize=None)
+def param_specs(effect_cls: type) -> Tuple[Param, ...]:
+    """The effect's parameter definitions: ``default_params`` refined by ``param_specs``."""
+    overrides: Mapping[str, Param] = getattr(effect_cls, "param_specs", None) or {}
+    specs: List[Param] = []
+    for name, default in (getattr(effect_cls, "default_params", None) or {}).items():
+        declared = overrides.get(name)
+        spec = Param(
+            kind=declared.kind if declared and declared.kind else _infer_kind(name, default),
+            min=declared.min if declared else None,
+            max=declared.max if declared else None,
+            options=declared.options if declared else None,
+            default=default,
+        )
+        spec.name = name
+        specs.append(spec)
+    return tuple(specs)
+
+
+@lru_cache(maxsize=None)
+def _params_type(effect_cls: type) -> type:
+    names = tuple(spec.name for spec in param_specs(effect_cls))
+    return type(f"{effect_cls.__name__}Params", (), {"__slots__": names, "__repr__": _repr})
+
+
+def _repr(self) -> str:
+    fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+    return f"{type(self).__name__}({fields})"
+
+
+def parse_params(effect_cls: type, raw: Optional[Mapping]) -> Any:
+    """Validate ``raw`` against the effect's definitions; unknown keys are ignored."""
+    raw = raw or {}
+    params = _params_type(effect_cls)()
+    for spec in param_specs(effect_cls):
+        setattr(params, spec.name, spec.coerce(raw.get(spec.name, spec.default)))
+    return params
+
+
+def param_schema(effect_cls: type) -> List[Dict]:
+    return [spec.schema() for spec in param_specs(effect_cls)]
@@ -0,0 +1,213 @@
+"""Struct-of-arrays particle system shared by the streak, drop and comet effects.
+
+Particles live in parallel NumPy arrays (position, velocity, life, tone, direction), so
+spawning, moving and culling a whole population is a handful of array operations.
+``draw_tails`` renders every particle's tail at once from a precomputed falloff kernel
+and max-blends the result, which is what overlapping light streaks look like anyway.
+``DecayField`` is the per-pixel counterpart for sparkles that light up and fade in place.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from . import kernels
+from .rng import make_rng
+
+
+class Particles:
+    """A bounded particle population; only the first ``count`` slots of each array are live."""
+
+    __slots__ = ("capacity", "count", "pos", "vel", "life", "tone", "dir", "rng")
+    FIELDS = ("pos", "vel", "life", "tone", "dir")
+
+    def __init__(self, capacity: int = 64, rng: Optional[np.random.Generator] = None) -> None:
+        self.capacity = 0
+        self.count = 0
+        self.rng = rng or make_rng()
+        for field in self.FIELDS:
+            setattr(self, field, np.zeros(0, dtype=np.float32))
+        self.reserve(capacity)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def reserve(self, capacity: int) -> None:
+        """Grow the arrays to hold at least ``capacity`` particles, keeping the live ones."""
+        if capacity <= self.capacity:
+            return
+        for field in self.FIELDS:
+            grown = np.zeros(capacity, dtype=np.float32)
+            grown[: self.count] = getattr(self, field)[: self.count]
+            setattr(self, field, grown)
+        self.capacity = capacity
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def spawn(self, n: int, pos=0.0, vel=0.0, life=1.0, tone=0.0, direction=1.0) -> None:
+        """Append ``n`` particles; values are scalars or length-``n`` arrays.
+
+        When the population is full the oldest particles make room for the new ones.
+        """
+        n = min(int(n), self.capacity)
+        if n <= 0:
+            return
+        overflow = self.count + n - self.capacity
+        if overflow > 0:
+            self._drop_oldest(overflow)
+        new = slice(self.count, self.count + n)
+        for field, value in zip(self.FIELDS, (pos, vel, life, tone, direction)):
+            values = np.asarray(value, dtype=np.float32)
+            getattr(self, field)[new] = values[-n:] if values.ndim else values
+        self.count += n
+
+    def step(self, dt: float, life_decay: float = 1.0) -> None:
+        """Advance positions by ``vel * dt`` and scale life by ``life_decay``."""
+        n = self.count
+        self.pos[:n] += self.vel[:n] * dt
+        if life_decay != 1.0:
+            self.life[:n] *= life_decay
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Compact the population down to the particles where ``mask`` is true."""
+        n = self.count
+        kept = int(np.count_nonzero(mask))
+        if kept == n:
+            return
+        for field in self.FIELDS:
+            arr = getattr(self, field)
+            arr[:kept] = arr[:n][mask]
+        self.count = kept
+
+    def _drop_oldest(self, k: int) -> None:
+        n = self.count
+        for field in self.FIELDS:
+            arr = getattr(self, field)
+            arr[: n - k] = arr[k:n]
+        self.count = n - k
+
+
+@lru_cache(maxsize=64)
+def decay_kernel(length: int, fade: float, gain: float = 1.0) -> np.ndarray:
+    """Tail weights ``gain * fade ** k`` for k in 0..length-1, clipped to 0..1."""
+    kernel = np.clip(gain * np.power(float(fade), np.arange(max(1, length))), 0.0, 1.0).astype(np.float32)
+    kernel.flags.writeable = False
+    return kernel
+
+
+@lru_cache(maxsize=64)
+def linear_kernel(length: int) -> np.ndarray:
+    """Tail weights falling linearly from 1 at the head: ``1 - k / length``."""
+    length = max(1, length)
+    kernel = (1.0 - np.arange(length, dtype=np.float32) / length).astype(np.float32)
+    kernel.flags.writeable = False
+    return kernel
+
+
+def _filled(values, shape, dtype) -> np.ndarray:
+    # Fresh writable, contiguous argument for the jitted kernels (None means all ones).
+    array = np.ones(shape, dtype=dtype)
+    if values is not None:
+        array[...] = values
+    return array
+
+
+def draw_tails(
+    out: np.ndarray,
+    heads: np.ndarray,
+    kernel: np.ndarray,
+    strengths: Optional[np.ndarray] = None,
+    directions: Optional[np.ndarray] = None,
+    colors: Optional[np.ndarray] = None,
+    wrap: bool = False,
+) -> None:
+    """Max-blend a tail behind every head into ``out``.
+
+    Pixel ``heads[p] - directions[p] * k`` receives ``kernel[k] * strengths[p]``. ``out``
+    is a (length,) level array, or (length, 3) when per-particle ``colors`` (P, 3) are
+    given. Tails wrap around the strip when ``wrap`` is set and are clipped otherwise.
+    """
+    heads = np.asarray(heads, dtype=np.intp)
+    if heads.shape[0] == 0:
+        return
+    jit = kernels.tails_colors if colors is not None else kernels.tails_levels
+    if jit is not None and kernels.plain(out, 2 if colors is not None else 1) and out.dtype == np.float32:
+        count = heads.shape[0]
+        args = [
+            out,
+            np.ascontiguousarray(heads),
+            kernel,
+            _filled(strengths, count, np.float32),
+            _filled(directions, count, np.intp),
+        ]
+        if colors is not None:
+            args.append(_filled(colors, (count, 3), np.float32))
+        jit(*args, bool(wrap))
+        return
+    length = out.shape[0]
+    steps = np.arange(kernel.shape[0], dtype=np.intp)
+    if directions is None:
+        idx = heads[:, None] - steps
+    else:
+        idx = heads[:, None] - np.asarray(directions, dtype=np.intp)[:, None] * steps
+    weights = np.broadcast_to(kernel, idx.shape)
+    if strengths is not None:
+        weights = weights * np.asarray(strengths, dtype=np.float32)[:, None]
+    if colors is not None:
+        weights = weights[..., None] * np.asarray(colors, dtype=np.float32)[:, None, :]
+    if wrap:
+        np.mod(idx, length, out=idx)
+    else:
+        valid = (idx >= 0) & (idx < length)
+        idx = idx[valid]
+        weights = weights[valid]
+    np.maximum.at(out, idx.ravel(), weights.reshape(-1, 3) if colors is not None else weights.ravel())
+
+
+class DecayField:
+    """Per-pixel levels (plus optional colours) that are lit at random and fade in place."""
+
+    __slots__ = ("levels", "colors", "carry", "rng")
+
+    def __init__(self, rng: Optional[np.random.Generator] = None) -> None:
+        self.levels = np.zeros(0, dtype=np.float32)
+        self.colors: Optional[np.ndarray] = None
+        self.carry = 0.0
+        self.rng = rng or make_rng()
+
+    def resize(self, length: int, colors: bool = False) -> None:
+        """Reset the field when the strip length changes; ``colors`` adds an (n, 3) colour buffer."""
+        if self.levels.shape[0] != length:
+            self.levels = np.zeros(length, dtype=np.float32)
+            self.colors = None
+        if colors and self.colors is None:
+            self.colors = np.full((length, 3), 255.0, dtype=np.float32)
+
+    def decay(self, factor: float) -> None:
+        self.levels *= np.float32(factor)
+
+    def spawn(self, expected: float, minimum: int = 0) -> np.ndarray:
+        """Light ``expected`` random pixels (fractions carry over to later frames).
+
+        Returns the chosen indices so callers can colour them; duplicates are harmless.
+        """
+        self.carry += max(0.0, expected)
+        count = int(self.carry)
+        self.carry -= count
+        count = max(minimum, count)
+        length = self.levels.shape[0]
+        if count <= 0 or length == 0:
+            return np.zeros(0, dtype=np.intp)
+        idx = self.rng.integers(0, length, count)
+        self.levels[idx] = 1.0
+        return idx
+
+    def blend(self, out: np.ndarray, base, color) -> None:
+        """``out = base + (color - base) * level``; ``color`` may be one RGB or per-pixel."""
+        base = np.asarray(base, dtype=np.float32)
+        level = np.clip(self.levels, 0.0, 1.0)[:, None]
+        np.subtract(color, base, out=out)
+        out *= level
+        out += base
@@ -0,0 +1,25 @@
+"""Random generators for effects.
+
+Every effect instance owns its own ``numpy.random.Generator`` instead of sharing the
+global ``random`` state. ``seed_rngs`` makes the generators created afterwards
+reproducible, which the golden-frame harness relies on; by default they are seeded
+from OS entropy.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+_seeds: Optional[np.random.SeedSequence] = None
+
+
+def make_rng() -> np.random.Generator:
+    if _seeds is None:
+        return np.random.default_rng()
+    return np.random.default_rng(_seeds.spawn(1)[0])
+
+
+def seed_rngs(seed: Optional[int]) -> None:
+    """Derive every following ``make_rng()`` from ``seed``; ``None`` goes back to OS entropy."""
+    global _seeds
+    _seeds = None if seed is None else np.random.SeedSequence(seed)
@@ -0,0 +1,139 @@
+"""Spatial helpers for effects on installations with real LED coordinates.
+
+Coordinates are normalized float32 (n, 3) arrays (see ``backend/geometry.py``); the
+field helpers evaluate a whole segment at once. ``SpatialIndex`` buckets the points
+into a uniform grid so neighbour lists are built once per radius with array
+operations, instead of an O(n^2) distance matrix or per-LED Python loops.
+"""
+
+from functools import lru_cache
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from .noise import fbm, value_noise
+
+
+class SpatialIndex:
+    """Uniform-grid index over fixed points; neighbour lists are cached per radius."""
+
+    def __init__(self, points: np.ndarray) -> None:
+        self.points = np.asarray(points, dtype=np.float32)
+        self._neighbors: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return self.points.shape[0]
+
+    def within(self, center: Sequence[float], radius: float) -> np.ndarray:
+        """Indices of the points within ``radius`` of ``center``."""
+        dist = np.linalg.norm(self.points - np.asarray(center, dtype=np.float32), axis=1)
+        return np.flatnonzero(dist <= radius)
+
+    def neighbors(self, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR neighbour lists: point ``i``'s neighbours are ``indices[offsets[i]:offsets[i + 1]]``.
+
+        Points never list themselves. Built once per radius via a grid with ``radius`` cells,
+        so only the 27 surrounding cells are candidates.
+        """
+        radius = float(radius)
+        cached = self._neighbors.get(radius)
+        if cached is None:
+            cached = self._neighbors[radius] = self._build(radius)
+        return cached
+
+    def _build(self, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        n = self.points.shape[0]
+        if n == 0 or radius <= 0:
+            return np.zeros(n + 1, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        cells = np.floor(self.points / radius).astype(np.int64)
+        cells -= cells.min(axis=0) - 1  # keep a one-cell margin so neighbour keys stay >= 0
+        dims = cells.max(axis=0) + 2
+        keys = np.ravel_multi_index(cells.T, dims)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+
+        sources, targets = [], []
+        for offset in np.ndindex(3, 3, 3):
+            probe = np.ravel_multi_index((cells + np.asarray(offset) - 1).T, dims)
+            lo = np.searchsorted(sorted_keys, probe, side="left")
+            counts = np.searchsorted(sorted_keys, probe, side="right") - lo
+            if not counts.any():
+                continue
+            # Expand every point's [lo, lo + count) candidate range without a Python loop.
+            src = np.repeat(np.arange(n), counts)
+            starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+            sources.append(src)
+            targets.append(order[starts + np.arange(src.shape[0])])
+        src = np.concatenate(sources)
+        dst = np.concatenate(targets)
+        dist = np.linalg.norm(self.points[src] - self.points[dst], axis=1)
+        keep = (dist <= radius) & (src != dst)
+        src, dst = src[keep], dst[keep]
+        order = np.lexsort((dst, src))
+        offsets = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        indices = dst[order].astype(np.intp)
+        offsets.flags.writeable = False
+        indices.flags.writeable = False
+        return offsets, indices
+
+
+@lru_cache(maxsize=16)
+def line_coords(length: int) -> np.ndarray:
+    """Stand-in coordinates for a plain strip: a straight line along x from -1 to 1."""
+    coords = np.zeros((length, 3), dtype=np.float32)
+    if length > 1:
+        coords[:, 0] = np.linspace(-1.0, 1.0, length, dtype=np.float32)
+    coords.flags.writeable = False
+    return coords
+
+
+@lru_cache(maxsize=16)
+def grid_coords(width: int, height: int) -> np.ndarray:
+    """Stand-in coordinates for a matrix canvas in row-major order, scaled like a coordinate file."""
+    ys, xs = np.mgrid[0:height, 0:width].astype(np.float32)
+    coords = np.zeros((width * height, 3), dtype=np.float32)
+    coords[:, 0] = xs.ravel() - (width - 1) / 2.0
+    coords[:, 1] = (height - 1) / 2.0 - ys.ravel()
+    coords[:, :2] /= max(1.0, (max(width, height) - 1) / 2.0)
+    coords.flags.writeable = False
+    return coords
+
+
+@lru_cache(maxsize=16)
+def fallback_index(length: int, width: int = 0, height: int = 0) -> SpatialIndex:
+    """Shared index for segments without a coordinate file: the matrix grid or a line."""
+    if width and height and width * height == length:
+        return SpatialIndex(grid_coords(width, height))
+    return SpatialIndex(line_coords(length))
+
+
+def plane_field(coords: np.ndarray, direction: Sequence[float]) -> np.ndarray:
+    """Signed distance of every point along ``direction`` (normalized), i.e. a plane sweep coordinate."""
+    normal = np.asarray(direction, dtype=np.float32)
+    norm = float(np.linalg.norm(normal))
+    if norm == 0.0:
+        normal, norm = np.array([1.0, 0.0, 0.0], dtype=np.float32), 1.0
+    return coords @ (normal / norm)
+
+
+def radial_field(coords: np.ndarray, center: Sequence[float]) -> np.ndarray:
+    """Distance of every point from ``center``."""
+    return np.linalg.norm(coords - np.asarray(center, dtype=np.float32), axis=1)
+
+
+def noise_field(coords: np.ndarray, scale: float, time_offset: float, octaves: int = 3, seed: int = 0) -> np.ndarray:
+    """3D fractal value noise in 0..1 over the points; time drifts the field along z."""
+    scaled = coords.astype(np.float64) * scale
+    return fbm(value_noise, scaled[:, 0], scaled[:, 1], scaled[:, 2] + time_offset, octaves=octaves, seed=seed)
+
+
+def spread(levels: np.ndarray, offsets: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Per point, the highest level among its neighbours (0 for points without any)."""
+    out = np.zeros_like(levels)
+    if indices.shape[0] == 0:
+        return out
+    counts = np.diff(offsets)
+    has = counts > 0
+    out[has] = np.maximum.reduceat(levels[indices], offsets[:-1][has])
+    return out
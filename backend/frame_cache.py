@@ -0,0 +1,135 @@
+"""Phase-quantized frame cache for periodic effects.
+
+An effect whose ``period()`` is known is a pure function of time, so it shows the same
+frames over and over. The cache keeps one period per (effect, params, size, matrix
+wiring) at ``steps`` phases (one per frame at the plan's fps, at most ``MAX_STEPS``),
+which turns playback into a row copy. Rows are rendered the first time their phase comes up, so a new entry
+never costs more than live rendering and never stalls a frame. Entries are evicted
+least-recently-used under a byte budget, but never for another segment of the same plan:
+when the current plan's periods do not fit together, the segments that miss out render
+live instead of evicting each other every frame. Params, size, fps and the palette
+generation are part of the key, so any change simply lands on a new entry.
+"""
+
+import json
+import math
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .effects.palettes import palette_generation
+from .render_plan import SegmentPlan
+
+# Same resolution as the hue and palette LUTs; finer phases would not change the colours.
+MAX_STEPS = 1024
+
+_UNSET = object()
+
+
+class _Entry:
+    __slots__ = ("frames", "filled", "period", "rev")
+
+    def __init__(self, steps: int, length: int, period: float, rev: int) -> None:
+        self.frames = np.zeros((steps, length, 3), dtype=np.float32)
+        self.filled = np.zeros(steps, dtype=bool)
+        self.period = period
+        # Plan revision that last used the entry; entries of the running plan are pinned.
+        self.rev = rev
+
+
+class FrameCache:
+    def __init__(self, max_bytes: float) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._bytes = 0
+        # Keys of the current plan's segments, by index; recomputed when the plan or palettes change.
+        self._keys: Dict[int, Optional[Tuple]] = {}
+        self._keys_for = (-1, -1)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def frame(
+        self, rev: int, index: int, seg: SegmentPlan, t: float, fps: float, draw: Callable[[SegmentPlan, np.ndarray], None]
+    ) -> Optional[np.ndarray]:
+        """Segment ``index``'s raw frame at time ``t``, or None when it has to render live.
+
+        A phase that is not cached yet is drawn into the cache with ``draw(seg, row)``.
+        """
+        if not self.max_bytes:
+            return None
+        generation = palette_generation()
+        if self._keys_for != (rev, generation):
+            self._keys = {}
+            self._keys_for = (rev, generation)
+        key = self._keys.get(index, _UNSET)
+        if key is _UNSET:
+            key = self._keys[index] = self._key(seg, fps, generation)
+        if key is None:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._admit(key, seg.length, rev)
+            if entry is None:
+                self._keys[index] = None
+                return None
+        else:
+            self._entries.move_to_end(key)
+            entry.rev = rev
+
+        steps = entry.frames.shape[0]
+        # Nearest phase, so frames that land exactly on a step (fps-aligned periods) match live rendering.
+        step = int(round((t % entry.period) / entry.period * steps)) % steps
+        row = entry.frames[step]
+        if entry.filled[step]:
+            self.hits += 1
+            return row
+        context = seg.context
+        context.time = context.timeline = step * entry.period / steps
+        draw(seg, row)
+        entry.filled[step] = True
+        self.misses += 1
+        return row
+
+    def _key(self, seg: SegmentPlan, fps: float, generation: int) -> Optional[Tuple]:
+        try:
+            period = seg.effect.period(seg.context)
+        except Exception:
+            return None
+        if not period or not math.isfinite(period) or period <= 0:
+            return None
+        # Rounded first so a period of exactly n frames does not become n + 1 steps through float error.
+        steps = max(1, min(MAX_STEPS, math.ceil(round(period * max(1.0, fps), 6))))
+        params = json.dumps(seg.params, sort_keys=True, default=str)
+        ctx = seg.context
+        # Rows are stored after ``layout.place``, so differently wired matrices must not share them.
+        wiring = seg.layout.wiring() if seg.layout is not None else None
+        return (type(seg.effect).__name__, seg.length, ctx.width, ctx.height, wiring, params, generation, steps, period)
+
+    def _admit(self, key: Tuple, length: int, rev: int) -> Optional[_Entry]:
+        steps, period = key[-2], key[-1]
+        size = steps * length * 3 * 4
+        # Only entries of earlier plans may make room; refuse rather than evict a live one.
+        stale = [k for k, old in self._entries.items() if old.rev != rev]
+        if self._bytes - sum(self._entries[k].frames.nbytes for k in stale) + size > self.max_bytes:
+            return None
+        for k in stale:
+            if self._bytes + size <= self.max_bytes:
+                break
+            self._bytes -= self._entries.pop(k).frames.nbytes
+            self.evictions += 1
+        entry = self._entries[key] = _Entry(steps, length, period, rev)
+        self._bytes += size
+        return entry
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,145 @@
+import time
+from typing import Callable, Dict
+
+OVERRUN_POLICIES = ("skip", "catch_up", "degrade")
+
+MIN_FPS = 10.0
+MAX_FPS = 240.0
+
+
+class FrameClock:
+    """Monotonic, deadline-based frame pacing for the render loop.
+
+    Frames are scheduled on absolute deadlines (``start + n * period``), so sleep
+    inaccuracies do not accumulate and wall-clock jumps (NTP on a Pi without RTC) are
+    ignored. The ``dt`` handed to effects is the distance between scheduled deadlines,
+    not the measured wake-up time, which keeps the timeline smooth under jitter.
+
+    When a frame overruns its deadline the policy decides what happens next:
+
+    - ``skip``: drop the missed slots and realign to the next deadline in the future;
+      the timeline advances by whole periods so it stays in sync with real time.
+    - ``catch_up``: render the missed slots back to back (bounded by ``max_backlog``).
+    - ``degrade``: stretch the period while frames keep overrunning and recover
+      towards the target rate once there is headroom again.
+    """
+
+    max_backlog = 4
+    max_dt = 0.25
+
+    def __init__(
+        self,
+        fps: float = 60.0,
+        policy: str = "skip",
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._clock = clock
+        self._sleep = sleep
+        self.target_fps = 60.0
+        self.policy = "skip"
+        self._period = 1.0 / self.target_fps
+        self.configure(fps, policy)
+        self.reset()
+
+    def configure(self, fps: float, policy: str = "skip") -> None:
+        try:
+            fps = float(fps)
+        except (TypeError, ValueError):
+            fps = 60.0
+        fps = max(MIN_FPS, min(MAX_FPS, fps))
+        if fps != self.target_fps:
+            self.target_fps = fps
+            self._period = 1.0 / fps
+        self.policy = policy if policy in OVERRUN_POLICIES else "skip"
+        if self.policy != "degrade":
+            self._period = 1.0 / self.target_fps
+
+    def resync(self) -> None:
+        """Restart the deadline sequence from now (e.g. after idling) without touching the counters."""
+        now = self._clock()
+        self._deadline = now
+        self._prev_deadline = now - self._period
+        self._frame_start = now
+        self._backlog = 0
+        self._headroom_frames = 0
+
+    def reset(self) -> None:
+        self.resync()
+        self.frames = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.jitter_last = 0.0
+        self.jitter_avg = 0.0
+        self.jitter_max = 0.0
+        self.frame_time_avg = 0.0
+
+    @property
+    def period(self) -> float:
+        return self._period
+
+    def begin_frame(self) -> float:
+        """Mark the start of a frame and return the (smoothed) ``dt`` for this frame."""
+        now = self._clock()
+        self._frame_start = now
+        jitter = max(0.0, now - self._deadline)
+        self.jitter_last = jitter
+        self.jitter_max = max(self.jitter_max, jitter)
+        self.jitter_avg += (jitter - self.jitter_avg) * 0.05
+        dt = self._deadline - self._prev_deadline
+        return max(0.0, min(self.max_dt, dt))
+
+    def end_frame(self) -> None:
+        """Schedule the next deadline according to the overrun policy and sleep until it."""
+        now = self._clock()
+        self.frames += 1
+        work = now - self._frame_start
+        self.frame_time_avg += (work - self.frame_time_avg) * 0.05
+        self._prev_deadline = self._deadline
+        next_deadline = self._deadline + self._period
+
+        if now > next_deadline:
+            self.overruns += 1
+            self._headroom_frames = 0
+            missed = int((now - next_deadline) / self._period) + 1
+            if self.policy == "catch_up" and self._backlog + missed <= self.max_backlog:
+                # Leave the deadline in the past: the next frames render without sleeping.
+                self._backlog += 1
+            elif self.policy == "degrade":
+                self._period = min(1.0 / MIN_FPS, self._period * 1.25)
+                next_deadline = now + self._period
+                self._backlog = 0
+            else:
+                self.skipped += missed
+                next_deadline += missed * self._period
+                self._backlog = 0
+        else:
+            self._backlog = max(0, self._backlog - 1)
+            if self.policy == "degrade" and self._period > 1.0 / self.target_fps:
+                # Recover gradually once frames fit comfortably in the target budget.
+                if work < 0.5 / self.target_fps:
+                    self._headroom_frames += 1
+                    if self._headroom_frames >= 30:
+                        self._period = max(1.0 / self.target_fps, self._period * 0.9)
+                        self._headroom_frames = 0
+                else:
+                    self._headroom_frames = 0
+
+        self._deadline = next_deadline
+        sleep_for = next_deadline - self._clock()
+        if sleep_for > 0:
+            self._sleep(sleep_for)
+
+    def stats(self) -> Dict:
+        return {
+            "policy": self.policy,
+            "target_fps": self.target_fps,
+            "effective_fps": round(1.0 / self._period, 2),
+            "frames": self.frames,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "jitter_ms": round(self.jitter_last * 1000, 3),
+            "jitter_avg_ms": round(self.jitter_avg * 1000, 3),
+            "jitter_max_ms": round(self.jitter_max * 1000, 3),
+            "frame_time_avg_ms": round(self.frame_time_avg * 1000, 3),
+        }
@@ -0,0 +1,297 @@
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Per-channel offsets into a flattened (3, 256) lookup table so one gather maps all channels.
+_CHANNEL_OFFSETS = np.array([0, 256, 512], dtype=np.intp)
+
+
+def _number(value) -> Optional[float]:
+    """``value`` as a finite float, or None when it cannot be parsed."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _clamped(live: Dict, key: str, default: float, lo: float, hi: float) -> float:
+    number = _number(live.get(key, default))
+    return default if number is None else max(lo, min(hi, number))
+
+
+class ColorCorrection:
+    """A per-channel tone curve that is folded into the output LUT.
+
+    Corrections receive the current curves as a float (3, 256) array in the 0..1 range and
+    return the adjusted curves. They run only when the chain is recompiled, never per pixel.
+    """
+
+    def key(self) -> Tuple:
+        return ()
+
+    def apply(self, curves: np.ndarray) -> np.ndarray:  # pragma: no cover - override
+        raise NotImplementedError
+
+
+class Brightness(ColorCorrection):
+    def __init__(self, level: float) -> None:
+        self.level = max(0.0, min(1.0, level))
+
+    def key(self) -> Tuple:
+        return ("brightness", round(self.level, 4))
+
+    def apply(self, curves: np.ndarray) -> np.ndarray:
+        return curves * self.level
+
+
+class WhiteBalance(ColorCorrection):
+    def __init__(self, gains: Sequence[float]) -> None:
+        self.gains = tuple(max(0.0, min(1.0, float(g))) for g in gains)
+
+    def key(self) -> Tuple:
+        return ("white_balance",) + tuple(round(g, 4) for g in self.gains)
+
+    def apply(self, curves: np.ndarray) -> np.ndarray:
+        return curves * np.asarray(self.gains, dtype=np.float64)[:, None]
+
+
+class Gamma(ColorCorrection):
+    def __init__(self, gamma: float) -> None:
+        self.gamma = max(0.2, min(4.0, gamma))
+
+    def key(self) -> Tuple:
+        return ("gamma", round(self.gamma, 4))
+
+    def apply(self, curves: np.ndarray) -> np.ndarray:
+        if abs(self.gamma - 1.0) <= 1e-3:
+            return curves
+        return np.power(np.clip(curves, 0.0, 1.0), 1.0 / self.gamma)
+
+
+def _brightness(live: Dict, brightness: float) -> Optional[ColorCorrection]:
+    return Brightness(brightness)
+
+
+def _white_balance(live: Dict, brightness: float) -> Optional[ColorCorrection]:
+    gains = live.get("white_balance")
+    if not isinstance(gains, (list, tuple)) or len(gains) != 3:
+        return None
+    parsed = [_number(g) for g in gains]
+    # A malformed value from the API must not take down the render thread; skip the correction.
+    if any(g is None for g in parsed):
+        return None
+    return WhiteBalance(parsed)
+
+
+def _gamma(live: Dict, brightness: float) -> Optional[ColorCorrection]:
+    return Gamma(_clamped(live, "gamma", 1.0, 0.2, 4.0))
+
+
+# Tone corrections in the order they are applied; gamma stays last so it sees linear values.
+# New corrections (e.g. colour temperature) are added here and cost nothing per pixel.
+CORRECTIONS: List[Callable[[Dict, float], Optional[ColorCorrection]]] = [
+    _brightness,
+    _white_balance,
+    _gamma,
+]
+
+
+class FrameStage:
+    """One step of the compiled post-processing chain.
+
+    ``apply`` works in place where it can and returns the array the next stage should read.
+    """
+
+    def apply(self, frame: np.ndarray, frame_id: int) -> np.ndarray:  # pragma: no cover - override
+        raise NotImplementedError
+
+
+class ScaleStage(FrameStage):
+    """Brightness as a float gain, for when it has to act before the blend."""
+
+    def __init__(self, level: float) -> None:
+        self.level = level
+
+    def apply(self, frame: np.ndarray, frame_id: int) -> np.ndarray:
+        frame *= self.level
+        return frame
+
+
+class BlendStage(FrameStage):
+    """Temporal smoothing against a persistent float accumulator."""
+
+    def __init__(self, accumulator: np.ndarray, blend: float) -> None:
+        self.accumulator = accumulator
+        self.mix = 1.0 - blend
+
+    def apply(self, frame: np.ndarray, frame_id: int) -> np.ndarray:
+        acc = self.accumulator
+        # acc += (frame - acc) * mix, reusing the working buffer as scratch.
+        np.subtract(frame, acc, out=frame)
+        frame *= self.mix
+        acc += frame
+        return acc
+
+
+class LutStage(FrameStage):
+    """Quantise to 8 bit and map every channel through its compiled tone curve in one gather."""
+
+    def __init__(self, lut: np.ndarray, count: int) -> None:
+        self.lut = lut
+        self.index = np.zeros((count, 3), dtype=np.intp)
+        self.out = np.zeros((count, 3), dtype=np.uint8)
+
+    def apply(self, frame: np.ndarray, frame_id: int) -> np.ndarray:
+        np.clip(frame, 0.0, 255.0, out=self.index, casting="unsafe")
+        self.index += _CHANNEL_OFFSETS
+        np.take(self.lut, self.index, out=self.out)
+        return self.out
+
+
+class DitherStage(FrameStage):
+    """Ordered temporal dither; the offset pattern only has seven phases so all are precomputed.
+
+    The phase only advances when the quantised input changes: a repeated frame keeps its
+    pattern, so it stays byte-identical and the engine can still skip the show.
+    """
+
+    def __init__(self, count: int, strength: float) -> None:
+        base = (np.arange(count) * 73) % 7
+        patterns = []
+        for salt in range(7):
+            noise = ((base + salt) % 7) - 3  # -3..3
+            # Matches int(value + noise * 0.35 * strength) for non-negative values.
+            patterns.append(np.floor(noise * 0.35 * strength).astype(np.int16))
+        self.patterns = np.stack(patterns)[:, :, None]
+        self.scratch = np.zeros((count, 3), dtype=np.int16)
+        self.out = np.zeros((count, 3), dtype=np.uint8)
+        self.last = np.zeros((count, 3), dtype=np.uint8)
+        self.primed = False
+
+    def apply(self, frame: np.ndarray, frame_id: int) -> np.ndarray:
+        if self.primed and np.array_equal(frame, self.last):
+            return self.out
+        self.last[:] = frame
+        self.primed = True
+        salt = ((frame_id * 31) & 0xFF) % 7
+        np.add(frame, self.patterns[salt], out=self.scratch)
+        np.clip(self.scratch, 0, 255, out=self.scratch)
+        self.out[:] = self.scratch
+        return self.out
+
+
+class RemapStage(FrameStage):
+    """Reorder pixels through a cached index array (reverse / center mirror)."""
+
+    def __init__(self, index: np.ndarray) -> None:
+        self.index = index
+        self.out = np.zeros((index.shape[0], 3), dtype=np.uint8)
+
+    def apply(self, frame: np.ndarray, frame_id: int) -> np.ndarray:
+        np.take(frame, self.index, axis=0, out=self.out)
+        return self.out
+
+
+def direction_index(direction: str, count: int) -> Optional[np.ndarray]:
+    if direction == "reverse":
+        return np.arange(count - 1, -1, -1, dtype=np.intp)
+    if direction == "center":
+        mid = (count - 1) / 2.0
+        return np.minimum(np.abs(np.arange(count) - mid).astype(np.intp), count - 1)
+    return None
+
+
+class FilterChain:
+    """Post-processing for the live controls, compiled into stages whenever they change.
+
+    Float stages (frame blend) run on the engine's working buffer; everything after
+    quantisation runs on uint8 arrays via lookup tables and cached index maps. Tone
+    corrections registered in ``CORRECTIONS`` are folded into the same LUT, except that
+    brightness becomes a float gain ahead of the blend while blending is on, so
+    ``frame_blend`` fades brightness changes like it always did instead of stepping them.
+    """
+
+    def __init__(self) -> None:
+        self.stages: List[FrameStage] = []
+        self.corrections: List[ColorCorrection] = []
+        self._signature: Optional[Tuple] = None
+        self._blends = False
+        # Brightness level the accumulator is kept at, whether it is applied as a gain or via the LUT.
+        self._level = 1.0
+        self._accumulator = np.zeros((0, 3), dtype=np.float32)
+        self._blank = np.zeros((0, 3), dtype=np.uint8)
+
+    def configure(self, live: Dict, brightness: float, count: int) -> None:
+        corrections = self._corrections(live, brightness)
+        blend = _clamped(live, "frame_blend", live.get("smoothing", 0.0), 0.0, 0.98)
+        dither = bool(live.get("dither", False))
+        dither_strength = _clamped(live, "dither_strength", 1.0, 0.0, 1.0)
+        direction = str(live.get("direction", "forward"))
+        signature = (
+            count,
+            round(blend, 4),
+            dither,
+            round(dither_strength, 4) if dither else None,
+            direction,
+            tuple(c.key() for c in corrections),
+        )
+        if signature == self._signature:
+            return
+        self._signature = signature
+        self.corrections = corrections
+        self.stages = self._compile(count, blend, dither, dither_strength, direction)
+
+    def _corrections(self, live: Dict, brightness: float) -> List[ColorCorrection]:
+        corrections = (factory(live, brightness) for factory in CORRECTIONS)
+        return [c for c in corrections if c is not None]
+
+    def build_lut(self, corrections: Optional[Sequence[ColorCorrection]] = None) -> np.ndarray:
+        curves = np.tile(np.linspace(0.0, 1.0, 256), (3, 1))
+        for correction in self.corrections if corrections is None else corrections:
+            curves = correction.apply(curves)
+        # Truncate like the scalar path did (int(x * 255)); the epsilon keeps exact values stable.
+        lut = np.floor(np.clip(curves, 0.0, 1.0) * 255.0 + 1e-6)
+        return lut.astype(np.uint8).reshape(-1)
+
+    def _compile(self, count: int, blend: float, dither: bool, dither_strength: float, direction: str) -> List[FrameStage]:
+        stages: List[FrameStage] = []
+        if self._accumulator.shape[0] != count:
+            self._accumulator = np.zeros((count, 3), dtype=np.float32)
+        self._blends = blend > 0
+        folded = self.corrections
+        levels = [c.level for c in self.corrections if isinstance(c, Brightness)]
+        self._level = levels[0] if levels else 1.0
+        if self._blends:
+            folded = [c for c in self.corrections if not isinstance(c, Brightness)]
+            if self._level != 1.0:
+                stages.append(ScaleStage(self._level))
+            stages.append(BlendStage(self._accumulator, blend))
+        stages.append(LutStage(self.build_lut(folded), count))
+        if dither and dither_strength > 0:
+            stages.append(DitherStage(count, dither_strength))
+        index = direction_index(direction, count)
+        if index is not None:
+            stages.append(RemapStage(index))
+        return stages
+
+    def settled(self, frame: np.ndarray) -> bool:
+        """True when the blend accumulator has converged on ``frame`` (always true without blending)."""
+        if not self._blends:
+            return True
+        if self._accumulator.shape != frame.shape:
+            return False
+        return bool(np.abs(self._accumulator - frame * self._level).max(initial=0.0) < 0.5)
+
+    def run(self, frame: np.ndarray, frame_id: int) -> np.ndarray:
+        """Run the compiled stages over a float (N, 3) frame and return a uint8 (N, 3) frame."""
+        if not frame.shape[0]:
+            return self._blank
+        if not self._blends:
+            # Keep the accumulator in sync so enabling frame_blend later starts from the current frame.
+            np.multiply(frame, self._level, out=self._accumulator)
+        out = frame
+        for stage in self.stages:
+            out = stage.apply(out, frame_id)
+        return out
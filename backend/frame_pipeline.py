@@ -0,0 +1,71 @@
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+
+
+class FramePipeline:
+    """Double-buffered hand-off between the render thread and a dedicated output thread.
+
+    The render loop copies each finished frame into one of two swap buffers and returns
+    to render the next frame while the output thread packs and shows the previous one
+    (shifting a frame out takes about 30 us per LED, and ``show()`` cannot start before
+    the previous transfer has finished; SPI outputs even write synchronously). ``submit``
+    only waits when the output thread has not yet picked up the previous frame, so at
+    most one frame is queued and latency stays at one frame.
+    """
+
+    def __init__(self, output: Callable[[np.ndarray], None]) -> None:
+        self._output = output
+        self._buffers: List[np.ndarray] = [np.zeros((0, 3), dtype=np.uint8), np.zeros((0, 3), dtype=np.uint8)]
+        self._back = 0
+        self._pending: Optional[np.ndarray] = None
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.running = False
+        self.frames_out = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._loop, name="led-output", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=1)
+
+    def submit(self, frame: np.ndarray) -> None:
+        with self._cond:
+            while self.running and self._pending is not None:
+                self._cond.wait()
+            buf = self._buffers[self._back]
+            if buf.shape != frame.shape:
+                buf = np.empty(frame.shape, dtype=np.uint8)
+                self._buffers[self._back] = buf
+            buf[:] = frame
+            self._back ^= 1
+            self._pending = buf
+            self._cond.notify_all()
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while self.running and self._pending is None:
+                    self._cond.wait()
+                if not self.running:
+                    return
+                front = self._pending
+                self._pending = None
+                self._cond.notify_all()
+            try:
+                self._output(front)
+                self.frames_out += 1
+            except Exception:
+                # Keep the output thread alive; a failed show() just drops this frame.
+                self.errors += 1
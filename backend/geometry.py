@@ -0,0 +1,155 @@
+"""Physical LED positions for installations that are not a straight strip or a flat matrix.
+
+``hardware.json`` points at one or more coordinate files in ``config/``:
+
+    "coordinates": [{"file": "boom.csv", "start": 0, "output": 0}]
+
+CSV files hold ``x,y,z`` per LED in chain order (``x,y`` gives z = 0; a fourth column
+means ``index,x,y,z`` with the index relative to ``start``; a header line is skipped).
+JSON files hold ``[[x, y, z], ...]``, ``[{"x": .., "y": .., "z": ..}, ...]`` or either
+under a ``"points"`` key. All files share one frame: the points are centred and scaled
+by the largest extent into -1..1, keeping the aspect ratio. Everything is loaded and
+normalized once at startup; segments get a read-only float32 slice plus a
+``SpatialIndex`` on their context.
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config_store import CONFIG_DIR
+from .effects.spatial import SpatialIndex
+
+
+class LedGeometry:
+    """Normalized positions for the LED chain; LEDs without a position are NaN."""
+
+    def __init__(self, points: np.ndarray) -> None:
+        self.points = points
+        self.known = ~np.isnan(points).any(axis=1)
+        self._segments: Dict[Tuple[int, int], Optional[SpatialIndex]] = {}
+
+    @property
+    def count(self) -> int:
+        return int(self.known.sum())
+
+    def segment(self, start: int, end: int) -> Optional[SpatialIndex]:
+        """Spatial index over LEDs ``start..end``; None unless every one of them has a position.
+
+        Cached per range, so neighbour lists survive plan recompiles.
+        """
+        key = (start, end)
+        if key not in self._segments:
+            index = None
+            if 0 <= start <= end < self.points.shape[0] and self.known[start : end + 1].all():
+                coords = self.points[start : end + 1].copy()
+                coords.flags.writeable = False
+                index = SpatialIndex(coords)
+            self._segments[key] = index
+        return self._segments[key]
+
+
+def _rows_from_csv(path: Path) -> List[List[float]]:
+    rows = []
+    with open(path, "r", encoding="utf-8", newline="") as fh:
+        for i, row in enumerate(csv.reader(fh)):
+            cells = [c.strip() for c in row if c.strip()]
+            if not cells or cells[0].startswith("#"):
+                continue
+            try:
+                rows.append([float(c) for c in cells])
+            except ValueError:
+                if i == 0 and not rows:
+                    continue  # header
+                raise ValueError(f"{path.name} line {i + 1}: not a number")
+    return rows
+
+
+def _rows_from_json(path: Path) -> List[List[float]]:
+    with open(path, "r", encoding="utf-8") as fh:
+        data = json.load(fh)
+    if isinstance(data, Mapping):
+        data = data.get("points", [])
+    rows = []
+    for item in data:
+        if isinstance(item, Mapping):
+            rows.append([float(item.get("x", 0.0)), float(item.get("y", 0.0)), float(item.get("z", 0.0))])
+        else:
+            rows.append([float(c) for c in item])
+    return rows
+
+
+def load_points(path: Path) -> Tuple[np.ndarray, np.ndarray]:
+    """Raw ``(offsets, xyz)`` from a coordinate file; offsets are relative to the file's start."""
+    rows = _rows_from_json(path) if path.suffix.lower() == ".json" else _rows_from_csv(path)
+    if not rows:
+        raise ValueError(f"{path.name} has no points")
+    width = len(rows[0])
+    if width not in (2, 3, 4) or any(len(r) != width for r in rows):
+        raise ValueError(f"{path.name}: expected 2, 3 or 4 columns on every line")
+    table = np.asarray(rows, dtype=np.float64)
+    if width == 4:
+        offsets = table[:, 0].astype(np.intp)
+        table = table[:, 1:]
+    else:
+        offsets = np.arange(len(rows), dtype=np.intp)
+    xyz = np.zeros((len(rows), 3), dtype=np.float64)
+    xyz[:, : table.shape[1]] = table
+    if not np.isfinite(xyz).all():
+        raise ValueError(f"{path.name} contains non-finite coordinates")
+    return offsets, xyz
+
+
+def normalize(points: np.ndarray) -> np.ndarray:
+    """Centre on the bounding box and scale the largest extent to -1..1 (NaN rows stay NaN)."""
+    known = ~np.isnan(points).any(axis=1)
+    out = np.full(points.shape, np.nan, dtype=np.float32)
+    if not known.any():
+        return out
+    lo = points[known].min(axis=0)
+    hi = points[known].max(axis=0)
+    extent = float((hi - lo).max()) / 2.0 or 1.0
+    out[known] = (points[known] - (lo + hi) / 2.0) / extent
+    return out
+
+
+def load_geometry(
+    hardware_cfg: Mapping[str, Any],
+    led_count: int,
+    output_ranges: Optional[Sequence[Tuple[int, int]]] = None,
+    config_dir: Path = CONFIG_DIR,
+) -> Optional[LedGeometry]:
+    """Geometry from ``hardware_cfg["coordinates"]``, or None when no file loads.
+
+    Like layouts, an entry with an ``output`` index has its ``start`` relative to that
+    output. Bad files are logged and skipped; points past the chain end are dropped.
+    """
+    specs: Any = hardware_cfg.get("coordinates") or []
+    if isinstance(specs, (str, Mapping)):
+        specs = [specs]
+    raw = np.full((led_count, 3), np.nan, dtype=np.float64)
+    loaded = 0
+    for spec in specs:
+        if isinstance(spec, str):
+            spec = {"file": spec}
+        name = str(spec.get("file", ""))
+        try:
+            start = int(spec.get("start", 0))
+            if spec.get("output") is not None and output_ranges:
+                start += output_ranges[int(spec["output"])][0]
+            offsets, xyz = load_points(config_dir / name)
+        except (OSError, IndexError, TypeError, ValueError) as exc:
+            print(f"[ledweb] Skipping coordinates {name!r}: {exc}")
+            continue
+        idx = offsets + start
+        keep = (idx >= 0) & (idx < led_count)
+        raw[idx[keep]] = xyz[keep]
+        loaded += int(keep.sum())
+    if not loaded:
+        return None
+    geometry = LedGeometry(normalize(raw))
+    print(f"[ledweb] LED coordinates: {geometry.count}/{led_count} positioned")
+    return geometry
@@ -0,0 +1,419 @@
+"""Golden-frame regression check for effects: ``python -m backend.golden``.
+
+Every registered effect is driven with a deterministic context: a fixed timestep,
+seeded effect RNGs and a scripted audio track (a stretch of silence, then the
+synthetic 120 bpm signal from the benchmark). Every ``EVERY``-th frame is kept as
+uint8 and compared with the recorded sequence in ``goldens/frames.npz``; a frame
+fails when any channel is off by more than ``--tolerance``. ``--perf baseline.json``
+adds the benchmark's p50 comparison, so render-time regressions fail the run too.
+Matrix layouts get their own cases (``MATRIX_LAYOUTS`` x ``MATRIX_EFFECTS``): the effect
+renders its 2D canvas and the layout's gather map places it in chain order, so a
+change to either shows up. ``check`` also runs the frame cache through an over-budget
+plan (``check_frame_cache``) and differently wired matrices (``check_frame_cache_layouts``),
+and checks that shared zone renders look like separately rendered zones
+(``check_shared_renders``).
+
+The goldens were first recorded after the effects had been vectorized, so they pin the
+current look rather than the original renderer's. ``baseline`` renders the per-pixel
+effects module from a git ref (by default the repository's first commit) under the
+same script and reports how far every effect has moved from it; effects whose
+output depends on the random seed (in either renderer) are reported as ``random``, as
+their frames cannot be compared one to one.
+
+    python -m backend.golden record                # (re)record all goldens
+    python -m backend.golden record --effects comet
+    python -m backend.golden check --perf /tmp/perf.json
+    python -m backend.golden baseline              # diff against the original renderer
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import types
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import bench
+from .effects import EFFECTS, kernels, seed_rngs
+from .frame_cache import FrameCache
+from .layout import MatrixLayout, compile_layout
+from .render_plan import LIVE_DEFAULTS, compile_plan, render_segment
+
+GOLDEN_PATH = Path(__file__).resolve().parent / "goldens" / "frames.npz"
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_MODULE = "backend/effects/__init__.py"
+LEDS = (7, 60)
+FPS = 60.0
+FRAMES = 120
+EVERY = 5
+SILENT_FRAMES = 30
+SEED = 1234
+PERF_LEDS = (300,)
+# A serpentine panel, a rotated row-wise one and a rotated, mirrored 2x2 chain of serpentine panels.
+MATRIX_LAYOUTS = (
+    {"name": "serpentine", "width": 8, "height": 8},
+    {"name": "rot90", "width": 8, "height": 4, "serpentine": False, "rotation": 90},
+    {
+        "name": "panels",
+        "width": 4,
+        "height": 3,
+        "flip_x": True,
+        "rotation": 270,
+        "panels": {"columns": 2, "rows": 2, "serpentine": True},
+    },
+)
+# The effects with their own render_matrix, a spatial one on grid coordinates and a 1D one via the default reshape.
+MATRIX_EFFECTS = ("rainbow_cycle", "lava_flow", "plasma", "radial_wave", "comet")
+
+
+def scripted_audio(frame: int) -> Dict:
+    """Silence for the first ``SILENT_FRAMES`` frames, then the benchmark's synthetic track."""
+    audio = bench.synthetic_audio(frame, FPS)
+    if frame < SILENT_FRAMES:
+        audio.update(bands=[0.0] * len(audio["bands"]), vol=0.0, beat=False, flux=0.0, rms=0.0, bass=0.0)
+    return audio
+
+
+def render_sequence(
+    name: str, leds: int, layout: Optional[MatrixLayout] = None, params: Optional[Dict] = None, seed: int = SEED
+) -> np.ndarray:
+    """The kept frames of one effect as uint8 (frames, leds, 3), rendered through ``layout`` if given."""
+    effect_cls = EFFECTS[name]
+    seed_rngs(seed)
+    try:
+        effect = effect_cls()
+    finally:
+        seed_rngs(None)
+    ctx = bench._context(effect_cls, leds)
+    if params is not None:
+        ctx.params = params
+    canvas = None
+    if layout is not None:
+        ctx.width, ctx.height = layout.width, layout.height
+        canvas = layout.canvas()
+    dt = 1.0 / FPS
+    work = np.zeros((leds, 3), dtype=np.float32)
+    kept = np.zeros((FRAMES // EVERY, leds, 3), dtype=np.uint8)
+    for i in range(FRAMES):
+        ctx.time = ctx.timeline = i * dt
+        ctx.dt = dt
+        ctx.audio = scripted_audio(i)
+        if layout is None:
+            effect.render_into(ctx, work)
+        else:
+            effect.render_matrix(ctx, canvas)
+            layout.place(canvas, work)
+        if i % EVERY == EVERY - 1:
+            np.clip(work, 0.0, 255.0, out=kept[i // EVERY], casting="unsafe")
+    return kept
+
+
+def _key(name: str, leds: int) -> str:
+    return f"{name}@{leds}"
+
+
+def _cases(names: Sequence[str]) -> Iterator[Tuple[str, str, int, Optional[MatrixLayout]]]:
+    """``(key, effect, leds, layout)`` for every sequence of ``names``: strips first, then matrices."""
+    for name in names:
+        for leds in LEDS:
+            yield _key(name, leds), name, leds, None
+    for cfg in MATRIX_LAYOUTS:
+        layout = compile_layout(cfg, 0)
+        for name in MATRIX_EFFECTS:
+            if name in names:
+                yield f"{name}@{layout.name}", name, layout.width * layout.height, layout
+
+
+def load_goldens(path: Path = GOLDEN_PATH) -> Dict[str, np.ndarray]:
+    if not path.exists():
+        return {}
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def record(names: Sequence[str], path: Path = GOLDEN_PATH) -> int:
+    """Render ``names`` and merge them into the golden file; other effects keep their frames."""
+    goldens = load_goldens(path)
+    count = 0
+    for key, name, leds, layout in _cases(names):
+        goldens[key] = render_sequence(name, leds, layout)
+        count += 1
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, **goldens)
+    return count
+
+
+def check(names: Sequence[str], tolerance: int, path: Path = GOLDEN_PATH) -> List[Dict]:
+    goldens = load_goldens(path)
+    rows = []
+    for key, name, leds, layout in _cases(names):
+        row: Dict = {"effect": name if layout is None else key, "leds": leds}
+        expected = goldens.get(key)
+        try:
+            actual = render_sequence(name, leds, layout)
+        except Exception as exc:
+            row.update(status="error", detail=f"{type(exc).__name__}: {exc}")
+            rows.append(row)
+            continue
+        if expected is None:
+            row.update(status="missing", detail="no golden recorded")
+        elif expected.shape != actual.shape:
+            row.update(status="changed", detail=f"shape {actual.shape} != {expected.shape}")
+        else:
+            diff = np.abs(actual.astype(np.int16) - expected.astype(np.int16))
+            worst = int(diff.max()) if diff.size else 0
+            row.update(max_diff=worst, mean_diff=round(float(diff.mean()), 3) if diff.size else 0.0)
+            if worst > tolerance:
+                frame = int(np.argmax(diff.reshape(diff.shape[0], -1).max(axis=1)))
+                over = float((diff.max(axis=2) > tolerance).mean())
+                row.update(status="changed", detail=f"frame {frame * EVERY + EVERY - 1}, {over:.1%} of pixels")
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def check_frame_cache(frames: int = 320) -> Dict:
+    """Three slow 300-LED rainbow zones whose periods exceed the default 8 MB budget together.
+
+    The zones must not evict each other: the ones that fit are served from the cache, the
+    rest render live, and every frame matches live rendering.
+    """
+    row: Dict = {"effect": "frame_cache", "leds": 900}
+    segments = [
+        {"start": i * 300, "end": i * 300 + 299, "effect": "rainbow_cycle", "params": {"speed": speed}}
+        for i, speed in enumerate((0.05, 0.06, 0.07))
+    ]
+    plan = compile_plan({"segments": segments, "fps": FPS}, 1, 900, {})
+    cache = FrameCache(8 * 1024 * 1024)
+    live = np.zeros((300, 3), dtype=np.float32)
+    worst = 0.0
+
+    def draw(seg, target: np.ndarray) -> None:
+        seg.effect.render_into(seg.context, target)
+
+    for i in range(frames):
+        t = i / FPS
+        for index, seg in enumerate(plan.segments):
+            cached = cache.frame(plan.rev, index, seg, t, plan.fps, draw)
+            if cached is not None:
+                seg.context.time = t
+                draw(seg, live)
+                worst = max(worst, float(np.abs(cached - live).max()))
+    stats = cache.stats()
+    row.update(max_diff=int(round(worst)), detail=f"{stats['entries']} cached, {stats['evictions']} evictions")
+    ok = stats["evictions"] == 0 and stats["entries"] >= 1 and stats["bytes"] <= stats["max_bytes"] and worst <= 3
+    row["status"] = "ok" if ok else "changed"
+    return row
+
+
+def check_frame_cache_layouts(frames: int = 240) -> Dict:
+    """Two 8x8 rainbow matrices, serpentine and row-wise: same effect, size and params, different wiring.
+
+    Cached rows are stored in chain order, so each matrix needs its own entry and must
+    match live rendering.
+    """
+    row: Dict = {"effect": "frame_cache_layouts", "leds": 128}
+    layouts = {
+        "serpentine": compile_layout({"name": "serpentine", "width": 8, "height": 8}, 0),
+        "rows": compile_layout({"name": "rows", "width": 8, "height": 8, "serpentine": False}, 64),
+    }
+    segments = [{"layout": name, "effect": "rainbow_cycle", "params": {"speed": 0.5}} for name in layouts]
+    plan = compile_plan({"segments": segments, "fps": FPS}, 1, 128, {}, layouts=layouts)
+    cache = FrameCache(8 * 1024 * 1024)
+    cached = np.zeros((128, 3), dtype=np.float32)
+    live = np.zeros((128, 3), dtype=np.float32)
+    for i in range(frames):
+        t = i / FPS
+        for index, seg in enumerate(plan.segments):
+            render_segment(seg, index, cached, t, 1.0 / FPS, {}, cache, plan.rev, plan.fps)
+            render_segment(seg, index, live, t, 1.0 / FPS, {})
+        row["max_diff"] = max(row.get("max_diff", 0), int(np.abs(cached - live).max()))
+    stats = cache.stats()
+    row["detail"] = f"{stats['entries']} cached, {stats['hits']} hits"
+    row["status"] = "ok" if stats["entries"] == 2 and stats["hits"] and row["max_diff"] <= 3 else "changed"
+    return row
+
+
+def check_shared_renders(frames: int = 120) -> Dict:
+    """Pairs of zones that differ only in ``intensity`` must match rendering each zone on its own.
+
+    ``rainbow_cycle`` ignores the param, so its pair shares one render; ``breathing`` and
+    ``pulse_white`` read it, so theirs must not.
+    """
+    row: Dict = {"effect": "shared_renders", "leds": 0}
+    segments = []
+    for name in ("rainbow_cycle", "breathing", "pulse_white"):
+        for intensity in (0.3, 0.9):
+            start = len(segments) * 30
+            segments.append({"start": start, "end": start + 29, "effect": name, "params": {"intensity": intensity}})
+    row["leds"] = len(segments) * 30
+    plan = compile_plan({"segments": segments, "fps": FPS}, 1, row["leds"], {})
+    alone = [compile_plan({"segments": [dict(seg, start=0, end=29)], "fps": FPS}, 1, 30, {}) for seg in segments]
+    shared = np.zeros((row["leds"], 3), dtype=np.float32)
+    single = np.zeros((30, 3), dtype=np.float32)
+    worst = 0.0
+    for i in range(frames):
+        t = i / FPS
+        for index, seg in enumerate(plan.segments):
+            render_segment(seg, index, shared, t, 1.0 / FPS, {})
+        for seg, solo in zip(segments, alone):
+            render_segment(solo.segments[0], 0, single, t, 1.0 / FPS, {})
+            worst = max(worst, float(np.abs(shared[seg["start"] : seg["end"] + 1] - single).max()))
+    renders = [seg.effect.name for seg in plan.segments]
+    row.update(max_diff=int(round(worst)), detail=f"{len(renders)} renders for {len(segments)} zones")
+    ok = worst <= 1 and renders == ["rainbow_cycle", "breathing", "breathing", "pulse_white", "pulse_white"]
+    row["status"] = "ok" if ok else "changed"
+    return row
+
+
+def load_baseline(ref: Optional[str] = None) -> types.ModuleType:
+    """The effects module as of git ``ref`` (default: the first commit), loaded standalone."""
+    def git(*args: str) -> str:
+        return subprocess.run(["git", *args], cwd=REPO_ROOT, check=True, capture_output=True, text=True).stdout
+
+    ref = ref or git("rev-list", "--max-parents=0", "HEAD").split()[0]
+    source = git("show", f"{ref}:{BASELINE_MODULE}")
+    module = types.ModuleType("backend_baseline_effects")
+    # Registered while executing so its dataclasses can resolve their module.
+    sys.modules[module.__name__] = module
+    try:
+        exec(compile(source, f"{ref}:{BASELINE_MODULE}", "exec"), module.__dict__)
+    finally:
+        del sys.modules[module.__name__]
+    return module
+
+
+def render_baseline_sequence(baseline: types.ModuleType, name: str, leds: int, params: Dict, seed: int) -> np.ndarray:
+    """Like ``render_sequence``, for the baseline's list-returning ``render``."""
+    random.seed(seed)
+    effect = baseline.EFFECTS[name]()
+    segment = {"name": "Bench", "start": 0, "end": leds - 1, "effect": name, "params": params}
+    ctx = baseline.EffectContext(
+        time=0.0,
+        dt=0.0,
+        length=leds,
+        params=params,
+        audio={},
+        global_state={"effect": name, "effect_params": params},
+        segment=segment,
+        live=dict(LIVE_DEFAULTS),
+    )
+    dt = 1.0 / FPS
+    kept = np.zeros((FRAMES // EVERY, leds, 3), dtype=np.uint8)
+    for i in range(FRAMES):
+        ctx.time = ctx.timeline = i * dt
+        ctx.dt = dt
+        ctx.audio = scripted_audio(i)
+        pixels = effect.render(ctx)
+        if i % EVERY == EVERY - 1:
+            frame = np.asarray(pixels, dtype=np.float64).reshape(leds, 3)
+            np.clip(frame, 0.0, 255.0, out=frame)
+            kept[i // EVERY] = frame
+    return kept
+
+
+def compare_baseline(names: Sequence[str], tolerance: int, ref: Optional[str] = None) -> List[Dict]:
+    """Current effects against the baseline renderer, same params and script for both."""
+    baseline = load_baseline(ref)
+    rows = []
+    for name in names:
+        for leds in LEDS:
+            row: Dict = {"effect": name, "leds": leds}
+            rows.append(row)
+            base_cls = baseline.EFFECTS.get(name)
+            if base_cls is None:
+                row.update(status="new", detail="not in the baseline")
+                continue
+            # Current defaults win, so intentionally retuned defaults do not count as a changed look.
+            params = {**base_cls.default_params, **EFFECTS[name].default_params}
+            try:
+                before = render_baseline_sequence(baseline, name, leds, dict(params), SEED)
+                after = render_sequence(name, leds, params=dict(params))
+            except Exception as exc:
+                row.update(status="error", detail=f"{type(exc).__name__}: {exc}")
+                continue
+            diff = np.abs(after.astype(np.int16) - before.astype(np.int16))
+            row.update(max_diff=int(diff.max()), mean_diff=round(float(diff.mean()), 3))
+            if row["max_diff"] <= tolerance:
+                row["status"] = "ok"
+            elif not (
+                np.array_equal(before, render_baseline_sequence(baseline, name, leds, dict(params), SEED + 1))
+                and np.array_equal(after, render_sequence(name, leds, params=dict(params), seed=SEED + 1))
+            ):
+                row.update(status="random", detail="output depends on the random seed")
+            else:
+                over = float((diff.max(axis=2) > tolerance).mean())
+                row.update(status="changed", detail=f"{over:.1%} of pixels")
+    return rows
+
+
+def _print_rows(rows: List[Dict]) -> None:
+    print(f"{'effect':<24} {'leds':>5} {'status':<8} {'max':>4} {'mean':>7}  detail")
+    for row in rows:
+        print(
+            f"{row['effect']:<24} {row['leds']:>5} {row['status']:<8} {row.get('max_diff', ''):>4} "
+            f"{row.get('mean_diff', ''):>7}  {row.get('detail', '')}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.golden", description="Golden-frame check for all effects.")
+    parser.add_argument("command", choices=("check", "record", "baseline"))
+    parser.add_argument("--effects", default="", help="comma separated effect names (default: all)")
+    parser.add_argument("--tolerance", type=int, default=3, help="allowed per-channel difference (0-255)")
+    parser.add_argument("--kernels", choices=kernels.MODES, default="numpy", help="effect kernel backend")
+    parser.add_argument("--golden", type=Path, default=GOLDEN_PATH, help="golden frame file")
+    parser.add_argument("--ref", help="git ref of the baseline renderer (default: the first commit)")
+    parser.add_argument("--perf", help="benchmark baseline JSON: written by record, compared by check")
+    parser.add_argument("--perf-threshold", type=float, default=1.5, help="p50 ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.effects.split(",") if n.strip()] or sorted(EFFECTS)
+    unknown = [n for n in names if n not in EFFECTS]
+    if unknown:
+        parser.error(f"unknown effects: {', '.join(unknown)}")
+    kernels.configure(args.kernels, background=False)
+
+    if args.command == "record":
+        count = record(names, args.golden)
+        print(f"[ledweb] recorded {count} golden sequences in {args.golden}")
+        if args.perf:
+            report = bench.run(names, PERF_LEDS, frames=200, warmup=20, fps=FPS)
+            with open(args.perf, "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+            print(f"[ledweb] performance baseline written to {args.perf}")
+        return 0
+
+    if args.command == "baseline":
+        rows = compare_baseline(names, args.tolerance, args.ref)
+        _print_rows(rows)
+        changed = [row for row in rows if row["status"] in ("changed", "error")]
+        # A report, not a gate: some looks changed on purpose (see the README).
+        print(f"[ledweb] {len(changed)}/{len(rows)} sequences differ from the baseline renderer")
+        return 0
+
+    rows = check(names, args.tolerance, args.golden)
+    rows.append(check_frame_cache())
+    rows.append(check_frame_cache_layouts())
+    rows.append(check_shared_renders())
+    _print_rows(rows)
+    failed = [row for row in rows if row["status"] != "ok"]
+    if args.perf:
+        with open(args.perf, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        report = bench.run(names, PERF_LEDS, frames=200, warmup=20, fps=FPS)
+        slow = [row for row in bench.compare(report, baseline, args.perf_threshold) if row["regressed"]]
+        for row in slow:
+            print(f"[ledweb] {row['effect']} @ {row['leds']}: p50 {row['before_ms']:.3f} -> {row['after_ms']:.3f} ms")
+        failed += slow
+    print(f"[ledweb] {len(rows) - sum(1 for r in rows if r['status'] != 'ok')}/{len(rows)} golden sequences match")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
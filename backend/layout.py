@@ -0,0 +1,125 @@
+"""2D matrix layouts: map a logical (height, width) canvas onto the LED chain.
+
+A layout in ``hardware.json`` describes how one or more identical panels are wired:
+
+    "layouts": [
+      {"name": "paneel", "start": 0, "width": 16, "height": 16, "serpentine": true,
+       "order": "rows", "rotation": 0, "flip_x": false, "flip_y": false,
+       "panels": {"columns": 2, "rows": 1, "serpentine": false}}
+    ]
+
+``width``/``height`` are per panel; panels are chained row by row (every other panel
+row reversed with ``panels.serpentine``). ``rotation`` (0/90/180/270, clockwise) turns
+the logical canvas the effects see. Each layout compiles once into ``gather``: for every
+LED in chain order the flat canvas index it shows, so a frame is placed with one
+``np.take`` instead of per-pixel coordinate math.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+ROTATIONS = (0, 90, 180, 270)
+
+
+@dataclass(frozen=True)
+class MatrixLayout:
+    name: str
+    start: int
+    # Logical canvas size, after rotation.
+    width: int
+    height: int
+    gather: np.ndarray
+
+    @property
+    def count(self) -> int:
+        return self.width * self.height
+
+    @property
+    def end(self) -> int:
+        return self.start + self.count - 1
+
+    def canvas(self) -> np.ndarray:
+        return np.zeros((self.height, self.width, 3), dtype=np.float32)
+
+    def wiring(self) -> Tuple[str, str]:
+        """Identity of the pixel mapping: the name plus a digest of ``gather``."""
+        return self.name, hashlib.blake2b(self.gather.tobytes(), digest_size=16).hexdigest()
+
+    def place(self, canvas: np.ndarray, target: np.ndarray) -> None:
+        """Scatter a rendered ``(height, width, 3)`` canvas into ``target`` in chain order."""
+        np.take(canvas.reshape(-1, 3), self.gather, axis=0, out=target)
+
+
+def _panel_map(width: int, height: int, serpentine: bool, order: str, flip_x: bool, flip_y: bool) -> np.ndarray:
+    """Chain position of every pixel of one panel, as a (height, width) array."""
+    if order == "columns":
+        grid = np.arange(width * height).reshape(width, height)
+        if serpentine:
+            grid[1::2] = grid[1::2, ::-1]
+        grid = grid.T
+    else:
+        grid = np.arange(width * height).reshape(height, width)
+        if serpentine:
+            grid[1::2] = grid[1::2, ::-1]
+    if flip_x:
+        grid = grid[:, ::-1]
+    if flip_y:
+        grid = grid[::-1]
+    return grid
+
+
+def compile_layout(cfg: Mapping[str, Any], start: int) -> MatrixLayout:
+    width = int(cfg["width"])
+    height = int(cfg["height"])
+    if width < 1 or height < 1:
+        raise ValueError("width and height must be at least 1")
+    rotation = int(cfg.get("rotation", 0)) % 360
+    if rotation not in ROTATIONS:
+        raise ValueError(f"rotation must be one of {ROTATIONS}")
+    order = str(cfg.get("order", "rows"))
+    if order not in ("rows", "columns"):
+        raise ValueError("order must be 'rows' or 'columns'")
+    panels = cfg.get("panels") or {}
+    cols = max(1, int(panels.get("columns", 1)))
+    rows = max(1, int(panels.get("rows", 1)))
+
+    panel = _panel_map(width, height, bool(cfg.get("serpentine", True)), order, bool(cfg.get("flip_x")), bool(cfg.get("flip_y")))
+    size = width * height
+    chain = np.empty((rows * height, cols * width), dtype=np.intp)
+    for row in range(rows):
+        for col in range(cols):
+            # Panels are chained row by row; serpentine panel rows run right to left.
+            slot = row * cols + (cols - 1 - col if panels.get("serpentine") and row % 2 else col)
+            chain[row * height : (row + 1) * height, col * width : (col + 1) * width] = panel + slot * size
+
+    logical = np.rot90(chain, k=-rotation // 90)
+    gather = np.empty(logical.size, dtype=np.intp)
+    gather[logical.ravel()] = np.arange(logical.size)
+    gather.flags.writeable = False
+    return MatrixLayout(str(cfg.get("name", "matrix")), start, logical.shape[1], logical.shape[0], gather)
+
+
+def compile_layouts(
+    hardware_cfg: Mapping[str, Any], output_ranges: Optional[Sequence[Tuple[int, int]]] = None
+) -> Dict[str, MatrixLayout]:
+    """All valid layouts from ``hardware_cfg["layouts"]``, by name; bad entries are logged and skipped.
+
+    Like segments, a layout with an ``output`` index has its ``start`` relative to that output.
+    """
+    layouts: Dict[str, MatrixLayout] = {}
+    specs: List[Mapping[str, Any]] = list(hardware_cfg.get("layouts") or [])
+    for i, spec in enumerate(specs):
+        name = str(spec.get("name", f"matrix{i}"))
+        try:
+            start = int(spec.get("start", 0))
+            if spec.get("output") is not None and output_ranges:
+                start += output_ranges[int(spec["output"])][0]
+            layout = compile_layout({**spec, "name": name}, start)
+        except (KeyError, IndexError, TypeError, ValueError) as exc:
+            print(f"[ledweb] Skipping layout {name!r}: {exc}")
+            continue
+        layouts[name] = layout
+    return layouts
@@ -1,8 +1,12 @@
+import atexit
+import ctypes
 import math
 import os
 import threading
 import time
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
 
 try:
     from rpi_ws281x import Color, PixelStrip, WS2811_STRIP_GRB
@@ -11,26 +15,70 @@ except Exception:  # pragma: no cover - hardware fallback
     Color = None
     WS2811_STRIP_GRB = None
 
-from .effects import EFFECTS, EffectContext, Effect
+try:
+    import _rpi_ws281x as ws
+except Exception:  # pragma: no cover - hardware fallback
+    ws = None
+
+from .effects import Effect, kernels
+from .frame_cache import FrameCache
+from .geometry import load_geometry
+from .layout import compile_layouts
+from .frame_clock import FrameClock
+from .frame_filters import FilterChain
+from .frame_pipeline import FramePipeline
+from .metrics import RenderMetrics
+from .render_plan import LIVE_DEFAULTS, RenderPlan, StateSnapshot, make_snapshot, render_segment
+from .render_workers import WorkerPool
 
 RGB = Tuple[int, int, int]
 
 
-def _clamp_color(val: float) -> int:
-    return max(0, min(255, int(val)))
+def pack_pixels(frame: np.ndarray, order: str = "rgb", out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Pack a uint8 (N, 3) RGB frame into 24-bit words, first letter of ``order`` in the high byte.
+
+    "rgb" matches ``Color(r, g, b)``; the ws281x driver reorders to the strip type itself.
+    """
+    count = frame.shape[0]
+    if out is None:
+        out = np.zeros(count, dtype=np.uint32)
+    first, second, third = ("rgb".index(ch) for ch in order.lower())
+    words = out[:count]
+    np.left_shift(frame[:, first], 16, out=words, dtype=np.uint32)
+    words |= frame[:, second].astype(np.uint32) << 8
+    words |= frame[:, third]
+    return out
+
+
+def _to_word(c) -> int:
+    if isinstance(c, (tuple, list)):
+        r, g, b = c[:3]
+        return (int(r) << 16) | (int(g) << 8) | int(b)
+    return int(c)
 
 
 class DummyStrip:
     def __init__(self, num: int) -> None:
         self._n = num
-        self._buf = [(0, 0, 0)] * num
+        # Same layout as the ws281x channel LED array: one 0x00RRGGBB word per pixel.
+        self._leds = np.zeros(num, dtype=np.uint32)
 
     def numPixels(self) -> int:
         return self._n
 
-    def setPixelColor(self, i: int, c: Tuple[int, int, int]) -> None:
+    def setPixelColor(self, i: int, c) -> None:
         if 0 <= i < self._n:
-            self._buf[i] = c
+            self._leds[i] = _to_word(c)
+
+    def getPixelColor(self, i: int) -> int:
+        return int(self._leds[i])
+
+    def setPixelBuffer(self, packed: np.ndarray) -> None:
+        count = min(self._n, packed.shape[0])
+        self._leds[:count] = packed[:count]
+
+    def getPixelBuffer(self) -> np.ndarray:
+        return self._leds.copy()
 
     def show(self) -> None:
         return
@@ -39,48 +87,270 @@ class DummyStrip:
         return
 
 
+def _bulk_writer(strip):
+    """Return a callable that copies a packed uint32 frame into the strip's LED array at once."""
+    if hasattr(strip, "setPixelBuffer"):
+        return strip.setPixelBuffer
+    channel = getattr(strip, "_channel", None)
+    if ws is not None and channel is not None:
+        try:
+            # The SWIG pointer converts to the address of the channel's uint32 LED array,
+            # which stays valid from begin() until the strip is torn down.
+            address = int(ws.ws2811_channel_t_leds_get(channel))
+            capacity = int(ws.ws2811_channel_t_count_get(channel))
+        except Exception:
+            address = 0
+            capacity = 0
+        if address:
+
+            def write(packed: np.ndarray) -> None:
+                count = min(capacity, packed.shape[0])
+                ctypes.memmove(address, packed.ctypes.data, count * 4)
+
+            return write
+
+    def write_each(packed: np.ndarray) -> None:
+        for i, word in enumerate(packed.tolist()):
+            strip.setPixelColor(i, word)
+
+    return write_each
+
+
+# GPIOs driven by the PWM block (PWM0: 12/18/40/52, PWM1: 13/19/41/45/53). Both PWM channels
+# share one peripheral, FIFO and DMA stream, so they must live in a single ws2811_t; SPI
+# (GPIO 10) and PCM (GPIO 21/31) outputs are separate hardware blocks with their own instance.
+PWM_PINS = {12, 18, 40, 52, 13, 19, 41, 45, 53}
+# SPI writes the frame synchronously; PWM and PCM return once their DMA transfer is started.
+SPI_PINS = {10}
+# Gap ws2811_render keeps between two transfers so the LEDs latch (LED_RESET_WAIT_TIME).
+WS2811_RESET_S = 300e-6
+
+
+class PwmDevice:
+    """One ws2811_t driving both PWM channels; a single render() shifts out both at once.
+
+    Unlike ``PixelStrip`` the raw struct has no cleanup of its own: ``close()`` stops the
+    DMA and frees the driver (also at exit), and a later ``begin()`` sets it up again.
+    """
+
+    def __init__(self, specs: List[Dict]) -> None:
+        self._specs = specs
+        self._leds = None
+        self.channels = [PwmChannel(self, None, cfg.get("led_count", 300)) for cfg in specs]
+        atexit.register(self.close)
+
+    @property
+    def closed(self) -> bool:
+        return self._leds is None
+
+    def _build(self):
+        leds = ws.new_ws2811_t()
+        for channum in range(2):
+            chan = ws.ws2811_channel_get(leds, channum)
+            ws.ws2811_channel_t_count_set(chan, 0)
+            ws.ws2811_channel_t_gpionum_set(chan, 0)
+            ws.ws2811_channel_t_invert_set(chan, 0)
+            ws.ws2811_channel_t_brightness_set(chan, 0)
+        for cfg, channel in zip(self._specs, self.channels):
+            chan = ws.ws2811_channel_get(leds, int(cfg.get("channel", 0)))
+            ws.ws2811_channel_t_count_set(chan, cfg.get("led_count", 300))
+            ws.ws2811_channel_t_gpionum_set(chan, cfg.get("gpio_pin", 18))
+            ws.ws2811_channel_t_invert_set(chan, 1 if cfg.get("invert", False) else 0)
+            ws.ws2811_channel_t_brightness_set(chan, cfg.get("brightness", 255))
+            ws.ws2811_channel_t_strip_type_set(chan, WS2811_STRIP_GRB if WS2811_STRIP_GRB is not None else 0)
+            channel._channel = chan
+        # One DMA stream for the whole block; the first output's setting wins.
+        ws.ws2811_t_freq_set(leds, self._specs[0].get("freq_hz", 800_000))
+        ws.ws2811_t_dmanum_set(leds, self._specs[0].get("dma", 10))
+        return leds
+
+    def begin(self) -> None:
+        if self._leds is None:
+            self._leds = self._build()
+        resp = ws.ws2811_init(self._leds)
+        if resp != 0:
+            self.close()
+            raise RuntimeError(f"ws2811_init failed with code {resp} ({ws.ws2811_get_return_t_str(resp)})")
+
+    def close(self) -> None:
+        if self._leds is None:
+            return
+        ws.ws2811_fini(self._leds)
+        ws.delete_ws2811_t(self._leds)
+        self._leds = None
+
+    def show(self) -> None:
+        resp = ws.ws2811_render(self._leds)
+        if resp != 0:
+            raise RuntimeError(f"ws2811_render failed with code {resp} ({ws.ws2811_get_return_t_str(resp)})")
+
+
+class PwmChannel:
+    """Strip-like view of one channel of a ``PwmDevice``; ``show()`` renders the whole device."""
+
+    def __init__(self, device: PwmDevice, channel, count: int) -> None:
+        self.device = device
+        # Picked up by _bulk_writer, which copies frames straight into the channel's LED array.
+        self._channel = channel
+        self._n = count
+
+    def numPixels(self) -> int:
+        return self._n
+
+    def setPixelColor(self, i: int, c) -> None:
+        ws.ws2811_led_set(self._channel, i, _to_word(c))
+
+    def show(self) -> None:
+        self.device.show()
+
+    def begin(self) -> None:
+        return
+
+
+class StripOutput:
+    """One physical strip: its slice of the engine frame, packed word buffer and bulk writer."""
+
+    def __init__(self, strip, offset: int, cfg: Optional[Dict] = None) -> None:
+        self.strip = strip
+        # What show() has to be called on; both PWM channels share one device.
+        self.device = getattr(strip, "device", strip)
+        self.offset = offset
+        self.count = strip.numPixels()
+        # Time the data line needs for one frame (24 bits per LED), 0 for the dummy strip.
+        cfg = cfg or {}
+        real = not isinstance(strip, DummyStrip)
+        self.wire_time = self.count * 24 / float(cfg.get("freq_hz", 800_000)) + WS2811_RESET_S if real else 0.0
+        self.blocking = real and int(cfg.get("gpio_pin", 18)) in SPI_PINS
+        self.packed = np.zeros(self.count, dtype=np.uint32)
+        self.write = _bulk_writer(strip)
+
+    def push(self, frame: np.ndarray) -> None:
+        # Pack this output's slice in one vectorized step; pixels beyond the frame stay black.
+        part = frame[self.offset : self.offset + self.count]
+        pack_pixels(part, "rgb", out=self.packed)
+        self.packed[part.shape[0] :] = 0
+        self.write(self.packed)
+
+
 class LEDEngine:
     def __init__(self, hardware_cfg: Dict[str, int]) -> None:
         self.cfg = hardware_cfg
-        self.strip = self._init_strip(hardware_cfg)
-        self.state = {
+        self.outputs = self._init_outputs(hardware_cfg)
+        # First output's strip, kept for callers that only know about a single strip.
+        self.strip = self.outputs[0].strip
+        self.led_total = sum(out.count for out in self.outputs)
+        self._output_ranges = [(out.offset, out.count) for out in self.outputs]
+        # Matrix layouts are compiled once into gather maps; segments refer to them by name.
+        self.layouts = compile_layouts(hardware_cfg, self._output_ranges)
+        # Optional 3D LED positions, loaded and normalized once; spatial effects sample them.
+        self.geometry = load_geometry(hardware_cfg, self.led_total, self._output_ranges)
+        # Each hardware block is shown once per frame (both PWM channels are one device); the
+        # synchronous SPI outputs go last so the DMA blocks shift out while they write.
+        devices: Dict[int, List[StripOutput]] = {}
+        for out in sorted(self.outputs, key=lambda out: out.blocking):
+            devices.setdefault(id(out.device), []).append(out)
+        self._devices = [outs[0].device for outs in devices.values()]
+        self._wire_times = [max(out.wire_time for out in outs) for outs in devices.values()]
+        self._ready_at = [0.0] * len(self._devices)
+        state = {
             "on": True,
             "brightness": hardware_cfg.get("brightness", 200),
             "effect": "rainbow_cycle",
             "fps": 60,
+            # What the render loop does when a frame misses its deadline: skip, catch_up or degrade.
+            "frame_policy": "skip",
             "intensity_boost": 1.0,
-            "max_leds": hardware_cfg.get("led_count", self.strip.numPixels()),
+            "max_leds": self.led_total,
             "effect_params": {},
             # Live/global controls are separated from effect params so the UI can expose them cleanly.
-            "live": {
-                "master_speed": 1.0,
-                "gamma": 1.0,
-                "frame_blend": 0.15,
-                "direction": "forward",
-                "dither": True,
-                "dither_strength": 0.3,
-            },
+            "live": dict(LIVE_DEFAULTS),
             "segments": [],
         }
         self.running = False
         self._thread: Optional[threading.Thread] = None
-        self._lock = threading.RLock()
-        self._last_frame = time.time()
+        # Only writers take the lock; readers and the render thread use the current snapshot.
+        self._lock = threading.Lock()
+        self._clock = FrameClock(state["fps"], state["frame_policy"])
+        self.metrics = RenderMetrics()
         self._audio_snapshot: Dict = {"bands": [0.0] * 8, "vol": 0.0, "beat": False, "bpm": 0.0}
         # Cache effect instances so stateful effects keep their internal state
         self._effect_cache: Dict[str, Effect] = {}
         self._timeline = 0.0
         self._frame_id = 0
-        led_count = self.strip.numPixels()
-        self._last_buffer: List[RGB] = [(0, 0, 0)] * led_count
-        self._smooth_buffer: List[RGB] = list(self._last_buffer)
+        self._filters = FilterChain()
+        led_count = self.led_total
+        # Frame buffers are (N, 3) arrays: a float32 working buffer for segment writes and
+        # the uint8 frame that was last handed to the strip.
+        self._work = np.zeros((led_count, 3), dtype=np.float32)
+        self._last_buffer = np.zeros((led_count, 3), dtype=np.uint8)
+        # Idle detection: static scenes drop to a keep-alive refresh, identical frames skip show().
+        self.idle_fps = max(0.2, float(hardware_cfg.get("idle_fps", 2.0)))
+        self._static_rev = -1
+        self._static_frames = 0
+        self._prev_work = np.zeros((led_count, 3), dtype=np.float32)
+        self._idle = False
+        self._frame_changed = True
+        self._last_show = float("-inf")
+        self._skipped_shows = 0
+        self._wake = threading.Event()
+        self._filter_plan: Optional[RenderPlan] = None
+        self._current: StateSnapshot = make_snapshot(
+            state, 0, led_count, self._effect_cache, self._output_ranges, self.layouts, self.geometry
+        )
+        # Pipelined mode shifts frame N out on its own thread while frame N+1 renders.
+        self._pipeline: Optional[FramePipeline] = FramePipeline(self._apply_frame) if hardware_cfg.get("pipelined") else None
+        # Optional multi-core rendering; the pool is started with the render loop.
+        self.render_workers = max(0, int(hardware_cfg.get("render_workers", 0)))
+        # Effect kernel backend: "auto" uses numba when installed, warmed up off the boot path.
+        self.kernel_mode = str(hardware_cfg.get("kernels", "auto"))
+        # One period of every periodic effect, kept as frames so playback is a copy (0 disables).
+        self.frame_cache = FrameCache(float(hardware_cfg.get("frame_cache_mb", 8)) * 1024 * 1024)
+        self._workers: Optional[WorkerPool] = None
+
+    def _init_outputs(self, hardware_cfg: Dict) -> List[StripOutput]:
+        # "outputs" describes several physical strips (both PWM channels, SPI); they are laid
+        # out back to back in one frame. Without it the top-level keys describe a single strip.
+        base = {k: v for k, v in hardware_cfg.items() if k != "outputs"}
+        specs = [{**base, **spec} for spec in (hardware_cfg.get("outputs") or [{}])]
+        strips = self._init_strips(specs)
+        outputs: List[StripOutput] = []
+        offset = 0
+        for strip, spec in zip(strips, specs):
+            output = StripOutput(strip, offset, spec)
+            outputs.append(output)
+            offset += output.count
+        return outputs
+
+    def _init_strips(self, specs: List[Dict]) -> List[Any]:
+        if os.environ.get("LED_FAKE", "0") == "1" or PixelStrip is None:
+            return [DummyStrip(cfg.get("led_count", 300)) for cfg in specs]
+        pwm = [i for i, cfg in enumerate(specs) if int(cfg.get("gpio_pin", 18)) in PWM_PINS]
+        strips: List[Any] = [None] * len(specs)
+        device: Optional[PwmDevice] = None
+        if len(pwm) > 1 and ws is not None:
+            channels = [int(specs[i].get("channel", 0)) for i in pwm]
+            if len(pwm) > 2 or sorted(channels) != [0, 1]:
+                raise ValueError("PWM outputs need distinct channels 0 and 1 (at most two)")
+            if len({specs[i].get("dma", 10) for i in pwm}) > 1:
+                print("[ledweb] PWM outputs share one DMA channel; using the first output's dma.")
+            device = PwmDevice([specs[i] for i in pwm])
+            device.begin()
+            for i, channel in zip(pwm, device.channels):
+                strips[i] = channel
+        try:
+            for i, cfg in enumerate(specs):
+                if strips[i] is None:
+                    strips[i] = self._init_strip(cfg)
+        except Exception:
+            # Do not leave the PWM block's DMA running when another output fails to start.
+            if device is not None:
+                device.close()
+            raise
+        return strips
 
     def _init_strip(self, cfg: Dict[str, int]):
-        num = cfg.get("led_count", 300)
-        if os.environ.get("LED_FAKE", "0") == "1" or PixelStrip is None:
-            return DummyStrip(num)
         strip = PixelStrip(
-            num,
+            cfg.get("led_count", 300),
             cfg.get("gpio_pin", 18),
             cfg.get("freq_hz", 800_000),
             cfg.get("dma", 10),
@@ -96,6 +366,15 @@ class LEDEngine:
         if self.running:
             return
         self.running = True
+        self._open_devices()
+        kernels.configure(self.kernel_mode)
+        if self._pipeline:
+            self._pipeline.start()
+        if self.render_workers and self._workers is None:
+            try:
+                self._workers = WorkerPool(self.render_workers, self.led_total, self.kernel_mode, self.frame_cache.max_bytes)
+            except (RuntimeError, OSError) as exc:
+                print(f"[ledweb] Render workers unavailable ({exc}); rendering in-process.")
         self._thread = threading.Thread(target=self._loop, daemon=True)
         self._thread.start()
 
@@ -103,234 +382,233 @@ class LEDEngine:
         self.running = False
         if self._thread:
             self._thread.join(timeout=1)
+        if self._pipeline:
+            self._pipeline.stop()
+        if self._workers is not None:
+            self._workers.close()
+            self._workers = None
+        self._close_devices()
+
+    def _open_devices(self) -> None:
+        # Devices released by stop() come back with new LED arrays, so the bulk writers are rebuilt.
+        for device in self._devices:
+            if getattr(device, "closed", False):
+                device.begin()
+                for output in self.outputs:
+                    if output.device is device:
+                        output.write = _bulk_writer(output.strip)
+
+    def _close_devices(self) -> None:
+        # PixelStrip tears itself down at exit; devices with close() stop their DMA right away.
+        for device in self._devices:
+            close = getattr(device, "close", None)
+            if close is not None:
+                close()
+
+    @property
+    def state(self) -> Mapping[str, Any]:
+        """Read-only view of the current state; changes go through update_state/set_segments."""
+        return self._current.state
+
+    @property
+    def version(self) -> int:
+        return self._current.version
 
     def update_state(self, **kwargs) -> Dict:
+        waited = time.perf_counter()
         with self._lock:
+            self.metrics.lock_wait.observe(time.perf_counter() - waited)
+            state = dict(self._current.state)
             incoming_live = kwargs.pop("live", None)
             # Backwards compatibility: accept "params" as effect params.
             if "params" in kwargs and "effect_params" not in kwargs:
                 kwargs["effect_params"] = kwargs.pop("params") or {}
             if incoming_live:
-                live_state = dict(self.state.get("live", {}))
+                live_state = dict(state.get("live", {}))
                 live_state.update(incoming_live)
-                self.state["live"] = live_state
-            self.state.update(kwargs)
+                state["live"] = live_state
+            state.update(kwargs)
             # Maintain "params" alias for the API/UI while migrating to "effect_params".
-            self.state["params"] = dict(self.state.get("effect_params", {}))
-            return dict(self.state)
+            state["params"] = dict(state.get("effect_params", {}))
+            self._publish(state)
+            return dict(state)
 
     def set_segments(self, segments: List[Dict]) -> List[Dict]:
+        waited = time.perf_counter()
         with self._lock:
-            self.state["segments"] = segments
+            self.metrics.lock_wait.observe(time.perf_counter() - waited)
+            state = dict(self._current.state)
+            state["segments"] = segments
             # Reset cache to avoid leaking state between old/new segment layouts.
             self._effect_cache = {}
+            self._publish(state)
             return segments
 
+    def _publish(self, state: Dict) -> None:
+        # Called with the lock held. Swapping the reference is atomic, so the render thread
+        # and readers see either the old or the new snapshot, never a half-updated one.
+        self._current = make_snapshot(
+            state,
+            self._current.version + 1,
+            self.led_total,
+            self._effect_cache,
+            self._output_ranges,
+            self.layouts,
+            self.geometry,
+        )
+        self._wake.set()
+
     def snapshot(self) -> Dict:
-        with self._lock:
-            snap = dict(self.state)
-            snap["params"] = dict(self.state.get("effect_params", {}))
-            snap["frame_preview"] = list(self._last_buffer)
-            return snap
+        current = self._current
+        snap = dict(current.state)
+        snap["version"] = current.version
+        snap["params"] = dict(current.state.get("effect_params", {}))
+        snap["frame_preview"] = self._last_buffer.tolist()
+        snap["timing"] = self.timing()
+        return snap
+
+    def timing(self) -> Dict:
+        return {**self._clock.stats(), "idle": self._idle, "skipped_shows": self._skipped_shows}
+
+    def metrics_summary(self) -> Dict:
+        return self.metrics.summary(self.timing())
+
+    def metrics_text(self) -> str:
+        return self.metrics.prometheus(self.timing())
 
     def update_audio_snapshot(self, snap: Dict) -> None:
         self._audio_snapshot = snap
 
     def _loop(self) -> None:
+        self._clock.reset()
+        self._wake.clear()
         while self.running:
-            start = time.time()
-            dt = start - self._last_frame
-            self._last_frame = start
+            plan = self._current.plan
+            self._clock.configure(plan.fps, plan.frame_policy)
+            if self._idle:
+                self._idle_tick()
+                continue
+            dt = self._clock.begin_frame()
+            started = time.perf_counter()
+            self.metrics.frame_started(started)
             frame = self._render_frame(dt)
+            if self._frame_changed or time.monotonic() - self._last_show >= 1.0 / self.idle_fps:
+                self._output(frame)
+            else:
+                self._skipped_shows += 1
+            self.metrics.frame.observe(time.perf_counter() - started)
+            self._clock.end_frame()
+
+    def _idle_tick(self) -> None:
+        # Nothing can change until the state does: sleep until woken, re-pushing the last frame as keep-alive.
+        if self._wake.wait(1.0 / self.idle_fps):
+            self._wake.clear()
+            self._idle = False
+            self._clock.resync()
+            return
+        self._output(self._last_buffer)
+
+    def _output(self, frame: np.ndarray) -> None:
+        self._last_show = time.monotonic()
+        if self._pipeline:
+            waited = time.perf_counter()
+            self._pipeline.submit(frame)
+            self.metrics.handoff_wait.observe(time.perf_counter() - waited)
+        else:
             self._apply_frame(frame)
-            elapsed = time.time() - start
-            with self._lock:
-                target_fps = float(self.state.get("fps", 60))
-            target_fps = max(10.0, min(240.0, target_fps))
-            sleep_for = max(0.0, (1 / target_fps) - elapsed)
-            time.sleep(sleep_for)
-
-    def _render_frame(self, dt: float) -> List[RGB]:
-        # Build one frame of LED data based on current state, segments and audio snapshot.
-        with self._lock:
-            state = dict(self.state)
-            live = {
-                "master_speed": 1.0,
-                "gamma": 1.0,
-                "frame_blend": 0.15,
-                "direction": "forward",
-                "dither": True,
-                "dither_strength": 0.3,
-                **(state.get("live") or {}),
-            }
-
-        led_limit = max(1, int(state.get("max_leds", self.strip.numPixels())))
-        led_count = min(self.strip.numPixels(), led_limit)
-        global_boost = max(0.1, min(3.0, float(state.get("intensity_boost", 1.0))))
-        buffer: List[RGB] = [(0, 0, 0)] * led_count
-
-        segments = state.get("segments") or [
-            {
-                "name": "Strip",
-                "start": 0,
-                "end": led_count - 1,
-                "effect": state.get("effect"),
-                "params": state.get("effect_params", {}),
-            }
-        ]
-
-        master_speed = max(0.05, min(10.0, float(live.get("master_speed", 1.0))))
-        self._timeline += dt * master_speed
-        t = self._timeline
-        dt_scaled = dt * master_speed
 
-        for seg in segments:
-            start_idx = max(0, int(seg.get("start", 0)))
-            end_idx = min(led_count - 1, int(seg.get("end", led_count - 1)))
-            if end_idx < start_idx:
-                continue
-
-            length = max(1, end_idx - start_idx + 1)
-
-            effect_name = seg.get("effect") or state.get("effect")
-            if not effect_name:
-                continue
+    def _render_frame(self, dt: float) -> np.ndarray:
+        # Build one frame of LED data by walking the precompiled render plan.
+        plan = self._current.plan
+        buffer = self._frame_buffer(plan.led_count)
 
-            effect_cls = EFFECTS.get(effect_name)
-            if not effect_cls:
-                continue
-
-            # Use cached instance so stateful effects keep their internal state per segment.
-            cache_key = f"{effect_name}:{start_idx}:{end_idx}"
-            effect = self._effect_cache.get(cache_key)
-            if effect is None or not isinstance(effect, effect_cls):
-                effect = effect_cls()
-                self._effect_cache[cache_key] = effect
-
-            base_params = dict(state.get("effect_params") or state.get("params") or {})
-            seg_params = seg.get("params") or {}
-            params = {**base_params, **seg_params}
-
-            intensity = float(params.get("intensity", 1.0)) * global_boost
-
-            context = EffectContext(
-                time=t,
-                dt=dt_scaled,
-                length=length,
-                params=params,
-                audio=self._audio_snapshot,
-                global_state=state,
-                segment=seg,
-                timeline=t,
-                master_speed=master_speed,
-                live=live,
-            )
+        self._timeline += dt * plan.master_speed
+        t = self._timeline
+        dt_scaled = dt * plan.master_speed
+        audio = self._audio_snapshot
 
+        started = time.perf_counter()
+        if self._workers is not None:
             try:
-                colors = effect.render(context)
-            except Exception:
-                # Fail soft: if an effect blows up, keep the strip dark instead of crashing the loop
-                colors = [(0, 0, 0)] * length
-
-            # Normalise length to segment size
-            if len(colors) < length:
-                if not colors:
-                    colors = [(0, 0, 0)] * length
-                else:
-                    colors = (colors * (length // len(colors) + 1))[:length]
-            elif len(colors) > length:
-                colors = colors[:length]
-
-            for i, c in enumerate(colors):
-                idx = start_idx + i
-                if 0 <= idx < led_count:
-                    buffer[idx] = tuple(_clamp_color(ch * intensity) for ch in c)
-        if not state.get("on", True):
-            buffer = [(0, 0, 0)] * led_count
+                observe = self.metrics.observe_segment
+                for index, name, elapsed in self._workers.render(plan, t, dt_scaled, audio, buffer):
+                    observe(index, name, elapsed)
+            except (RuntimeError, OSError, EOFError) as exc:
+                print(f"[ledweb] Render workers failed ({exc}); rendering in-process instead.")
+                self._workers.close()
+                self._workers = None
+                self._render_segments(plan, buffer, t, dt_scaled, audio)
         else:
-            brightness = state.get("brightness", 255) / 255.0
-            buffer = [(_clamp_color(r * brightness), _clamp_color(g * brightness), _clamp_color(b * brightness)) for r, g, b in buffer]
-
-        buffer = self._apply_frame_filters(buffer, live)
-        self._last_buffer = list(buffer)
-        return buffer
-
-    def _apply_frame_filters(self, frame: List[RGB], live: Dict) -> List[RGB]:
-        if not frame:
-            return frame
-        gamma = max(0.2, min(4.0, float(live.get("gamma", 1.0))))
-        blend = max(0.0, min(0.98, float(live.get("frame_blend", live.get("smoothing", 0.0)))))
-        direction = str(live.get("direction", "forward"))
-        dither = bool(live.get("dither", False))
-        dither_strength = max(0.0, min(1.0, float(live.get("dither_strength", 1.0))))
-
-        if len(self._smooth_buffer) != len(frame):
-            self._smooth_buffer = [(0, 0, 0)] * len(frame)
-
-        if blend > 0:
-            mix = 1.0 - blend
-            blended: List[RGB] = []
-            for (nr, ng, nb), (pr, pg, pb) in zip(frame, self._smooth_buffer):
-                blended.append(
-                    (
-                        _clamp_color(pr + (nr - pr) * mix),
-                        _clamp_color(pg + (ng - pg) * mix),
-                        _clamp_color(pb + (nb - pb) * mix),
-                    )
-                )
-            frame = blended
-        self._smooth_buffer = list(frame)
-
-        if abs(gamma - 1.0) > 1e-3:
-            inv = 1.0 / gamma
-            frame = [
-                (
-                    _clamp_color(pow(r / 255.0, inv) * 255),
-                    _clamp_color(pow(g / 255.0, inv) * 255),
-                    _clamp_color(pow(b / 255.0, inv) * 255),
-                )
-                for r, g, b in frame
-            ]
-
-        if dither:
-            salt = (self._frame_id * 31) & 0xFF
-            jittered: List[RGB] = []
-            for i, (r, g, b) in enumerate(frame):
-                noise = ((i * 73 + salt) % 7) - 3  # -3..3
-                adjust = noise * 0.35 * dither_strength
-                jittered.append(
-                    (
-                        _clamp_color(r + adjust),
-                        _clamp_color(g + adjust),
-                        _clamp_color(b + adjust),
-                    )
-                )
-            frame = jittered
-
-        if direction == "reverse":
-            frame = list(reversed(frame))
-        elif direction == "center":
-            mid = (len(frame) - 1) / 2.0
-            mirrored: List[RGB] = []
-            for i in range(len(frame)):
-                src = int(abs(i - mid))
-                mirrored.append(frame[min(src, len(frame) - 1)])
-            frame = mirrored
-
-        self._frame_id = (self._frame_id + 1) % 10_000_000
+            self._render_segments(plan, buffer, t, dt_scaled, audio)
+        self.metrics.render.observe(time.perf_counter() - started)
+
+        if not plan.on:
+            buffer.fill(0.0)
+        self._track_static(buffer, plan.rev, plan.static)
+
+        if plan is not self._filter_plan:
+            # Brightness is compiled into the filter chain (LUT or pre-blend gain); recompile only on plan changes.
+            self._filters.configure(plan.live, plan.brightness, buffer.shape[0])
+            self._filter_plan = plan
+        started = time.perf_counter()
+        frame = self._apply_frame_filters(buffer)
+        self.metrics.filters.observe(time.perf_counter() - started)
+        # Publish changed frames as a fresh array so snapshot() never sees a half-written preview.
+        self._frame_changed = self._last_buffer.shape != frame.shape or not np.array_equal(frame, self._last_buffer)
+        if self._frame_changed:
+            self._last_buffer = frame.copy()
         return frame
 
-    def _apply_frame(self, frame: List[RGB]) -> None:
-        total = self.strip.numPixels()
-        for i, (r, g, b) in enumerate(frame):
-            if Color:
-                self.strip.setPixelColor(i, Color(r, g, b))
-            else:
-                self.strip.setPixelColor(i, (r, g, b))
-        if len(frame) < total:
-            for i in range(len(frame), total):
-                if Color:
-                    self.strip.setPixelColor(i, Color(0, 0, 0))
-                else:
-                    self.strip.setPixelColor(i, (0, 0, 0))
-        self.strip.show()
+    def _render_segments(self, plan: RenderPlan, buffer: np.ndarray, t: float, dt: float, audio: Dict) -> None:
+        observe = self.metrics.observe_segment
+        cache = self.frame_cache
+        for index, seg in enumerate(plan.segments):
+            elapsed = render_segment(seg, index, buffer, t, dt, audio, cache, plan.rev, plan.fps)
+            if elapsed is not None:
+                observe(index, seg.effect.name, elapsed)
+
+    def _track_static(self, buffer: np.ndarray, rev: int, static_scene: bool) -> None:
+        # A scene of time-invariant effects goes idle once its raw frame repeats and the blend has settled.
+        if not static_scene or rev != self._static_rev or self._prev_work.shape != buffer.shape:
+            self._static_rev = rev
+            self._static_frames = 0
+        elif np.array_equal(buffer, self._prev_work) and self._filters.settled(buffer):
+            self._static_frames += 1
+        else:
+            self._static_frames = 0
+        if self._prev_work.shape != buffer.shape:
+            self._prev_work = buffer.copy()
+        else:
+            self._prev_work[:] = buffer
+        if self._static_frames >= 2:
+            self._idle = True
+
+    def _frame_buffer(self, led_count: int) -> np.ndarray:
+        # Reuse the float working buffer between frames; only reallocate when the LED count changes.
+        if self._work.shape[0] != led_count:
+            self._work = np.zeros((led_count, 3), dtype=np.float32)
+        else:
+            self._work.fill(0.0)
+        return self._work
+
+    def _apply_frame_filters(self, frame: np.ndarray) -> np.ndarray:
+        out = self._filters.run(frame, self._frame_id)
+        self._frame_id = (self._frame_id + 1) % 10_000_000
+        return out
+
+    def _apply_frame(self, frame: np.ndarray) -> None:
+        started = time.perf_counter()
+        for output in self.outputs:
+            output.push(frame)
+        # ws2811_render first waits, holding the GIL, until the previous frame has shifted out;
+        # then it encodes the frame and starts the DMA (PWM/PCM) or writes it synchronously
+        # (SPI). Sleeping that wait off here releases the GIL for the render thread, and
+        # showing the DMA blocks first lets them transfer while the SPI write runs.
+        for i, device in enumerate(self._devices):
+            delay = self._ready_at[i] - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            shown = time.perf_counter()
+            device.show()
+            self._ready_at[i] = shown + self._wire_times[i]
+        self.metrics.show.observe(time.perf_counter() - started)
@@ -6,13 +6,14 @@ from typing import Dict, List
 
 from fastapi import Depends, FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
 from .auth import auth_manager
 from .audio_engine import audio_engine
 from .config_store import config_store
-from .effects import EFFECTS
+from .effects import EFFECTS, kernels, param_schema
+from .effects.palettes import load_palettes, palette_table
 from .led_engine import LEDEngine
 from .scheduler import Scheduler
 
@@ -36,6 +37,24 @@ def require_auth(x_session_token: str | None = Header(default=None)) -> str:
     return x_session_token
 
 
+def require_metrics_auth(
+    x_session_token: str | None = Header(default=None),
+    authorization: str | None = Header(default=None),
+    token: str | None = None,
+) -> str:
+    # Session tokens only count in the header; the read-only metrics token may also come as a
+    # bearer token or ?token= for scrapers, since query strings end up in access logs.
+    if x_session_token and auth_manager.verify(x_session_token):
+        return x_session_token
+    scrape = token
+    if authorization and authorization.lower().startswith("bearer "):
+        scrape = authorization[7:].strip()
+    if scrape and auth_manager.verify_metrics(scrape):
+        return scrape
+    raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+load_palettes(config_store.get_palettes())
 hardware_cfg = config_store.load("hardware")
 led_engine = LEDEngine(hardware_cfg)
 led_engine.start()
@@ -122,24 +141,6 @@ def login(body: Dict):
 
 @app.get("/api/status")
 def status(token: str = Depends(require_auth)):
-    def _schema(params: Dict) -> List[Dict]:
-        schema = []
-        for k, v in (params or {}).items():
-            entry = {"name": k, "type": "unknown"}
-            if isinstance(v, bool):
-                entry["type"] = "boolean"
-            elif isinstance(v, (int, float)):
-                entry["type"] = "number"
-            elif isinstance(v, str):
-                entry["type"] = "string"
-            elif isinstance(v, list):
-                if len(v) == 3 and all(isinstance(c, (int, float)) for c in v):
-                    entry["type"] = "color"
-                else:
-                    entry["type"] = "list"
-            schema.append(entry)
-        return schema
-
     return {
         "state": led_engine.snapshot(),
         "hardware": hardware_cfg,
@@ -150,18 +151,27 @@ def status(token: str = Depends(require_auth)):
                 "category": cls.category,
                 "description": cls.description,
                 "default_params": cls.default_params,
-                "param_schema": _schema(getattr(cls, "default_params", {})),
+                "param_schema": param_schema(cls),
             }
             for name, cls in EFFECTS.items()
         ],
+        "palettes": palette_table(),
         "presets": config_store.get_presets(),
         "zones": config_store.get_zones(),
         "alarms": config_store.get_alarms(),
         "ui": config_store.get_ui(),
         "audio": audio_engine.snapshot,
+        "metrics": led_engine.metrics_summary(),
+        "kernels": kernels.backend_info(),
+        "frame_cache": led_engine.frame_cache.stats(),
     }
 
 
+@app.get("/api/metrics", response_class=PlainTextResponse)
+def metrics(token: str = Depends(require_metrics_auth)):
+    return PlainTextResponse(led_engine.metrics_text(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/api/state")
 def update_state(body: Dict, token: str = Depends(require_auth)):
     led_engine.update_state(**body)
@@ -226,6 +236,15 @@ def update_alarms(body: Dict, token: str = Depends(require_auth)):
     return {"alarms": body}
 
 
+@app.post("/api/palettes")
+def update_palettes(body: Dict, token: str = Depends(require_auth)):
+    accepted = load_palettes(body)
+    config_store.save_palettes({name: [list(c) for c in colors] for name, colors in accepted.items()})
+    # Republish the state so render workers pick up the new palettes with the next plan.
+    led_engine.update_state()
+    return {"palettes": palette_table()}
+
+
 @app.post("/api/ui")
 def update_ui(body: Dict, token: str = Depends(require_auth)):
     cfg = config_store.save_ui(body)
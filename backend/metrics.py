@@ -0,0 +1,166 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Upper bounds in seconds; chosen around a 60-120 fps frame budget (8-16 ms).
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.002,
+    0.004,
+    0.008,
+    0.012,
+    0.016,
+    0.025,
+    0.05,
+    0.1,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is a bisect and two additions, no allocation."""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return self.bounds[-1]
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+        }
+
+    def prometheus(self, name: str, labels: str = "") -> List[str]:
+        sep = "," if labels else ""
+        lines = []
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {seen}')
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.total:.6f}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RenderMetrics:
+    """Timing data for the render loop, exposed as Prometheus text and a status summary."""
+
+    def __init__(self) -> None:
+        self.frame = Histogram()
+        self.render = Histogram()
+        self.filters = Histogram()
+        self.show = Histogram()
+        self.lock_wait = Histogram()
+        self.handoff_wait = Histogram()
+        self.effects: Dict[str, Histogram] = {}
+        self.segments: Dict[Tuple[int, str], Histogram] = {}
+        self._last_frame: Optional[float] = None
+        self.fps = 0.0
+
+    def frame_started(self, now: float) -> None:
+        if self._last_frame is not None:
+            interval = now - self._last_frame
+            if interval > 0:
+                self.fps += (1.0 / interval - self.fps) * 0.05
+        self._last_frame = now
+
+    def observe_segment(self, index: int, effect: str, seconds: float) -> None:
+        hist = self.effects.get(effect)
+        if hist is None:
+            hist = self.effects[effect] = Histogram()
+        hist.observe(seconds)
+        key = (index, effect)
+        hist = self.segments.get(key)
+        if hist is None:
+            hist = self.segments[key] = Histogram()
+        hist.observe(seconds)
+
+    # summary() and prometheus() run on API threads while the render thread may add effects
+    # and segments; they iterate over list() snapshots, which the GIL copies atomically.
+    def summary(self, clock_stats: Optional[Dict] = None) -> Dict:
+        clock_stats = clock_stats or {}
+        return {
+            "fps": round(self.fps, 2),
+            "dropped_frames": clock_stats.get("skipped", 0),
+            "overruns": clock_stats.get("overruns", 0),
+            "frame": self.frame.summary(),
+            "render": self.render.summary(),
+            "filters": self.filters.summary(),
+            "show": self.show.summary(),
+            "lock_wait": self.lock_wait.summary(),
+            "handoff_wait": self.handoff_wait.summary(),
+            "effects": {name: hist.summary() for name, hist in list(self.effects.items())},
+        }
+
+    def prometheus(self, clock_stats: Optional[Dict] = None) -> str:
+        clock_stats = clock_stats or {}
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, series: Iterable[Tuple[str, Histogram]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series:
+                lines.extend(hist.prometheus(name, labels))
+
+        def scalar(name: str, kind: str, help_text: str, value) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+
+        histogram("ledweb_frame_seconds", "Total time spent producing and outputting a frame.", [("", self.frame)])
+        histogram("ledweb_render_seconds", "Time spent rendering all segments of a frame.", [("", self.render)])
+        histogram("ledweb_filter_seconds", "Time spent in the post-processing filter chain.", [("", self.filters)])
+        histogram("ledweb_show_seconds", "Time spent packing and shifting a frame out to the strips.", [("", self.show)])
+        histogram("ledweb_lock_wait_seconds", "Time state writers waited for the engine lock.", [("", self.lock_wait)])
+        histogram(
+            "ledweb_handoff_wait_seconds", "Time the render thread waited for the output thread.", [("", self.handoff_wait)]
+        )
+        histogram(
+            "ledweb_effect_render_seconds",
+            "Render time per effect.",
+            [(f'effect="{_escape(name)}"', hist) for name, hist in sorted(list(self.effects.items()))],
+        )
+        histogram(
+            "ledweb_segment_render_seconds",
+            "Render time per segment.",
+            [(f'segment="{index}",effect="{_escape(effect)}"', hist) for (index, effect), hist in sorted(list(self.segments.items()))],
+        )
+        scalar("ledweb_fps", "gauge", "Achieved frames per second (smoothed).", round(self.fps, 3))
+        scalar("ledweb_target_fps", "gauge", "Configured target frames per second.", clock_stats.get("target_fps", 0))
+        scalar("ledweb_frames_total", "counter", "Frames rendered.", clock_stats.get("frames", 0))
+        scalar("ledweb_dropped_frames_total", "counter", "Frame slots skipped after overruns.", clock_stats.get("skipped", 0))
+        scalar("ledweb_overruns_total", "counter", "Frames that missed their deadline.", clock_stats.get("overruns", 0))
+        scalar("ledweb_skipped_shows_total", "counter", "Unchanged frames not pushed to the strip.", clock_stats.get("skipped_shows", 0))
+        scalar("ledweb_idle", "gauge", "1 while a static scene is idling at the keep-alive rate.", int(bool(clock_stats.get("idle"))))
+        scalar("ledweb_jitter_seconds", "gauge", "Smoothed wake-up jitter.", clock_stats.get("jitter_avg_ms", 0) / 1000.0)
+        return "\n".join(lines) + "\n"
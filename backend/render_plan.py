@@ -0,0 +1,403 @@
+import json
+import time
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .effects import EFFECTS, Effect, EffectContext
+from .geometry import LedGeometry
+from .layout import MatrixLayout
+
+if TYPE_CHECKING:
+    from .frame_cache import FrameCache
+
+LIVE_DEFAULTS = {
+    "master_speed": 1.0,
+    "gamma": 1.0,
+    "frame_blend": 0.15,
+    "direction": "forward",
+    "dither": True,
+    "dither_strength": 0.3,
+}
+
+
+@dataclass(frozen=True)
+class SegmentCopy:
+    """A segment that shows another segment's render instead of rendering its own."""
+
+    start: int
+    end: int
+    intensity: float
+    reverse: bool = False
+    # Rotation in pixels, applied after ``reverse``.
+    offset: int = 0
+
+    def fan_out(self, source: np.ndarray, buffer: np.ndarray) -> None:
+        """Copy the leader's raw ``source`` frame into this segment's slice of ``buffer``."""
+        target = buffer[self.start : self.end + 1]
+        if self.reverse:
+            source = source[::-1]
+        shift = self.offset % target.shape[0]
+        if shift:
+            target[shift:] = source[:-shift]
+            target[:shift] = source[-shift:]
+        else:
+            target[:] = source
+        if self.intensity != 1.0:
+            target *= self.intensity
+        np.clip(target, 0.0, 255.0, out=target)
+
+
+@dataclass(frozen=True)
+class SegmentPlan:
+    start: int
+    end: int
+    length: int
+    effect: Effect
+    params: Dict
+    intensity: float
+    # Reused every frame; the loop only refreshes time, dt and audio on it.
+    context: EffectContext
+    # Matrix segments render into ``canvas`` and are placed through the layout's gather map.
+    layout: Optional[MatrixLayout] = None
+    canvas: Optional[np.ndarray] = None
+    # Position in the state's segment list, and the segments that show this one's render.
+    index: int = 0
+    copies: Tuple["SegmentCopy", ...] = ()
+
+
+def draw_segment(seg: SegmentPlan, target: np.ndarray) -> None:
+    """Render ``seg``'s raw frame into ``target``, through its matrix layout if it has one."""
+    if seg.layout is None:
+        seg.effect.render_into(seg.context, target)
+    else:
+        seg.effect.render_matrix(seg.context, seg.canvas)
+        seg.layout.place(seg.canvas, target)
+
+
+def render_segment(
+    seg: SegmentPlan,
+    position: int,
+    buffer: np.ndarray,
+    t: float,
+    dt: float,
+    audio: Dict,
+    cache: Optional["FrameCache"] = None,
+    rev: int = 0,
+    fps: float = 60.0,
+) -> Optional[float]:
+    """Render one segment into its slice of ``buffer`` and fan it out to its copies.
+
+    Shared by the render thread and the render workers. Returns the time it took in
+    seconds, or None when the effect raised and the segment was left dark.
+    """
+    started = time.perf_counter()
+    context = seg.context
+    context.time = t
+    context.timeline = t
+    context.dt = dt
+    context.audio = audio
+
+    # Effects render straight into their slice of the work buffer; no per-frame lists.
+    target = buffer[seg.start : seg.end + 1]
+    try:
+        cached = cache.frame(rev, position, seg, t, fps, draw_segment) if cache is not None else None
+        if cached is None:
+            draw_segment(seg, target)
+        else:
+            target[:] = cached
+        failed = False
+    except Exception:
+        # Fail soft: if an effect blows up, keep the segment dark instead of crashing the loop
+        target.fill(0.0)
+        failed = True
+    # Segments sharing this render get the raw frame before intensity is applied.
+    for copy in seg.copies:
+        copy.fan_out(target, buffer)
+    if failed:
+        return None
+
+    if seg.intensity != 1.0:
+        target *= seg.intensity
+    np.clip(target, 0.0, 255.0, out=target)
+    return time.perf_counter() - started
+
+
+@dataclass(frozen=True)
+class RenderPlan:
+    """Everything the render loop needs, resolved once per state change.
+
+    Compiled by ``compile_plan`` whenever ``update_state``/``set_segments`` run, so the
+    hot path only walks ``segments`` and never touches the state dict, the effect
+    registry or param merging.
+    """
+
+    rev: int
+    led_count: int
+    segments: Tuple[SegmentPlan, ...]
+    live: Dict
+    master_speed: float
+    brightness: float
+    on: bool
+    fps: float
+    frame_policy: str
+    # Every effect in the plan is time-invariant (or the strip is off).
+    static: bool
+
+
+def _float(value, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _segment_range(
+    seg: Mapping[str, Any],
+    led_count: int,
+    output_ranges: Optional[Sequence[Tuple[int, int]]],
+    layouts: Optional[Mapping[str, MatrixLayout]],
+) -> Optional[Tuple[int, int, Optional[MatrixLayout]]]:
+    """Absolute ``(start, end, layout)`` of a segment, or None when it falls outside the strip."""
+    lo, hi = 0, led_count - 1
+    output = seg.get("output")
+    if output is not None and output_ranges:
+        try:
+            offset, count = output_ranges[int(output)]
+        except (IndexError, TypeError, ValueError):
+            return None
+        lo, hi = offset, min(hi, offset + count - 1)
+    start_idx = max(lo, lo + int(seg.get("start", 0)))
+    end_idx = min(hi, lo + int(seg.get("end", hi - lo)))
+    layout = (layouts or {}).get(seg.get("layout")) if seg.get("layout") else None
+    if layout is not None:
+        if layout.end < led_count:
+            start_idx, end_idx = layout.start, layout.end
+        else:
+            layout = None
+    if end_idx < start_idx:
+        return None
+    return start_idx, end_idx, layout
+
+
+def _shared_renders(
+    segments: Sequence[Mapping[str, Any]],
+    ranges: Sequence[Optional[Tuple[int, int, Optional[MatrixLayout]]]],
+    params_of: Sequence[Dict],
+    effects_of: Sequence[Optional[type]],
+    spatial_of: Sequence[Any],
+) -> Dict[int, Tuple[int, bool, int]]:
+    """Segments that show another segment's render: ``{index: (leader, reverse, offset)}``.
+
+    Explicit relations come first: ``copy_of``/``mirror_of`` name (or index) the source
+    segment and ``group`` shares the first member's render; ``reverse``/``offset`` transform
+    the copy. Among the rest, stateless effects with the same params and size are merged
+    automatically. Only segments of the same length share, and a leader always renders itself.
+    """
+    names: Dict[str, int] = {}
+    for i, seg in enumerate(segments):
+        if seg.get("name") is not None:
+            names.setdefault(str(seg["name"]), i)
+
+    def length(i: int) -> int:
+        r = ranges[i]
+        return r[1] - r[0] + 1 if r is not None else 0
+
+    links: Dict[int, Tuple[int, bool, int]] = {}
+    groups: Dict[str, int] = {}
+    for i, seg in enumerate(segments):
+        if ranges[i] is None:
+            continue
+        reverse = bool(seg.get("reverse", False))
+        try:
+            shift = int(seg.get("offset", 0))
+        except (TypeError, ValueError):
+            shift = 0
+        ref = seg.get("copy_of", seg.get("mirror_of"))
+        if ref is not None:
+            reverse = reverse != ("copy_of" not in seg)
+            j = names.get(str(ref))
+            if j is None and isinstance(ref, int) and 0 <= ref < len(segments):
+                j = ref
+            if j is not None and j != i and length(j) == length(i):
+                links[i] = (j, reverse, shift)
+            continue
+        group = seg.get("group")
+        if group is not None:
+            leader = groups.get(str(group))
+            if leader is None:
+                if effects_of[i]:
+                    groups[str(group)] = i
+            elif length(leader) == length(i):
+                links[i] = (leader, reverse, shift)
+
+    auto: Dict[Tuple, int] = {}
+    for i, effect_cls in enumerate(effects_of):
+        if ranges[i] is None or i in links or not effect_cls or not effect_cls.stateless:
+            continue
+        start, end, layout = ranges[i]
+        # Segment intensity is applied after the render, so it only splits segments whose effect reads it.
+        shape = params_of[i]
+        if "intensity" not in effect_cls.default_params:
+            shape = {k: v for k, v in shape.items() if k != "intensity"}
+        key = (effect_cls, json.dumps(shape, sort_keys=True, default=str), end - start + 1, id(layout), id(spatial_of[i]))
+        leader = auto.setdefault(key, i)
+        if leader != i:
+            links[i] = (leader, False, 0)
+
+    # Resolve chains (a copy of a copy) to the segment that actually renders; drop cycles.
+    sources: Dict[int, Tuple[int, bool, int]] = {}
+    for i in links:
+        leader, reverse, shift = i, False, 0
+        seen = set()
+        while leader in links and leader not in seen:
+            seen.add(leader)
+            leader, flip, step = links[leader]
+            # The transform so far is applied after this inner one; a reversal mirrors the inner offset.
+            reverse, shift = reverse != flip, shift + (-step if reverse else step)
+        if leader not in links and effects_of[leader]:
+            sources[i] = (leader, reverse, shift)
+    return sources
+
+
+def compile_plan(
+    state: Mapping[str, Any],
+    rev: int,
+    strip_count: int,
+    effect_cache: Dict[str, Effect],
+    output_ranges: Optional[Sequence[Tuple[int, int]]] = None,
+    layouts: Optional[Mapping[str, MatrixLayout]] = None,
+    geometry: Optional[LedGeometry] = None,
+) -> RenderPlan:
+    """Resolve ``state`` into a ``RenderPlan``, reusing cached effect instances where possible.
+
+    ``effect_cache`` is updated in place so stateful effects keep their state across plans.
+    ``output_ranges`` lists ``(offset, count)`` per physical output; a segment with an
+    ``output`` index has its ``start``/``end`` relative to that output. A segment with a
+    ``layout`` name covers that matrix layout's LEDs and renders in 2D. Strip segments whose
+    LEDs all have coordinates in ``geometry`` get them (and their spatial index) on the context.
+    Segments that share another segment's render (see ``_shared_renders``) are not rendered
+    themselves; they become ``copies`` of that segment's plan.
+    """
+    live = {**LIVE_DEFAULTS, **(state.get("live") or {})}
+    master_speed = max(0.05, min(10.0, _float(live.get("master_speed", 1.0), 1.0)))
+    live["master_speed"] = master_speed
+
+    led_limit = max(1, int(state.get("max_leds", strip_count)))
+    led_count = min(strip_count, led_limit)
+    global_boost = max(0.1, min(3.0, _float(state.get("intensity_boost", 1.0), 1.0)))
+    on = bool(state.get("on", True))
+
+    segments = state.get("segments") or [
+        {
+            "name": "Strip",
+            "start": 0,
+            "end": led_count - 1,
+            "effect": state.get("effect"),
+            "params": state.get("effect_params", {}),
+        }
+    ]
+    base_params = dict(state.get("effect_params") or state.get("params") or {})
+
+    ranges: List[Optional[Tuple[int, int, Optional[MatrixLayout]]]] = [
+        _segment_range(seg, led_count, output_ranges, layouts) for seg in segments
+    ]
+    params_of = [{**base_params, **(seg.get("params") or {})} for seg in segments]
+    effects_of = [EFFECTS.get(seg.get("effect") or state.get("effect") or "") for seg in segments]
+    spatial_of = [
+        geometry.segment(r[0], r[1]) if geometry is not None and r is not None and r[2] is None else None for r in ranges
+    ]
+    sources = _shared_renders(segments, ranges, params_of, effects_of, spatial_of)
+
+    compiled: List[SegmentPlan] = []
+    copies: Dict[int, List[SegmentCopy]] = {}
+    static = True
+    for i, seg in enumerate(segments):
+        if ranges[i] is None:
+            continue
+        start_idx, end_idx, layout = ranges[i]
+        params = params_of[i]
+        intensity = _float(params.get("intensity", 1.0), 1.0) * global_boost
+        if i in sources:
+            leader, reverse, shift = sources[i]
+            copies.setdefault(leader, []).append(SegmentCopy(start_idx, end_idx, intensity, reverse, shift))
+            continue
+        effect_cls = effects_of[i]
+        if not effect_cls:
+            continue
+        length = end_idx - start_idx + 1
+        effect_name = effect_cls.name
+
+        # Use cached instance so stateful effects keep their internal state per segment.
+        cache_key = f"{effect_name}:{start_idx}:{end_idx}"
+        effect: Optional[Effect] = effect_cache.get(cache_key)
+        if effect is None or not isinstance(effect, effect_cls):
+            effect = effect_cls()
+            effect_cache[cache_key] = effect
+        static = static and effect.time_invariant
+
+        spatial = spatial_of[i]
+        context = EffectContext(
+            time=0.0,
+            dt=0.0,
+            length=length,
+            params=params,
+            audio={},
+            global_state=state,
+            segment=seg,
+            timeline=0.0,
+            master_speed=master_speed,
+            live=live,
+            width=layout.width if layout else 0,
+            height=layout.height if layout else 0,
+            coords=spatial.points if spatial is not None else None,
+            spatial=spatial,
+        )
+        canvas = layout.canvas() if layout else None
+        compiled.append(SegmentPlan(start_idx, end_idx, length, effect, params, intensity, context, layout, canvas, i))
+    compiled = [
+        replace(plan, copies=tuple(copies[plan.index])) if plan.index in copies else plan for plan in compiled
+    ]
+
+    return RenderPlan(
+        rev=rev,
+        led_count=led_count,
+        segments=tuple(compiled),
+        live=live,
+        master_speed=master_speed,
+        brightness=max(0.0, min(255.0, _float(state.get("brightness", 255), 255.0))) / 255.0,
+        on=on,
+        fps=_float(state.get("fps", 60), 60.0),
+        frame_policy=str(state.get("frame_policy", "skip")),
+        static=static or not on,
+    )
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """An immutable, versioned view of the engine state plus the plan compiled from it.
+
+    Writers build a new snapshot and swap the engine's reference in one assignment;
+    readers just grab the current reference and never block the render thread. Nested
+    values (``live``, ``segments``) are replaced, never mutated, once published.
+    """
+
+    version: int
+    state: Mapping[str, Any]
+    plan: RenderPlan
+
+
+def make_snapshot(
+    state: Dict,
+    version: int,
+    strip_count: int,
+    effect_cache: Dict[str, Effect],
+    output_ranges: Optional[Sequence[Tuple[int, int]]] = None,
+    layouts: Optional[Mapping[str, MatrixLayout]] = None,
+    geometry: Optional[LedGeometry] = None,
+) -> StateSnapshot:
+    frozen = MappingProxyType(dict(state))
+    plan = compile_plan(frozen, version, strip_count, effect_cache, output_ranges, layouts, geometry)
+    return StateSnapshot(version, frozen, plan)
@@ -0,0 +1,249 @@
+import multiprocessing as mp
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .effects import EFFECTS, Effect, EffectContext, kernels
+from .effects.palettes import custom_palettes, load_palettes
+from .effects.spatial import SpatialIndex
+from .frame_cache import FrameCache
+from .layout import MatrixLayout
+from .render_plan import RenderPlan, SegmentCopy, SegmentPlan, render_segment
+
+# (position, cache_key, effect_name, start, end, params, intensity, segment, live, global_state, layout, spatial, copies)
+SegmentSpec = Tuple[
+    int,
+    str,
+    str,
+    int,
+    int,
+    Dict,
+    float,
+    Dict,
+    Dict,
+    Dict,
+    Optional[MatrixLayout],
+    Optional[SpatialIndex],
+    Tuple[SegmentCopy, ...],
+]
+# (position in the plan, effect name, seconds) per rendered segment, reported back with every frame.
+SegmentSample = Tuple[int, str, float]
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to the parent's frame buffer without registering it with the resource tracker.
+
+    The parent owns (and unlinks) the segment. A worker that registered it would get it
+    unlinked or reported as leaked when it exits; spawned workers share the parent's
+    tracker, so unregistering after attaching would drop the parent's registration too.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _worker_main(conn, shm_name: str, capacity: int, kernel_mode: str = "numpy", cache_bytes: float = 0) -> None:
+    """Render loop of one worker process.
+
+    Effect instances live here for as long as their segment stays assigned to this worker,
+    so stateful effects keep their state across frames without crossing process borders.
+    """
+    shm = _attach(shm_name)
+    frame = np.ndarray((capacity, 3), dtype=np.float32, buffer=shm.buf)
+    frame_cache = FrameCache(cache_bytes)
+    cache: Dict[str, Effect] = {}
+    jobs: List[Tuple[int, SegmentPlan]] = []
+    rev, fps = 0, 60.0
+    loaded_palettes: Dict = {}
+    # Warms up in the background like the parent does; NumPy renders until it is ready.
+    kernels.configure(kernel_mode)
+    conn.send("ready")
+    try:
+        while True:
+            msg = conn.recv()
+            kind = msg[0]
+            if kind == "plan":
+                _, specs, palettes, rev, fps = msg
+                # Custom palettes live in the parent's registry; mirror them when they change. Reloading
+                # bumps the palette generation, which would drop every frame cache entry on each plan.
+                if palettes != loaded_palettes:
+                    load_palettes(palettes)
+                    loaded_palettes = palettes
+                next_cache: Dict[str, Effect] = {}
+                jobs = []
+                for position, key, name, start, end, params, intensity, seg, live, global_state, layout, spatial, copies in specs:
+                    effect_cls = EFFECTS.get(name)
+                    if not effect_cls:
+                        continue
+                    effect = cache.get(key)
+                    if effect is None or not isinstance(effect, effect_cls):
+                        effect = effect_cls()
+                    next_cache[key] = effect
+                    length = end - start + 1
+                    context = EffectContext(
+                        time=0.0,
+                        dt=0.0,
+                        length=length,
+                        params=params,
+                        audio={},
+                        global_state=global_state,
+                        segment=seg,
+                        timeline=0.0,
+                        master_speed=live.get("master_speed", 1.0),
+                        live=live,
+                        width=layout.width if layout else 0,
+                        height=layout.height if layout else 0,
+                        coords=spatial.points if spatial is not None else None,
+                        spatial=spatial,
+                    )
+                    plan = SegmentPlan(
+                        start=start,
+                        end=end,
+                        length=length,
+                        effect=effect,
+                        params=params,
+                        intensity=intensity,
+                        context=context,
+                        layout=layout,
+                        canvas=layout.canvas() if layout else None,
+                        copies=copies,
+                    )
+                    jobs.append((position, plan))
+                cache = next_cache
+            elif kind == "frame":
+                _, t, dt, audio = msg
+                samples: List[SegmentSample] = []
+                for position, seg in jobs:
+                    elapsed = render_segment(seg, position, frame, t, dt, audio, frame_cache, rev, fps)
+                    if elapsed is not None:
+                        samples.append((position, seg.effect.name, elapsed))
+                conn.send(("done", samples))
+            else:
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del frame
+        shm.close()
+
+
+class WorkerPool:
+    """Renders plan segments in worker processes into a shared-memory frame buffer.
+
+    Segments are spread over the workers by length (largest first, deterministic for a
+    given plan) so the same segment keeps landing on the same worker and its effect
+    instance survives ``update_state``. The render thread only dispatches the frame
+    time/audio, waits for the workers and copies the rendered slices into its buffer.
+    """
+
+    timeout = 1.0
+    # Spawned workers re-import numpy and the effects; that takes a few seconds on a Pi.
+    boot_timeout = 30.0
+
+    def __init__(self, workers: int, capacity: int, kernel_mode: str = "numpy", cache_bytes: float = 0) -> None:
+        self.workers = max(1, int(workers))
+        self.capacity = capacity
+        self._ctx = mp.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, capacity * 3 * 4))
+        self.frame = np.ndarray((capacity, 3), dtype=np.float32, buffer=self._shm.buf)
+        self._conns = []
+        self._procs = []
+        self._plan_rev: Optional[int] = None
+        self._active: List[int] = []
+        self._slices: List[Tuple[int, int]] = []
+        for _ in range(self.workers):
+            parent, child = self._ctx.Pipe()
+            # Each worker caches only its own segments, so the frame cache budget is split between them.
+            args = (child, self._shm.name, capacity, kernel_mode, cache_bytes / self.workers)
+            proc = self._ctx.Process(target=_worker_main, args=args, daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+        for i, conn in enumerate(self._conns):
+            try:
+                if not conn.poll(self.boot_timeout):
+                    raise EOFError
+                conn.recv()
+            except (EOFError, OSError):
+                self.close()
+                raise RuntimeError(f"render worker {i} did not start")
+
+    def _assign(self, plan: RenderPlan) -> None:
+        buckets: List[List[SegmentSpec]] = [[] for _ in range(self.workers)]
+        loads = [0] * self.workers
+        order = sorted(range(len(plan.segments)), key=lambda i: (-plan.segments[i].length, i))
+        for i in order:
+            seg = plan.segments[i]
+            target = loads.index(min(loads))
+            loads[target] += seg.length
+            ctx = seg.context
+            key = f"{seg.effect.name}:{seg.start}:{seg.end}"
+            buckets[target].append(
+                (
+                    i,
+                    key,
+                    seg.effect.name,
+                    seg.start,
+                    seg.end,
+                    seg.params,
+                    seg.intensity,
+                    ctx.segment,
+                    ctx.live,
+                    dict(ctx.global_state),
+                    seg.layout,
+                    ctx.spatial,
+                    seg.copies,
+                )
+            )
+        palettes = custom_palettes()
+        for conn, specs in zip(self._conns, buckets):
+            conn.send(("plan", specs, palettes, plan.rev, plan.fps))
+        self._active = [i for i, specs in enumerate(buckets) if specs]
+        self._slices = [(part.start, part.end + 1) for seg in plan.segments for part in (seg, *seg.copies)]
+        self._plan_rev = plan.rev
+
+    def render(self, plan: RenderPlan, t: float, dt: float, audio: Dict, buffer: np.ndarray) -> List[SegmentSample]:
+        """Render all plan segments into ``buffer`` and return the workers' per-segment timings.
+
+        Raises RuntimeError if a worker stalls or dies.
+        """
+        if plan.rev != self._plan_rev:
+            self._assign(plan)
+        msg = ("frame", t, dt, audio)
+        for i in self._active:
+            self._conns[i].send(msg)
+        samples: List[SegmentSample] = []
+        for i in self._active:
+            conn = self._conns[i]
+            if not conn.poll(self.timeout):
+                raise RuntimeError(f"render worker {i} timed out")
+            samples.extend(conn.recv()[1])
+        for start, end in self._slices:
+            buffer[start:end] = self.frame[start:end]
+        return samples
+
+    def close(self) -> None:
+        for conn in self._conns:
+            try:
+                conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=1)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._conns = []
+        self._procs = []
+        del self.frame
+        self._shm.close()
+        self._shm.unlink()